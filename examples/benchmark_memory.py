@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# noqa: E800
+
+"""
+Memory benchmark.
+
+Compares the memory held by pydantic device models with their compact
+form, after checking that the compact form converts back to equal models.
+The devices are generated from tests/samples.py.
+
+How to use this script, from the root of the repository:
+    python -m examples.benchmark_memory [number of devices per type]
+"""
+import gc
+import sys
+import tracemalloc
+from functools import partial
+from typing import Any, Callable, List
+
+from pydantic import BaseModel, parse_obj_as
+
+from pyhaopenmotics.models.compact import Interner, from_compact, to_compact
+from pyhaopenmotics.models.output import Output
+from pyhaopenmotics.models.sensor import Sensor
+from pyhaopenmotics.models.shutter import Shutter
+from tests.samples import SAMPLES
+
+MODELS = (Output, Sensor, Shutter)
+
+
+def measure(build: Callable[[], List[Any]]) -> tuple[List[Any], int]:
+    """Return the result of build and the memory it holds."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def compact_all(models: List[BaseModel], interner: Interner) -> List[Any]:
+    """Return the compact form of models."""
+    return [to_compact(item, interner) for item in models]
+
+
+def main() -> None:
+    """Check round trips and compare memory use."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    for model in MODELS:
+        data = [SAMPLES[model](idx) for idx in range(count)]
+        type_ = List[model]  # type: ignore
+        parsed = parse_obj_as(type_, data)
+        for item in parsed[:500]:
+            assert from_compact(to_compact(item, Interner())) == item
+        del parsed
+
+        models, model_bytes = measure(partial(parse_obj_as, type_, data))
+        interner = Interner()
+        compact, compact_bytes = measure(partial(compact_all, models, interner))
+        print(
+            f"{model.__name__:8} {count} objects: "
+            f"models {model_bytes / 1024 / 1024:6.2f} MB, "
+            f"compact {compact_bytes / 1024 / 1024:6.2f} MB, "
+            f"{model_bytes / compact_bytes:4.1f}x smaller, "
+            f"{len(interner)} shared values"
+        )
+        del models, compact
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# noqa: E800
+
+"""
+Parsing benchmark.
+
+Compares validated parsing (parse_obj_as) with the trusted fast path
+(construct_obj_as) on device lists generated from tests/samples.py. That
+both paths build equal models is checked in tests/test_construct.py.
+
+How to use this script, from the root of the repository:
+    python -m examples.benchmark_parsing [number of devices]
+"""
+import sys
+import timeit
+from functools import partial
+from typing import List
+
+from pydantic import parse_obj_as
+
+from pyhaopenmotics.construct import construct_obj_as
+from tests.samples import SAMPLES
+
+
+def main() -> None:
+    """Time both parsing paths."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    for model, sample in SAMPLES.items():
+        data = [sample(idx) for idx in range(count)]
+        type_ = List[model]  # type: ignore
+        slow = min(timeit.repeat(partial(parse_obj_as, type_, data), number=5))
+        fast = min(timeit.repeat(partial(construct_obj_as, type_, data), number=5))
+        print(
+            f"{model.__name__:16} {count} objects: "
+            f"validated {slow / 5 * 1000:7.2f} ms, "
+            f"trusted {fast / 5 * 1000:7.2f} ms, "
+            f"{slow / fast:4.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -72,6 +72,10 @@ async def main():
     shu = await omclient.shutters.get_all(i_id)
     print(shu)
 
+    # All of the above in one concurrent refresh
+    snapshot = await omclient.snapshot(i_id)
+    print(snapshot.outputs)
+
     await omclient.close()
 
 
@@ -1,7 +1,11 @@
 """Module HTTP communication with the OpenMotics API."""
 
+from .analytics import SensorFrame, SensorStats
+from .cache import ResponseCache
+from .circuitbreaker import CircuitBreaker
 from .errors import (
     ApiException,
+    CircuitOpenException,
     NetworkException,
     NetworkTimeoutException,
     NonOkResponseException,
@@ -14,12 +18,39 @@ from .errors import (
     RetryableException,
     UnsuportedArgumentsException,
 )
+from .events import EventStream
+from .fleet import FleetSnapshot
 from .openmotics import CloudClient, LocalGatewayClient
+from .policy import RequestPolicy, deadline, use_policy
+from .ratelimit import RateLimiter
+from .registry import DeviceRegistry
+from .scheduler import PollScheduler
+from .snapshot import InstallationSnapshot
+from .state import DeviceStateStore, IngestSource, StateChange
+from .timeseries import TimeSeriesStore
+from .tokenstore import FileTokenStore, MemoryTokenStore, TokenStore
+from .topology import TopologyCache
+from .transport import create_limits, create_shared_transport
 
 __all__ = [
     "CloudClient",
     "LocalGatewayClient",
+    "PollScheduler",
+    "RateLimiter",
+    "RequestPolicy",
+    "ResponseCache",
+    "SensorFrame",
+    "SensorStats",
     "ApiException",
+    "CircuitBreaker",
+    "CircuitOpenException",
+    "DeviceRegistry",
+    "DeviceStateStore",
+    "EventStream",
+    "FleetSnapshot",
+    "IngestSource",
+    "InstallationSnapshot",
+    "StateChange",
     "NonOkResponseException",
     "NetworkException",
     "NetworkTimeoutException",
@@ -31,4 +62,13 @@ __all__ = [
     "RequestUnauthorizedException",
     "RetryableException",
     "UnsuportedArgumentsException",
+    "FileTokenStore",
+    "MemoryTokenStore",
+    "TimeSeriesStore",
+    "TokenStore",
+    "TopologyCache",
+    "create_limits",
+    "create_shared_transport",
+    "deadline",
+    "use_policy",
 ]
@@ -0,0 +1,296 @@
+"""Module containing columnar views of device collections for analytics."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Iterable
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+if TYPE_CHECKING:
+    from .fleet import FleetSnapshot
+    from .models.sensor import Sensor
+    from .snapshot import InstallationSnapshot
+
+READINGS = ("temperature", "humidity", "brightness")
+
+# Grouping keys of SensorFrame.aggregate and the id columns they group by.
+# Rooms and floors are numbered per installation.
+GROUP_COLUMNS = {
+    "installation": ("installation_ids",),
+    "floor": ("installation_ids", "floor_ids"),
+    "room": ("installation_ids", "room_ids"),
+}
+
+# Id of a missing installation, floor or room.
+MISSING_ID = -1
+
+
+def _require_numpy() -> None:
+    """Raise when numpy is not installed.
+
+    Raises:
+        ImportError: numpy is not installed
+    """
+    if np is None:
+        raise ImportError(
+            "The numpy package is required for analytics, "
+            "install pyhaopenmotics[numpy]"
+        )
+
+
+@dataclass(frozen=True)
+class SensorStats:
+    """Object holding aggregated readings per group.
+
+    keys has one row per group with the ids of GROUP_COLUMNS, e.g.
+    (installation id, room id). count is the number of readings per group,
+    mean, min and max are NaN for groups without readings.
+    """
+
+    by: str
+    keys: Any
+    count: Any
+    mean: Any
+    min: Any  # noqa: A003
+    max: Any  # noqa: A003
+
+    def __len__(self) -> int:
+        """Return the number of groups.
+
+        Returns:
+            number of groups
+        """
+        return len(self.keys)
+
+    def to_dict(self, stat: str = "mean") -> dict[Any, float]:
+        """Return one statistic per group.
+
+        Args:
+            stat: count, mean, min or max
+
+        Returns:
+            value per group key, an id or a tuple of ids
+        """
+        values = getattr(self, stat).tolist()
+        keys = [key[0] if len(key) == 1 else tuple(key) for key in self.keys.tolist()]
+        return dict(zip(keys, values))
+
+
+@dataclass(frozen=True)
+class SensorFrame:
+    """Columnar view of sensors of one or many installations.
+
+    Every column is a NumPy array with one row per sensor. Ids are int64
+    with MISSING_ID for missing values, readings are float64 with NaN for
+    missing values.
+    """
+
+    ids: Any
+    installation_ids: Any
+    floor_ids: Any
+    room_ids: Any
+    temperature: Any
+    humidity: Any
+    brightness: Any
+
+    def __len__(self) -> int:
+        """Return the number of sensors.
+
+        Returns:
+            number of sensors
+        """
+        return len(self.ids)
+
+    @classmethod
+    def from_sensors(
+        cls, sensors: Iterable[Sensor], installation_id: int | None = None
+    ) -> SensorFrame:
+        """Build a frame from sensor models.
+
+        Args:
+            sensors: Sensor models
+            installation_id: installation of sensors without one in their
+                location
+
+        Returns:
+            SensorFrame
+        """
+        _require_numpy()
+        rows = [_sensor_row(sensor, installation_id) for sensor in sensors]
+        if not rows:
+            return cls._empty()
+
+        ids, installation_ids, floor_ids, room_ids, *readings = zip(*rows)
+        return cls(
+            np.array(ids, dtype=np.int64),
+            np.array(installation_ids, dtype=np.int64),
+            np.array(floor_ids, dtype=np.int64),
+            np.array(room_ids, dtype=np.int64),
+            *(np.array(values, dtype=np.float64) for values in readings),
+        )
+
+    @classmethod
+    def from_snapshots(cls, snapshots: Iterable[InstallationSnapshot]) -> SensorFrame:
+        """Build a frame from the sensors of installation snapshots.
+
+        Args:
+            snapshots: InstallationSnapshot objects
+
+        Returns:
+            SensorFrame
+        """
+        return cls.concat(
+            [
+                cls.from_sensors(snapshot.sensors, snapshot.installation_id)
+                for snapshot in snapshots
+            ]
+        )
+
+    @classmethod
+    def from_fleet(cls, fleet: FleetSnapshot) -> SensorFrame:
+        """Build a frame from the sensors of all installations of a fleet.
+
+        Args:
+            fleet: FleetSnapshot
+
+        Returns:
+            SensorFrame
+        """
+        return cls.from_snapshots(fleet.snapshots.values())
+
+    @classmethod
+    def concat(cls, frames: Iterable[SensorFrame]) -> SensorFrame:
+        """Concatenate frames.
+
+        Args:
+            frames: SensorFrame objects
+
+        Returns:
+            SensorFrame
+        """
+        _require_numpy()
+        frames = list(frames)
+        if not frames:
+            return cls._empty()
+        return cls(
+            *(
+                np.concatenate([getattr(frame, name) for frame in frames])
+                for name in cls.__dataclass_fields__  # pylint: disable=no-member
+            )
+        )
+
+    def aggregate(self, reading: str, by: str = "room") -> SensorStats:
+        """Aggregate a reading per installation, floor or room.
+
+        Args:
+            reading: temperature, humidity or brightness
+            by: installation, floor or room
+
+        Returns:
+            SensorStats
+
+        Raises:
+            ValueError: unknown reading or grouping
+        """
+        if reading not in READINGS:
+            raise ValueError(f"Unknown reading: {reading}")
+        if by not in GROUP_COLUMNS:
+            raise ValueError(f"Unknown grouping: {by}")
+
+        keys, groups = _group([getattr(self, name) for name in GROUP_COLUMNS[by]])
+
+        values = getattr(self, reading)
+        valid = ~np.isnan(values)
+        count = np.bincount(groups, weights=valid, minlength=len(keys))
+        total = np.bincount(
+            groups, weights=np.where(valid, values, 0.0), minlength=len(keys)
+        )
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(count > 0, total / count, np.nan)
+
+        minimum = np.full(len(keys), np.nan)
+        maximum = np.full(len(keys), np.nan)
+        np.fmin.at(minimum, groups, values)
+        np.fmax.at(maximum, groups, values)
+
+        return SensorStats(by, keys, count.astype(np.int64), mean, minimum, maximum)
+
+    @classmethod
+    def _empty(cls) -> SensorFrame:
+        """Return a frame without sensors.
+
+        Returns:
+            SensorFrame
+        """
+        ids = np.empty(0, dtype=np.int64)
+        readings = np.empty(0, dtype=np.float64)
+        return cls(ids, ids, ids, ids, readings, readings, readings)
+
+
+def _group(columns: list[Any]) -> tuple[Any, Any]:
+    """Return the distinct rows of id columns and the group of every row.
+
+    Args:
+        columns: id columns of equal length
+
+    Returns:
+        sorted distinct keys (one row per group) and group index per row
+    """
+    order = np.lexsort(columns[::-1])
+    ordered = np.stack([column[order] for column in columns], axis=1)
+    starts = np.ones(len(ordered), dtype=bool)
+    starts[1:] = np.any(ordered[1:] != ordered[:-1], axis=1)
+
+    groups = np.empty(len(ordered), dtype=np.int64)
+    groups[order] = np.cumsum(starts) - 1
+    return ordered[starts], groups
+
+
+def _sensor_row(sensor: Sensor, installation_id: int | None) -> tuple:
+    """Return the columns of a sensor.
+
+    Args:
+        sensor: Sensor
+        installation_id: fallback installation id
+
+    Returns:
+        id, installation id, floor id, room id and readings
+    """
+    location = sensor.location
+    status = sensor.status
+    if location is not None and location.installation_id is not None:
+        installation_id = location.installation_id
+    return (
+        sensor.idx,
+        MISSING_ID if installation_id is None else installation_id,
+        _id(location.floor_id if location else None),
+        _id(location.room_id if location else None),
+        *(_reading(getattr(status, name, None)) for name in READINGS),
+    )
+
+
+def _id(value: int | None) -> int:
+    """Return an id column value.
+
+    Args:
+        value: id or None
+
+    Returns:
+        id or MISSING_ID
+    """
+    return MISSING_ID if value is None else value
+
+
+def _reading(value: float | None) -> float:
+    """Return a reading column value.
+
+    Args:
+        value: reading or None
+
+    Returns:
+        reading or NaN
+    """
+    return float("nan") if value is None else value
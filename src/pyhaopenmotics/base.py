@@ -1,10 +1,16 @@
 """Module containing a BaseClient for the OpenMotics API."""
 from __future__ import annotations
 
+import asyncio
+import dataclasses
 import logging
-from typing import Any
+import time
+from contextlib import AsyncExitStack, ExitStack, contextmanager
+from typing import Any, AsyncIterator, Callable, Generator
 
-from httpx import AsyncClient
+from authlib.integrations.httpx_client import AsyncOAuth2Client  # type: ignore
+from httpx import AsyncBaseTransport, Limits, Response, codes
+from pydantic import parse_obj_as
 from tenacity import (
     retry,
     retry_if_exception_type,
@@ -13,7 +19,18 @@ from tenacity import (
     wait_random_exponential,
 )
 
-from .const import CLOUD_HOST, PREFIX
+from .cache import ResponseCache, invalidation_scopes, parse_path
+from .circuitbreaker import CircuitBreaker
+from .codec import JsonCodec, default_codec
+from .conditional import ValidatorStore
+from .const import (
+    CLOUD_HOST,
+    DEFAULT_SNAPSHOT_CONCURRENCY,
+    PREFIX,
+    RELATED_RESOURCES,
+    TOKEN_REFRESH_MARGIN,
+)
+from .construct import construct_obj_as
 from .devices.groupactions import OpenMoticsGroupActions
 from .devices.installations import OpenMoticsInstallations
 from .devices.lights import OpenMoticsLights
@@ -21,7 +38,29 @@ from .devices.outputs import OpenMoticsOutputs
 from .devices.sensors import OpenMoticsSensors
 from .devices.shutters import OpenMoticsShutters
 from .devices.thermostats import OpenMoticsThermostats
-from .errors import RetryableException, client_error_handler
+from .errors import (
+    ApiException,
+    RequestBackoffException,
+    RetryableException,
+    client_error_handler,
+)
+from .fleet import OpenMoticsFleet
+from .parsecache import ParseCache
+from .policy import (
+    RequestPolicy,
+    clear_deadline,
+    current_policy,
+    effective_deadline,
+    wait_until,
+)
+from .ratelimit import RateLimiter
+from .registry import DeviceRegistry
+from .singleflight import SingleFlight
+from .snapshot import InstallationSnapshot, take_snapshot
+from .state import DeviceStateStore, Update
+from .streaming import can_stream, iter_items
+from .tokenstore import TokenStore
+from .transport import create_limits
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +80,20 @@ class BaseClient:
         host: str | None = None,
         ssl: bool | None = True,
         port: int | None = 443,
+        limits: Limits | None = None,
+        http2: bool = False,
+        transport: AsyncBaseTransport | None = None,
+        coalesce_requests: bool = True,
+        cache: ResponseCache | None = None,
+        conditional_requests: bool = False,
+        rate_limiter: RateLimiter | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        token_store: TokenStore | None = None,
+        policy: RequestPolicy | None = None,
+        codec: JsonCodec | None = None,
+        optimistic_updates: bool = False,
+        parse_cache: bool = True,
+        trusted_parsing: bool = False,
     ) -> None:
         """
         Create new base client instance.
@@ -52,15 +105,63 @@ class BaseClient:
             host: hostname or ip
             ssl: use ssl or not
             port: port
+            limits: connection pool limits (pool size and keep-alive expiry)
+            http2: enable HTTP/2 multiplexing (requires the h2 package)
+            transport: shared httpx transport, overrides limits and http2
+            coalesce_requests: share one round-trip between identical GETs
+            cache: optional cache for GET responses
+            conditional_requests: revalidate GETs with ETag/Last-Modified
+            rate_limiter: optional limiter pacing all requests
+            circuit_breaker: optional circuit breaker for the host
+            token_store: optional store sharing tokens between processes
+            policy: default timeout and retry policy of all requests
+            codec: JSON codec, defaults to orjson when installed
+            optimistic_updates: apply the expected state of commands to
+                the state store before the command completes
+            parse_cache: reuse the models of objects that did not change
+            trusted_parsing: build models without validation, for data of
+                a trusted gateway
         """
         self.headers = {
             "Accept": "application/json",
         }
 
         self._client = None
-        self._session: AsyncClient = None  # type: ignore
+        self._session: AsyncOAuth2Client = None
         self._close_session = False
 
+        self._limits = limits or create_limits()
+        self._http2 = http2
+        self._transport = transport
+
+        self._inflight = SingleFlight() if coalesce_requests else None
+        self._cache = cache
+        self._validators = ValidatorStore() if conditional_requests else None
+        self._rate_limiter = rate_limiter
+        self._circuit_breaker = circuit_breaker
+
+        self.codec = codec or default_codec()
+        self.trusted_parsing = trusted_parsing
+        self._parse_cache = ParseCache() if parse_cache else None
+
+        # Last known state of every polled device
+        self.state = DeviceStateStore()
+        # Indexes by room, floor, gateway, type and capability, fed by state
+        self.registry = DeviceRegistry()
+        self.registry.attach(self.state)
+        self.optimistic_updates = optimistic_updates
+        self._command_listeners: list[Callable[[str], None]] = []
+
+        # Policies per device module, e.g. {"lights": RequestPolicy.interactive()}
+        self.policy = policy or RequestPolicy()
+        self.policies: dict[str, RequestPolicy] = {}
+
+        self.token: dict[str, Any] | None = None
+        self.token_refresh_margin = TOKEN_REFRESH_MARGIN
+        self._token_flight = SingleFlight()
+        self._token_refresh_task: asyncio.Task | None = None
+        self._token_store = token_store
+
         if host is None:
             self._host = CLOUD_HOST
         else:
@@ -68,6 +169,7 @@ class BaseClient:
 
         self.url = f"{'https' if ssl else 'http'}://{self._host}:{port}"
         self.token_url = self._get_url("/authentication/oauth2/token")
+        self.token_store_key = self.token_url
 
         self.installations = OpenMoticsInstallations(baseclient=self)
         self.outputs = OpenMoticsOutputs(baseclient=self)
@@ -76,6 +178,17 @@ class BaseClient:
         self.lights = OpenMoticsLights(baseclient=self)
         self.sensors = OpenMoticsSensors(baseclient=self)
         self.thermostats = OpenMoticsThermostats(baseclient=self)
+        self.fleet = OpenMoticsFleet(baseclient=self)
+
+    def _get_session_kwargs(self) -> dict[str, Any]:
+        """Return the transport arguments for the underlying AsyncClient.
+
+        Returns:
+            keyword arguments for the httpx AsyncClient
+        """
+        if self._transport is not None:
+            return {"transport": self._transport}
+        return {"limits": self._limits, "http2": self._http2}
 
     def _get_url(self, endpoint):
         """Join endpoint to url.
@@ -95,7 +208,29 @@ class BaseClient:
         reraise=True,
     )
     async def get_token(self):
-        """Get Token.
+        """Get a new token.
+
+        Only one token request is in flight at a time, concurrent callers
+        await the same request.
+        """
+        await self._token_flight.do(None, self._refresh_token)
+
+    async def _refresh_token(self) -> None:
+        """Reuse a valid token from the token store or fetch a new one."""
+        if self._token_store is not None:
+            token = await asyncio.get_running_loop().run_in_executor(
+                None, self._token_store.load, self.token_store_key
+            )
+            if token is not None and self._token_is_fresh(token):
+                self._session.token = token
+                self._set_token(self._session.token)
+                return
+
+        token = await self._fetch_token()
+        await self.token_saver(token)
+
+    async def _fetch_token(self) -> dict[str, Any]:
+        """Fetch a new token from the token endpoint.
 
         Subclasses should implement this!
 
@@ -106,95 +241,559 @@ class BaseClient:
 
     async def token_saver(self, token, **kwargs):
         # def token_saver(self, token, refresh_token=None, access_token=None):
-        """Save Token.
-
-        Subclasses should implement this!
+        """Save the token to self.token and the token store.
 
         Args:
             token: str
             **kwargs: any
+        """
+        self._set_token(token)
+        if self._token_store is not None:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._token_store.save, self.token_store_key, dict(token)
+            )
 
-        Raises:
-            NotImplementedError: blabla
+    def _set_token(self, token: dict[str, Any]) -> None:
+        """Use a token and schedule its refresh.
+
+        Args:
+            token: token
         """
-        raise NotImplementedError()  # noqa: DAR401
+        self.token = token
+        self._schedule_token_refresh()
 
-    @retry(
-        retry=retry_if_exception_type(RetryableException),
-        stop=(stop_after_delay(300) | stop_after_attempt(10)),
-        wait=wait_random_exponential(multiplier=1, max=30),
-        reraise=True,
-    )
-    async def post(self, path: str, **kwargs) -> dict[str, Any]:
+    def _token_is_fresh(self, token: dict[str, Any]) -> bool:
+        """Check whether a stored token is valid for a while.
+
+        Args:
+            token: token
+
+        Returns:
+            True when the token doesn't need a refresh yet
+        """
+        expires_at = token.get("expires_at")
+        if expires_at is None:
+            return False
+        return float(expires_at) - time.time() > self.token_refresh_margin
+
+    def _token_expires_at(self) -> float | None:
+        """Return the expiry time of the token.
+
+        Returns:
+            epoch in seconds or None when unknown
+        """
+        if not self.token:
+            return None
+        expires_at = self.token.get("expires_at")
+        if expires_at is None:
+            return None
+        return float(expires_at)
+
+    def _token_margin(self) -> float:
+        """Return how long before expiry the token is refreshed.
+
+        Short lived tokens are refreshed halfway so they aren't refreshed
+        over and over again.
+
+        Returns:
+            seconds before expiry
+        """
+        expires_in = (self.token or {}).get("expires_in")
+        if not expires_in:
+            return self.token_refresh_margin
+        return min(self.token_refresh_margin, float(expires_in) / 2)
+
+    def _schedule_token_refresh(self) -> None:
+        """Refresh the token in the background shortly before it expires."""
+        if self._token_refresh_task is not None:
+            self._token_refresh_task.cancel()
+            self._token_refresh_task = None
+
+        expires_at = self._token_expires_at()
+        if expires_at is None:
+            return
+
+        delay = max(0.0, expires_at - time.time() - self._token_margin())
+        self._token_refresh_task = asyncio.get_running_loop().create_task(
+            self._refresh_token_later(delay)
+        )
+
+    async def _refresh_token_later(self, delay: float) -> None:
+        """Refresh the token after delay seconds.
+
+        Args:
+            delay: seconds to wait
+        """
+        await asyncio.sleep(delay)
+        try:
+            await self.get_token()
+        except ApiException as err:
+            # Requests refresh the token themselves when it is about to expire.
+            logger.warning("Background token refresh failed: %s", err)
+
+    async def _ensure_token(self) -> None:
+        """Wait for a running token refresh or refresh an expiring token."""
+        if self.token is None:
+            return
+
+        expires_at = self._token_expires_at()
+        if len(self._token_flight) or (
+            expires_at is not None and expires_at - time.time() < self._token_margin()
+        ):
+            await self.get_token()
+
+    def _resolve_policy(self, path: str, policy: RequestPolicy | None) -> RequestPolicy:
+        """Return the policy of a request.
+
+        An explicit policy wins over one set with use_policy, which wins over
+        the policy of the device module, which wins over the client policy.
+
+        Args:
+            path: path
+            policy: policy passed to the call
+
+        Returns:
+            RequestPolicy
+        """
+        if policy is not None:
+            return policy
+
+        policy = current_policy()
+        if policy is not None:
+            return policy
+
+        _, resource = parse_path(path)
+        return self.policies.get(resource, self.policy)  # type: ignore
+
+    async def post(
+        self, path: str, policy: RequestPolicy | None = None, **kwargs
+    ) -> dict[str, Any]:
         """Make post request using the underlying httpx AsyncClient.
 
-        with the default timeout of 15s. in case of retryable exceptions,
-        requests are retryed for up to 10 times or 5 minutes.
+        with the timeout of the request policy (15s by default). in case of
+        retryable exceptions, requests are retryed for up to 10 times or
+        5 minutes by default.
 
         Args:
             path: path
+            policy: timeout and retry policy of this call
             **kwargs: extra args
 
         Returns:
             response json or text
         """
-        uri = self._get_url(path)
-
-        with client_error_handler():
-            resp = await self._session.post(
-                uri,
-                timeout=15.0,
-                headers=self.headers,
-                **kwargs,
+        policy = self._resolve_policy(path, policy)
+        if "json" in kwargs:
+            # Encode once, not on every retry.
+            kwargs["content"] = self.codec.dumps(kwargs.pop("json"))
+            kwargs["headers"] = {
+                **self.headers,
+                "Content-Type": self.codec.content_type,
+            }
+        try:
+            resp = await policy.call(
+                lambda timeout: self._send("POST", path, timeout=timeout, **kwargs)
             )
-
-            resp.raise_for_status()
+        finally:
+            self._on_command(path)
 
         if "application/json" in resp.headers.get("Content-Type", ""):
-            response_data = resp.json()
+            response_data = self.codec.loads(resp.content)
             return response_data
 
-        return resp.text()  # type: ignore
+        return resp.text  # type: ignore
 
-    @retry(
-        retry=retry_if_exception_type(RetryableException),
-        stop=(stop_after_delay(300) | stop_after_attempt(10)),
-        wait=wait_random_exponential(multiplier=1, max=30),
-        reraise=True,
-    )
-    async def get(self, path: str, **kwargs) -> dict[str, Any]:
+    async def get(
+        self, path: str, policy: RequestPolicy | None = None, **kwargs
+    ) -> dict[str, Any]:
+        """Make get request, coalescing identical concurrent requests.
+
+        Concurrent GETs for the same path and params share one network
+        round-trip and receive the same parsed response.
+
+        Args:
+            path: path
+            policy: timeout and retry policy of this call
+            **kwargs: extra args
+
+        Returns:
+            response json or text
+        """
+        policy = self._resolve_policy(path, policy)
+        key = _request_key(path, kwargs)
+        if self._cache is not None and key is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+
+        if self._inflight is None or key is None:
+            return await self._get(path, policy, **kwargs)
+
+        # The shared call has no deadline, every caller gives up at its own
+        # deadline. Only callers with the same retry policy share a call.
+        shared_policy = dataclasses.replace(policy, deadline=None)
+
+        async def shared_get() -> dict[str, Any]:
+            # Runs in its own task, clearing the deadline doesn't leak into
+            # the context of the caller.
+            clear_deadline()
+            return await self._get(path, shared_policy, **kwargs)
+
+        return await wait_until(
+            self._inflight.do((*key, shared_policy), shared_get),
+            effective_deadline(policy),
+        )
+
+    async def iter_data(
+        self,
+        type_: Any,
+        path: str,
+        policy: RequestPolicy | None = None,
+        **kwargs,
+    ) -> AsyncIterator[Any]:
+        """Make get request and parse the data array one item at a time.
+
+        With ijson installed, the body is streamed and every item is
+        validated as soon as it is received, so the raw body, the decoded
+        json and the models are never held in memory at once. Errors are
+        retried as the policy allows until the body starts streaming.
+        Without ijson, or for cached responses, the body is decoded at once.
+
+        Args:
+            type_: model of the items, e.g. Output
+            path: path
+            policy: timeout and retry policy of this call
+            **kwargs: extra args
+
+        Yields:
+            parsed model
+        """
+        policy = self._resolve_policy(path, policy)
+        key = _request_key(path, kwargs)
+        cached = None
+        if self._cache is not None and key is not None:
+            cached = self._cache.get(key)
+
+        if cached is not None or not can_stream():
+            body = cached or await self.get(path, policy, **kwargs)
+            for item in body["data"]:
+                yield self._parse(type_, item, path)
+            return
+
+        async def attempt(timeout: float) -> tuple[Response, AsyncExitStack]:
+            # A failed attempt closes its response before the next one.
+            async with AsyncExitStack() as stack:
+                resp = await self._send(
+                    "GET", path, timeout=timeout, stack=stack, **kwargs
+                )
+                return resp, stack.pop_all()
+
+        resp, stream = await policy.call(attempt)
+        async with stream:
+            with client_error_handler():
+                async for item in iter_items(resp.aiter_bytes()):
+                    yield self._parse(type_, item, path)
+
+    async def _get(self, path: str, policy: RequestPolicy, **kwargs) -> dict[str, Any]:
         """Make get request using the underlying httpx AsyncClient.
 
-        with the default timeout of 15s. In case of retryable exceptions,
-        requests are retryed for up to 10 times or 5 minutes.
+        with the timeout of the request policy. In case of retryable
+        exceptions, requests are retried as the policy allows.
 
         Args:
             path: path
+            policy: timeout and retry policy
             **kwargs: extra args
 
         Returns:
             response json or text
         """
+        key = _request_key(path, kwargs)
+        generation = None
+        if self._cache is not None:
+            generation = self._cache.generation(path)
+
+        headers = self.headers
+        if self._validators is not None and key is not None:
+            headers = {**self.headers, **self._validators.headers(key)}
+
+        resp = await policy.call(
+            lambda timeout: self._send(
+                "GET",
+                path,
+                headers=headers,
+                not_modified=True,
+                timeout=timeout,
+                **kwargs,
+            )
+        )
+
+        entry = None
+        if resp.status_code == codes.NOT_MODIFIED:
+            if key is not None and self._validators is not None:
+                entry = self._validators.not_modified(key)
+            if entry is None:
+                with client_error_handler():
+                    resp.raise_for_status()
+
+        if entry is not None:
+            response_data = entry.data
+            size = entry.size
+        elif "application/json" in resp.headers.get("Content-Type", ""):
+            response_data = self.codec.loads(resp.content)
+            size = len(resp.content)
+            if self._validators is not None and key is not None:
+                self._validators.store(key, resp, response_data)
+        else:
+            return resp.text  # type: ignore
+
+        if self._cache is not None and key is not None:
+            self._cache.set(key, path, response_data, size, generation)
+        return response_data
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        headers: dict[str, str] | None = None,
+        not_modified: bool = False,
+        timeout: float = 15.0,
+        stack: AsyncExitStack | None = None,
+        **kwargs,
+    ) -> Response:
+        """Send a request and raise the matching exception for errors.
+
+        When a rate limiter is configured, the request is paced by it and a
+        429 response holds back all requests for the Retry-After period
+        before the request is sent again. When a circuit breaker is
+        configured and open, the request fails fast.
+
+        Args:
+            method: http method
+            path: path
+            headers: headers, defaults to self.headers
+            not_modified: don't raise for a 304 Not Modified response
+            timeout: timeout of the request
+            stack: stream the body, the response is closed with the stack
+            **kwargs: extra args
+
+        Returns:
+            httpx Response
+
+        Raises:
+            RequestBackoffException: too many requests, even after backing off
+            BaseException: the exception of pacing or the token refresh, after
+                releasing the probe of the circuit breaker
+        """
         uri = self._get_url(path)
+        backoffs = 0
+        while True:
+            probe = False
+            if self._circuit_breaker is not None:
+                probe = self._circuit_breaker.before_request()
+            try:
+                if self._rate_limiter is not None:
+                    await self._rate_limiter.acquire(path)
+                await self._ensure_token()
+            except BaseException:
+                # The probe was never sent, it has no outcome to record.
+                if probe:
+                    self._circuit_breaker.release()  # type: ignore
+                raise
+
+            try:
+                with self._record_outcome(), client_error_handler():
+                    if stack is None:
+                        resp = await self._session.request(
+                            method,
+                            uri,
+                            timeout=timeout,
+                            headers=headers or self.headers,
+                            **kwargs,
+                        )
+                    else:
+                        resp = await stack.enter_async_context(
+                            self._session.stream(
+                                method,
+                                uri,
+                                timeout=timeout,
+                                headers=headers or self.headers,
+                                **kwargs,
+                            )
+                        )
+                        if resp.is_error:
+                            await resp.aread()
+
+                    if not (not_modified and resp.status_code == codes.NOT_MODIFIED):
+                        resp.raise_for_status()
+                return resp
+            except RequestBackoffException as err:
+                if (
+                    self._rate_limiter is None
+                    or backoffs >= self._rate_limiter.max_backoff_retries
+                ):
+                    raise
+                backoffs += 1
+                logger.debug("Backing off for %s seconds", err.retry_after)
+                self._rate_limiter.backoff(err.retry_after)
+
+    @contextmanager
+    def _record_outcome(self) -> Generator[None, None, None]:
+        """Report the outcome of a request to the circuit breaker.
+
+        Yields:
+            None
 
-        with client_error_handler():
-            resp = await self._session.get(
-                uri,
-                timeout=15.0,
-                headers=self.headers,
-                **kwargs,
+        Raises:
+            BaseException: the exception of the request, after recording it
+        """
+        if self._circuit_breaker is None:
+            yield
+            return
+
+        try:
+            yield
+        except BaseException as err:
+            self._circuit_breaker.record(err)
+            raise
+        self._circuit_breaker.record(None)
+
+    def parse_body(
+        self, type_: Any, body: dict[str, Any], path: str | None = None
+    ) -> Any:
+        """Parse the data of a response body into models.
+
+        Bodies returned again after a 304 Not Modified response reuse the
+        models parsed from them the first time. Otherwise, objects identical
+        to the previous response reuse their model from the parse cache.
+
+        Args:
+            type_: model or list of models, e.g. list[Output]
+            body: response json
+            path: path the body was read from
+
+        Returns:
+            parsed models
+        """
+        entry = None
+        if self._validators is not None:
+            entry = self._validators.entry_for(body)
+        if entry is None:
+            return self._parse(type_, body["data"], path)
+
+        if type_ not in entry.parsed:
+            entry.parsed[type_] = self._parse(type_, body["data"], path)
+        return entry.parsed[type_]
+
+    def _parse(self, type_: Any, data: Any, path: str | None = None) -> Any:
+        """Validate data, reusing cached models when enabled.
+
+        Cached models are scoped to the installation of the path, or to the
+        path itself outside an installation.
+
+        Args:
+            type_: model or list of models, e.g. list[Output]
+            data: decoded json
+            path: path the data was read from
+
+        Returns:
+            parsed models
+        """
+        if self._parse_cache is not None:
+            installation_id = parse_path(path)[0] if path else None
+            scope = path if installation_id is None else installation_id
+            return self._parse_cache.parse(type_, data, self.trusted_parsing, scope)
+        if self.trusted_parsing:
+            return construct_obj_as(type_, data)
+        return parse_obj_as(type_, data)
+
+    async def snapshot(
+        self,
+        installation_id: int,
+        max_concurrency: int = DEFAULT_SNAPSHOT_CONCURRENCY,
+    ) -> InstallationSnapshot:
+        """Fetch all device collections of an installation concurrently.
+
+        Args:
+            installation_id: int
+            max_concurrency: maximum number of requests in flight
+
+        Returns:
+            immutable snapshot of the installation
+        """
+        return await take_snapshot(self, installation_id, max_concurrency)
+
+    def _on_command(self, path: str) -> None:
+        """Forget cached state of the resource a command was sent to.
+
+        Args:
+            path: path of the command
+        """
+        if self._cache is not None:
+            self._cache.invalidate(path)
+
+        if self._inflight is not None:
+            scopes = invalidation_scopes(path)
+            self._inflight.discard_if(
+                lambda key: isinstance(key, tuple) and parse_path(key[0]) in scopes
             )
 
-            resp.raise_for_status()
+        for listener in list(self._command_listeners):
+            try:
+                listener(path)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Error in command listener")
 
-        if "application/json" in resp.headers.get("Content-Type", ""):
-            response_data = resp.json()
-            return response_data
+    @contextmanager
+    def optimistic(
+        self,
+        installation_id: int,
+        kind: str,
+        device_id: int | None,
+        update: Update,
+    ) -> Generator[None, None, None]:
+        """Apply the expected state of a command when optimistic updates are on.
+
+        Lights are outputs, so a command on either updates both collections.
+
+        Args:
+            installation_id: int
+            kind: collection, e.g. "outputs"
+            device_id: int, None for commands on all devices
+            update: expected values, e.g. {"status": {"on": True}}
+
+        Yields:
+            None, wrapping the command
+        """
+        with ExitStack() as stack:
+            if self.optimistic_updates and device_id is not None:
+                for related in (kind, *RELATED_RESOURCES.get(kind, ())):
+                    stack.enter_context(
+                        self.state.optimistic(
+                            installation_id, related, device_id, update
+                        )
+                    )
+            yield
+
+    def add_command_listener(
+        self, listener: Callable[[str], None]
+    ) -> Callable[[], None]:
+        """Call listener with the path of every command sent.
+
+        Args:
+            listener: callable receiving the path
 
-        return resp.text()  # type: ignore
+        Returns:
+            callable removing the listener
+        """
+        self._command_listeners.append(listener)
+        return lambda: self._command_listeners.remove(listener)
 
     async def close(self) -> None:
         """Close open client session."""
+        if self._token_refresh_task is not None:
+            self._token_refresh_task.cancel()
+            self._token_refresh_task = None
         if self._session and self._close_session:
             await self._session.aclose()
 
@@ -213,3 +812,34 @@ class BaseClient:
             *exc_info: obj
         """
         await self.close()
+
+
+def _request_key(
+    path: str, kwargs: dict[str, Any]
+) -> tuple[str, tuple[Any, ...]] | None:
+    """Build a key identifying identical GET requests.
+
+    Only requests without extra arguments besides params can be shared.
+
+    Args:
+        path: path
+        kwargs: extra args of the request
+
+    Returns:
+        hashable key or None when the request can't be shared
+    """
+    if set(kwargs) - {"params"}:
+        return None
+
+    params = kwargs.get("params")
+    if not params:
+        return (path, ())
+    if not isinstance(params, dict):
+        return None
+
+    try:
+        key = (path, tuple(sorted(params.items())))
+        hash(key)
+    except TypeError:
+        return None
+    return key
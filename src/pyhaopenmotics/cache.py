@@ -0,0 +1,206 @@
+"""Module containing an in-memory TTL cache for GET responses."""
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable
+
+from .const import (
+    DEFAULT_CACHE_MAX_BYTES,
+    DEFAULT_CACHE_MAX_ENTRIES,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_CACHE_TTLS,
+    RELATED_RESOURCES,
+)
+
+
+def parse_path(path: str) -> tuple[int | None, str | None]:
+    """Split an API path in the installation id and the resource.
+
+    "/base/installations" -> (None, "installations")
+    "/base/installations/1" -> (1, "installations")
+    "/base/installations/1/outputs/2/turn_on" -> (1, "outputs")
+
+    Args:
+        path: path
+
+    Returns:
+        installation id and resource name
+    """
+    parts = [part for part in path.split("/") if part]
+    if len(parts) < 2 or parts[0] != "base":
+        return None, None
+    if len(parts) < 3 or not parts[2].isdigit():
+        return None, parts[1]
+    if len(parts) < 4:
+        return int(parts[2]), parts[1]
+    return int(parts[2]), parts[3]
+
+
+def invalidation_scopes(path: str) -> set[tuple[int | None, str | None]]:
+    """Return the resources whose state is changed by a command.
+
+    Args:
+        path: path of the command
+
+    Returns:
+        set of (installation id, resource) tuples
+    """
+    installation_id, resource = parse_path(path)
+    resources = (resource, *RELATED_RESOURCES.get(resource, ()))  # type: ignore
+    return {(installation_id, res) for res in resources}
+
+
+@dataclass
+class CacheEntry:
+    """Class holding a cached response."""
+
+    data: Any
+    size: int
+    expires: float
+    scope: tuple[int | None, str | None]
+
+
+class ResponseCache:
+    """LRU cache of GET responses with a TTL per resource.
+
+    The cache is bounded by the number of entries and by the size of the
+    raw response bodies. Entries are invalidated per installation and
+    resource when a command is sent to that resource.
+    """
+
+    def __init__(
+        self,
+        ttls: dict[str, float] | None = None,
+        default_ttl: float = DEFAULT_CACHE_TTL,
+        max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+    ) -> None:
+        """Init the ResponseCache object.
+
+        Args:
+            ttls: time to live in seconds per resource, e.g. {"sensors": 2}
+            default_ttl: time to live of resources not in ttls
+            max_entries: maximum number of cached responses
+            max_bytes: maximum total size of the cached response bodies
+        """
+        self.ttls = {**DEFAULT_CACHE_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._entries: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+        self._generations: dict[tuple[int | None, str | None], int] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached responses.
+
+        Returns:
+            number of cached responses
+        """
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """Return the total size of the cached response bodies.
+
+        Returns:
+            size in bytes
+        """
+        return self._size
+
+    def generation(self, path: str) -> int:
+        """Return the invalidation generation of the resource of a path.
+
+        Capture it before sending a request and pass it to set() so a
+        response that raced with a command isn't cached.
+
+        Args:
+            path: path
+
+        Returns:
+            generation counter
+        """
+        return self._generations.get(parse_path(path), 0)
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return a fresh cached response.
+
+        Args:
+            key: request key
+
+        Returns:
+            cached response data or None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires <= time.monotonic():
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return entry.data
+
+    def set(
+        self,
+        key: Hashable,
+        path: str,
+        data: Any,
+        size: int,
+        generation: int | None = None,
+    ) -> None:
+        """Store a response.
+
+        Args:
+            key: request key
+            path: path of the request
+            data: response data
+            size: size of the raw response body
+            generation: generation captured before the request was sent
+        """
+        scope = parse_path(path)
+        if generation is not None and generation != self._generations.get(scope, 0):
+            return
+
+        ttl = self.ttls.get(scope[1], self.default_ttl)  # type: ignore
+        if ttl <= 0 or size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = CacheEntry(data, size, time.monotonic() + ttl, scope)
+        self._size += size
+
+        while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate(self, path: str) -> None:
+        """Invalidate the cached collection a command path belongs to.
+
+        Args:
+            path: path of the command
+        """
+        scopes = invalidation_scopes(path)
+        for scope in scopes:
+            self._generations[scope] = self._generations.get(scope, 0) + 1
+        for key in [
+            key for key, entry in self._entries.items() if entry.scope in scopes
+        ]:
+            self._remove(key)
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        self._entries.clear()
+        self._size = 0
+
+    def _remove(self, key: Hashable) -> None:
+        """Remove a cached response.
+
+        Args:
+            key: request key
+        """
+        entry = self._entries.pop(key)
+        self._size -= entry.size
@@ -0,0 +1,142 @@
+"""Module containing a circuit breaker for requests towards one host."""
+from __future__ import annotations
+
+import logging
+import time
+
+from .const import (
+    DEFAULT_CIRCUIT_FAILURE_THRESHOLD,
+    DEFAULT_CIRCUIT_RESET_TIMEOUT,
+)
+from .errors import (
+    CircuitOpenException,
+    NetworkException,
+    NetworkTimeoutException,
+    RequestServerException,
+)
+from .models.util import StrEnum
+
+logger = logging.getLogger(__name__)
+
+FAILURE_EXCEPTIONS = (
+    NetworkException,
+    NetworkTimeoutException,
+    RequestServerException,
+)
+
+
+class CircuitState(StrEnum):
+    """State of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Fail fast when a host keeps failing.
+
+    After failure_threshold consecutive network or 5xx failures the circuit
+    opens and every request fails immediately with CircuitOpenException.
+    Once reset_timeout has passed a single probe request is let through:
+    when it succeeds the circuit closes again, when it fails it reopens.
+
+    Share one instance between the clients that talk to the same host.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_CIRCUIT_RESET_TIMEOUT,
+    ) -> None:
+        """Init the CircuitBreaker object.
+
+        Args:
+            failure_threshold: consecutive failures that open the circuit
+            reset_timeout: seconds the circuit stays open before a probe
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    @property
+    def state(self) -> CircuitState:
+        """Return the state of the circuit.
+
+        Returns:
+            CircuitState
+        """
+        if (
+            self._state == CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self.reset_timeout
+        ):
+            return CircuitState.HALF_OPEN
+        return self._state
+
+    def before_request(self) -> bool:
+        """Check whether a request may be sent.
+
+        When the request is the probe, it must report its outcome with
+        record, or call release when it is abandoned before being sent.
+
+        Returns:
+            True when the request is the probe of a half open circuit
+
+        Raises:
+            CircuitOpenException: the circuit is open or a probe is running
+        """
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return False
+        if state == CircuitState.HALF_OPEN and not self._probing:
+            self._state = CircuitState.HALF_OPEN
+            self._probing = True
+            return True
+
+        raise CircuitOpenException(
+            (
+                "Circuit breaker is open after repeated failures. Requests"
+                " fail fast until the host has recovered."
+            ),
+            None,
+            None,
+        )
+
+    def release(self) -> None:
+        """Give up the probe before it was sent, so another request probes."""
+        self._probing = False
+
+    def record(self, err: BaseException | None) -> None:
+        """Record the outcome of a request.
+
+        Args:
+            err: the exception raised by the request, None on success
+        """
+        if not isinstance(err, Exception):
+            if err is not None:
+                # Cancelled request, let the next request probe again.
+                self._probing = False
+                return
+        elif not isinstance(err, FAILURE_EXCEPTIONS):
+            # The host answered, so it is reachable.
+            err = None
+
+        self._probing = False
+        if err is None:
+            self._state = CircuitState.CLOSED
+            self._failures = 0
+            return
+
+        self._failures += 1
+        if (
+            self._state == CircuitState.HALF_OPEN
+            or self._failures >= self.failure_threshold
+        ):
+            if self._state == CircuitState.CLOSED:
+                logger.warning("Circuit opened after %s failures", self._failures)
+            self._state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
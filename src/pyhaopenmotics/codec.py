@@ -0,0 +1,87 @@
+"""Module containing the JSON codecs used to encode and decode bodies."""
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+class JsonCodec:
+    """JSON codec based on the standard library."""
+
+    content_type = "application/json"
+
+    def loads(self, data: bytes) -> Any:
+        """Decode a body.
+
+        Args:
+            data: raw body
+
+        Returns:
+            decoded json
+        """
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        """Encode a payload.
+
+        Args:
+            obj: payload
+
+        Returns:
+            encoded json
+        """
+        # Compact UTF-8, byte for byte what orjson produces.
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+class OrjsonCodec(JsonCodec):
+    """JSON codec based on orjson."""
+
+    def __init__(self) -> None:
+        """Init the OrjsonCodec object.
+
+        Raises:
+            ImportError: orjson is not installed
+        """
+        if orjson is None:
+            raise ImportError(
+                "orjson is required for OrjsonCodec, install pyhaopenmotics[orjson]"
+            )
+
+    def loads(self, data: bytes) -> Any:
+        """Decode a body.
+
+        Args:
+            data: raw body
+
+        Returns:
+            decoded json
+        """
+        return orjson.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        """Encode a payload.
+
+        Args:
+            obj: payload
+
+        Returns:
+            encoded json
+        """
+        return orjson.dumps(obj)
+
+
+def default_codec() -> JsonCodec:
+    """Return the fastest available codec.
+
+    Returns:
+        OrjsonCodec when orjson is installed, JsonCodec otherwise
+    """
+    if orjson is not None:
+        return OrjsonCodec()
+    return JsonCodec()
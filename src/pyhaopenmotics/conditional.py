@@ -0,0 +1,143 @@
+"""Module containing the validator store for conditional GET requests."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Hashable
+
+from httpx import Response
+
+from .const import DEFAULT_CACHE_MAX_ENTRIES
+
+
+@dataclass
+class ValidatorEntry:
+    """Class holding the validators and body of a response."""
+
+    data: Any
+    size: int = 0
+    etag: str | None = None
+    last_modified: str | None = None
+    parsed: dict[Any, Any] = field(default_factory=dict)
+
+    def headers(self) -> dict[str, str]:
+        """Return the headers revalidating this response.
+
+        Returns:
+            If-None-Match and/or If-Modified-Since headers
+        """
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ValidatorStore:
+    """Store ETag/Last-Modified validators and the matching bodies per URL.
+
+    When the server answers a conditional GET with 304 Not Modified, the
+    stored body is returned again, together with the models already parsed
+    from it.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_MAX_ENTRIES) -> None:
+        """Init the ValidatorStore object.
+
+        Args:
+            max_entries: maximum number of stored responses
+        """
+        self.max_entries = max_entries
+
+        self._entries: OrderedDict[Hashable, ValidatorEntry] = OrderedDict()
+        # Stored bodies are kept alive by their entry, so their id is stable.
+        self._by_body: dict[int, ValidatorEntry] = {}
+
+    def __len__(self) -> int:
+        """Return the number of stored responses.
+
+        Returns:
+            number of stored responses
+        """
+        return len(self._entries)
+
+    def headers(self, key: Hashable) -> dict[str, str]:
+        """Return the conditional headers for a request.
+
+        Args:
+            key: request key
+
+        Returns:
+            conditional headers, empty when nothing is stored
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return {}
+        return entry.headers()
+
+    def not_modified(self, key: Hashable) -> ValidatorEntry | None:
+        """Return the stored response after a 304 response.
+
+        Args:
+            key: request key
+
+        Returns:
+            stored entry or None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        self._entries.move_to_end(key)
+        return entry
+
+    def store(self, key: Hashable, resp: Response, data: Any) -> None:
+        """Store the validators of a response.
+
+        Responses without ETag or Last-Modified header are not stored.
+
+        Args:
+            key: request key
+            resp: httpx response
+            data: decoded response data
+        """
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+
+        self.discard(key)
+        if etag is None and last_modified is None:
+            return
+
+        entry = ValidatorEntry(data, len(resp.content), etag, last_modified)
+        self._entries[key] = entry
+        self._by_body[id(data)] = entry
+
+        while len(self._entries) > self.max_entries:
+            self.discard(next(iter(self._entries)))
+
+    def entry_for(self, data: Any) -> ValidatorEntry | None:
+        """Return the entry a response body belongs to.
+
+        Args:
+            data: response data returned by BaseClient.get
+
+        Returns:
+            entry or None when the body isn't stored
+        """
+        return self._by_body.get(id(data))
+
+    def discard(self, key: Hashable) -> None:
+        """Remove a stored response.
+
+        Args:
+            key: request key
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            del self._by_body[id(entry.data)]
+
+    def clear(self) -> None:
+        """Remove all stored responses."""
+        self._entries.clear()
+        self._by_body.clear()
@@ -4,3 +4,63 @@ _RESPONSE_STATUS_OK = "ok"
 
 CLOUD_HOST = "cloud.openmotics.com"
 PREFIX = "/api/v1.1"
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+DEFAULT_CACHE_TTL = 5.0
+DEFAULT_CACHE_TTLS = {
+    "installations": 300.0,
+    "groupactions": 60.0,
+    "thermostats": 10.0,
+    "outputs": 5.0,
+    "lights": 5.0,
+    "shutters": 5.0,
+    "sensors": 2.0,
+}
+DEFAULT_CACHE_MAX_ENTRIES = 256
+DEFAULT_CACHE_MAX_BYTES = 4 * 1024 * 1024
+
+# Commands on one of these resources change the state of the others too.
+RELATED_RESOURCES = {
+    "outputs": ("lights",),
+    "lights": ("outputs",),
+}
+
+DEFAULT_RATE_LIMIT = 10.0
+DEFAULT_RATE_LIMIT_BURST = 20
+DEFAULT_RETRY_AFTER = 5.0
+MAX_BACKOFF_RETRIES = 5
+
+DEFAULT_CIRCUIT_FAILURE_THRESHOLD = 5
+DEFAULT_CIRCUIT_RESET_TIMEOUT = 30.0
+
+TOKEN_REFRESH_MARGIN = 60.0
+
+DEFAULT_SNAPSHOT_CONCURRENCY = 4
+DEFAULT_FLEET_CONCURRENCY = 8
+
+# Poll intervals of the PollScheduler in seconds.
+DEFAULT_POLL_INTERVALS = {
+    "outputs": 10.0,
+    "lights": 10.0,
+    "shutters": 15.0,
+    "sensors": 30.0,
+    "thermostat_units": 60.0,
+}
+DEFAULT_FAST_POLL_INTERVAL = 1.0
+DEFAULT_FAST_POLL_DURATION = 15.0
+DEFAULT_POLL_BACKOFF_FACTOR = 2.0
+DEFAULT_MAX_POLL_BACKOFF = 8.0
+
+EVENTS_PATH = "/ws/events"
+DEFAULT_EVENTS_RECONNECT_MIN = 1.0
+DEFAULT_EVENTS_RECONNECT_MAX = 60.0
+
+DEFAULT_PARSE_CACHE_MAX_ENTRIES = 4096
+DEFAULT_INTERNER_MAX_ENTRIES = 4096
+
+# Time series: points per series and memory cap of all series in bytes.
+DEFAULT_SERIES_CAPACITY = 2880
+DEFAULT_TIMESERIES_MAX_BYTES = 16 * 1024 * 1024
@@ -0,0 +1,241 @@
+"""Module containing a fast path building models from trusted data."""
+from __future__ import annotations
+
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    FrozenSet,
+    List,
+    Optional,
+    Tuple,
+    get_args,
+    get_origin,
+)
+
+from pydantic import BaseModel, parse_obj_as
+from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON, ModelField
+
+Converter = Callable[[Any], Any]
+
+# Per model: (alias, field name, converter, default) per field, the required
+# field names and whether the model has private attributes.
+_Mapper = Tuple[List[Tuple[str, str, Optional[Converter], Any]], FrozenSet[str], bool]
+_MAPPERS: dict[type[BaseModel], _Mapper] = {}
+
+# Default of fields whose default must be copied for every instance.
+_COPY = object()
+
+
+class _Fallback(Exception):
+    """Raised when data needs the validated path."""
+
+
+def construct_model(model: type[BaseModel], data: Any) -> BaseModel:
+    """Build a model from trusted data without running validation.
+
+    Aliases (e.g. "id", "type", "_version") are mapped to field names,
+    nested models are built recursively and scalars are coerced with a
+    type check only. Data the fast path cannot handle, such as a missing
+    required field, goes through full validation instead, which raises the
+    usual ValidationError.
+
+    Args:
+        model: pydantic model
+        data: decoded json of one object
+
+    Returns:
+        model instance
+    """
+    try:
+        return _construct(model, data)
+    except _Fallback:
+        return model.parse_obj(data)
+
+
+def construct_obj_as(type_: Any, data: Any) -> Any:
+    """Build a model or a list of models from trusted data.
+
+    Args:
+        type_: model or list of models, e.g. list[Output]
+        data: decoded json
+
+    Returns:
+        parsed models
+    """
+    if get_origin(type_) in (list, List) and isinstance(data, list):
+        args = get_args(type_)
+        if len(args) == 1 and is_model(args[0]):
+            return [construct_model(args[0], item) for item in data]
+    elif is_model(type_):
+        return construct_model(type_, data)
+    return parse_obj_as(type_, data)
+
+
+def _construct(model: type[BaseModel], data: Any) -> BaseModel:
+    """Build a model, raising _Fallback for data needing validation.
+
+    Args:
+        model: pydantic model
+        data: decoded json of one object
+
+    Returns:
+        model instance
+
+    Raises:
+        _Fallback: data is not a dict or misses required fields
+    """
+    if not isinstance(data, dict):
+        raise _Fallback
+    mapper = _MAPPERS.get(model)
+    if mapper is None:
+        mapper = _compile(model)
+    fields, required, private = mapper
+
+    values: dict[str, Any] = {}
+    fields_set = set()
+    for alias, name, convert, default in fields:
+        if alias in data:
+            value = data[alias]
+            if convert is not None and value is not None:
+                value = convert(value)
+            values[name] = value
+            fields_set.add(name)
+        elif default is _COPY:
+            values[name] = model.__fields__[name].get_default()
+        else:
+            values[name] = default
+
+    if not required <= fields_set:
+        raise _Fallback
+
+    instance = model.__new__(model)
+    object.__setattr__(instance, "__dict__", values)
+    object.__setattr__(instance, "__fields_set__", fields_set)
+    if private:
+        instance._init_private_attributes()  # pylint: disable=protected-access
+    return instance
+
+
+def _compile(model: type[BaseModel]) -> _Mapper:
+    """Precompute the field mapper of a model.
+
+    Args:
+        model: pydantic model
+
+    Returns:
+        field mapper
+    """
+    fields = []
+    for name, field in model.__fields__.items():
+        default = field.default
+        if field.default_factory is not None or not isinstance(
+            default, (type(None), bool, int, float, str, tuple, frozenset)
+        ):
+            default = _COPY
+        fields.append((field.alias, name, _converter(field), default))
+
+    required = frozenset(
+        name for name, field in model.__fields__.items() if field.required
+    )
+    mapper = (fields, required, bool(model.__private_attributes__))
+    _MAPPERS[model] = mapper
+    return mapper
+
+
+def _converter(field: ModelField) -> Converter | None:
+    """Return the conversion of a field value, None to keep it as is.
+
+    Args:
+        field: pydantic field
+
+    Returns:
+        converter
+    """
+    type_ = field.type_
+    if is_model(type_):
+        # Models with their own validate, e.g. interned locations, keep it.
+        if type_.validate.__func__ is not BaseModel.validate.__func__:  # type: ignore
+            build = type_.validate
+        else:
+            build = partial(_construct, type_)
+        if field.shape == SHAPE_SINGLETON:
+            return build
+        if field.shape == SHAPE_LIST:
+            return lambda value: [build(item) for item in value]
+        return _fallback
+    if field.shape != SHAPE_SINGLETON:
+        return None
+    if type_ is bool:
+        return _to_bool
+    if type_ in (int, float, str):
+        return lambda value: _coerce(type_, value)
+    return None
+
+
+def _coerce(type_: type, value: Any) -> Any:
+    """Coerce a scalar the way validation would for well-formed data.
+
+    Args:
+        type_: int, float or str
+        value: value
+
+    Returns:
+        coerced value
+
+    Raises:
+        _Fallback: value needs validation
+    """
+    if type(value) is type_:  # pylint: disable=unidiomatic-typecheck
+        return value
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise _Fallback
+    if type_ is int and isinstance(value, float) and not value.is_integer():
+        raise _Fallback
+    try:
+        return type_(value)
+    except ValueError as err:
+        raise _Fallback from err
+
+
+def _to_bool(value: Any) -> bool:
+    """Coerce a boolean.
+
+    Args:
+        value: value
+
+    Returns:
+        boolean
+
+    Raises:
+        _Fallback: value needs validation
+    """
+    if value is True or value is False:
+        return value
+    if value in (0, 1) and not isinstance(value, str):
+        return bool(value)
+    raise _Fallback
+
+
+def _fallback(value: Any) -> Any:
+    """Send values of unsupported field shapes through validation.
+
+    Args:
+        value: value
+
+    Raises:
+        _Fallback: always
+    """
+    raise _Fallback
+
+
+def is_model(type_: Any) -> bool:
+    """Check whether type_ is a pydantic model.
+
+    Args:
+        type_: type
+
+    Returns:
+        True for subclasses of BaseModel
+    """
+    return isinstance(type_, type) and issubclass(type_, BaseModel)
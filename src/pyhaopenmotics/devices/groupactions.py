@@ -1,9 +1,7 @@
 """Module containing the base of an output."""
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, List
-
-from pydantic import parse_obj_as
+from typing import TYPE_CHECKING, Any, AsyncIterator, List
 
 from pyhaopenmotics.models.groupaction import GroupAction
 
@@ -68,7 +66,31 @@ class OpenMoticsGroupActions:  # noqa: SIM119
         else:
             body = await self.baseclient.get(path)
 
-        return parse_obj_as(list[GroupAction], body["data"])
+        return self.baseclient.parse_body(list[GroupAction], body, path)
+
+    async def iter_all(
+        self,
+        installation_id: int,
+        groupactions_filter: str | None = None,
+    ) -> AsyncIterator[GroupAction]:
+        """Iterate over all groupactions while the response is parsed.
+
+        Unlike get_all, the groupactions are parsed and yielded one at a time,
+        so memory stays bounded for large collections.
+
+        Args:
+            installation_id: int
+            groupactions_filter: str
+
+        Yields:
+            GroupAction
+        """
+        path = f"/base/installations/{installation_id}/groupactions"
+        params = {"filter": groupactions_filter} if groupactions_filter else None
+        async for groupaction in self.baseclient.iter_data(
+            GroupAction, path, params=params
+        ):
+            yield groupaction
 
     async def get_by_id(
         self,
@@ -87,7 +109,7 @@ class OpenMoticsGroupActions:  # noqa: SIM119
         path = f"/base/installations/{installation_id}/groupactions/{groupaction_id}"
         body = await self.baseclient.get(path)
 
-        return GroupAction.parse_obj(body["data"])
+        return self.baseclient.parse_body(GroupAction, body, path)
 
     async def trigger(
         self,
@@ -2,9 +2,7 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, List
-
-from pydantic import parse_obj_as
+from typing import TYPE_CHECKING, AsyncIterator, List
 
 from pyhaopenmotics.models.installation import Installation
 
@@ -58,7 +56,29 @@ class OpenMoticsInstallations:  # noqa: SIM119
         else:
             body = await self.baseclient.get(path)
 
-        return parse_obj_as(list[Installation], body["data"])
+        return self.baseclient.parse_body(list[Installation], body, path)
+
+    async def iter_all(
+        self,
+        installation_filter: str | None = None,
+    ) -> AsyncIterator[Installation]:
+        """Iterate over all installations while the response is parsed.
+
+        Unlike get_all, the installations are parsed and yielded one at a time,
+        so memory stays bounded for large collections.
+
+        Args:
+            installation_filter: str
+
+        Yields:
+            Installation
+        """
+        path = "/base/installations"
+        params = {"filter": installation_filter} if installation_filter else None
+        async for installation in self.baseclient.iter_data(
+            Installation, path, params=params
+        ):
+            yield installation
 
     async def get_by_id(
         self,
@@ -76,4 +96,4 @@ class OpenMoticsInstallations:  # noqa: SIM119
         path = f"/base/installations/{installation_id}"
         body = await self.baseclient.get(path)
 
-        return Installation.parse_obj(body["data"])
+        return self.baseclient.parse_body(Installation, body, path)
@@ -2,9 +2,7 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
-
-from pydantic import parse_obj_as
+from typing import TYPE_CHECKING, Any, AsyncIterator
 
 from pyhaopenmotics.models.light import Light
 
@@ -51,7 +49,34 @@ class OpenMoticsLights:  # noqa: SIM119
         else:
             body = await self.baseclient.get(path)
 
-        return parse_obj_as(list[Light], body["data"])
+        lights = self.baseclient.parse_body(list[Light], body, path)
+        self.baseclient.state.ingest(
+            installation_id, "lights", lights, complete=not light_filter
+        )
+        return lights
+
+    async def iter_all(
+        self,
+        installation_id: int,
+        light_filter: str | None = None,
+    ) -> AsyncIterator[Light]:
+        """Iterate over all lights while the response is parsed.
+
+        Unlike get_all, the lights are parsed and yielded one at a time,
+        so memory stays bounded for large collections.
+
+        Args:
+            installation_id: int
+            light_filter: str
+
+        Yields:
+            Light
+        """
+        path = f"/base/installations/{installation_id}/lights"
+        params = {"filter": light_filter} if light_filter else None
+        async for light in self.baseclient.iter_data(Light, path, params=params):
+            self.baseclient.state.ingest(installation_id, "lights", [light])
+            yield light
 
     async def get_by_id(
         self,
@@ -70,7 +95,9 @@ class OpenMoticsLights:  # noqa: SIM119
         path = f"/base/installations/{installation_id}/lights/{light_id}"
         body = await self.baseclient.get(path)
 
-        return Light.parse_obj(body["data"])
+        light = self.baseclient.parse_body(Light, body, path)
+        self.baseclient.state.ingest(installation_id, "lights", [light])
+        return light
 
     async def toggle(
         self,
@@ -87,7 +114,8 @@ class OpenMoticsLights:  # noqa: SIM119
             Returns a light with id
         """
         path = f"/base/installations/{installation_id}/lights/{light_id}/toggle"
-        return await self.baseclient.post(path)
+        with self.baseclient.optimistic(installation_id, "lights", light_id, _toggled):
+            return await self.baseclient.post(path)
 
     async def turn_on(
         self,
@@ -111,7 +139,13 @@ class OpenMoticsLights:  # noqa: SIM119
 
         path = f"/base/installations/{installation_id}/lights/{light_id}/turn_on"
         payload = {"value": value}
-        return await self.baseclient.post(path, json=payload)
+        status: dict[str, Any] = {"on": True}
+        if value is not None:
+            status["value"] = value
+        with self.baseclient.optimistic(
+            installation_id, "lights", light_id, {"status": status}
+        ):
+            return await self.baseclient.post(path, json=payload)
 
     async def turn_off(
         self,
@@ -133,4 +167,19 @@ class OpenMoticsLights:  # noqa: SIM119
         else:
             # Turn off light with id
             path = f"/base/installations/{installation_id}/lights/{light_id}/turn_off"
-        return await self.baseclient.post(path)
+        with self.baseclient.optimistic(
+            installation_id, "lights", light_id, {"status": {"on": False}}
+        ):
+            return await self.baseclient.post(path)
+
+
+def _toggled(light: Light) -> dict[str, Any]:
+    """Return the expected status after toggling.
+
+    Args:
+        light: Light
+
+    Returns:
+        expected values
+    """
+    return {"status": {"on": not (light.status and light.status.on)}}
@@ -2,9 +2,7 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
-
-from pydantic import parse_obj_as
+from typing import TYPE_CHECKING, Any, AsyncIterator
 
 from pyhaopenmotics.models.output import Output
 
@@ -51,7 +49,34 @@ class OpenMoticsOutputs:  # noqa: SIM119
         else:
             body = await self.baseclient.get(path)
 
-        return parse_obj_as(list[Output], body["data"])
+        outputs = self.baseclient.parse_body(list[Output], body, path)
+        self.baseclient.state.ingest(
+            installation_id, "outputs", outputs, complete=not output_filter
+        )
+        return outputs
+
+    async def iter_all(
+        self,
+        installation_id: int,
+        output_filter: str | None = None,
+    ) -> AsyncIterator[Output]:
+        """Iterate over all outputs while the response is parsed.
+
+        Unlike get_all, the outputs are parsed and yielded one at a time,
+        so memory stays bounded for large collections.
+
+        Args:
+            installation_id: int
+            output_filter: str
+
+        Yields:
+            Output
+        """
+        path = f"/base/installations/{installation_id}/outputs"
+        params = {"filter": output_filter} if output_filter else None
+        async for output in self.baseclient.iter_data(Output, path, params=params):
+            self.baseclient.state.ingest(installation_id, "outputs", [output])
+            yield output
 
     async def get_by_id(
         self,
@@ -70,7 +95,9 @@ class OpenMoticsOutputs:  # noqa: SIM119
         path = f"/base/installations/{installation_id}/outputs/{output_id}"
         body = await self.baseclient.get(path)
 
-        return Output.parse_obj(body["data"])
+        output = self.baseclient.parse_body(Output, body, path)
+        self.baseclient.state.ingest(installation_id, "outputs", [output])
+        return output
 
     async def toggle(
         self,
@@ -87,7 +114,10 @@ class OpenMoticsOutputs:  # noqa: SIM119
             Returns a output with id
         """
         path = f"/base/installations/{installation_id}/outputs/{output_id}/toggle"
-        return await self.baseclient.post(path)
+        with self.baseclient.optimistic(
+            installation_id, "outputs", output_id, _toggled
+        ):
+            return await self.baseclient.post(path)
 
     async def turn_on(
         self,
@@ -111,7 +141,13 @@ class OpenMoticsOutputs:  # noqa: SIM119
 
         path = f"/base/installations/{installation_id}/outputs/{output_id}/turn_on"
         payload = {"value": value}
-        return await self.baseclient.post(path, json=payload)
+        status: dict[str, Any] = {"on": True}
+        if value is not None:
+            status["value"] = value
+        with self.baseclient.optimistic(
+            installation_id, "outputs", output_id, {"status": status}
+        ):
+            return await self.baseclient.post(path, json=payload)
 
     async def turn_off(
         self,
@@ -133,4 +169,19 @@ class OpenMoticsOutputs:  # noqa: SIM119
         else:
             # Turn off light with id
             path = f"/base/installations/{installation_id}/outputs/{output_id}/turn_off"
-        return await self.baseclient.post(path)
+        with self.baseclient.optimistic(
+            installation_id, "outputs", output_id, {"status": {"on": False}}
+        ):
+            return await self.baseclient.post(path)
+
+
+def _toggled(output: Output) -> dict[str, Any]:
+    """Return the expected status after toggling.
+
+    Args:
+        output: Output
+
+    Returns:
+        expected values
+    """
+    return {"status": {"on": not (output.status and output.status.on)}}
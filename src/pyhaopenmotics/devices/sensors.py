@@ -2,9 +2,7 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
-
-from pydantic import parse_obj_as
+from typing import TYPE_CHECKING, Any, AsyncIterator
 
 from pyhaopenmotics.models.sensor import Sensor
 
@@ -52,7 +50,34 @@ class OpenMoticsSensors:  # noqa: SIM119
             body = await self.baseclient.get(path)
 
         # return [sensor(**sensor) for sensor in body["data"]]  # type: ignore
-        return parse_obj_as(list[Sensor], body["data"])
+        sensors = self.baseclient.parse_body(list[Sensor], body, path)
+        self.baseclient.state.ingest(
+            installation_id, "sensors", sensors, complete=not sensor_filter
+        )
+        return sensors
+
+    async def iter_all(
+        self,
+        installation_id: int,
+        sensor_filter: str | None = None,
+    ) -> AsyncIterator[Sensor]:
+        """Iterate over all sensors while the response is parsed.
+
+        Unlike get_all, the sensors are parsed and yielded one at a time,
+        so memory stays bounded for large collections.
+
+        Args:
+            installation_id: int
+            sensor_filter: str
+
+        Yields:
+            Sensor
+        """
+        path = f"/base/installations/{installation_id}/sensors"
+        params = {"filter": sensor_filter} if sensor_filter else None
+        async for sensor in self.baseclient.iter_data(Sensor, path, params=params):
+            self.baseclient.state.ingest(installation_id, "sensors", [sensor])
+            yield sensor
 
     async def get_by_id(
         self,
@@ -72,4 +97,6 @@ class OpenMoticsSensors:  # noqa: SIM119
         body = await self.baseclient.get(path)
         # sensor = body["data"]
 
-        return Sensor.parse_obj(body["data"])
+        sensor = self.baseclient.parse_body(Sensor, body, path)
+        self.baseclient.state.ingest(installation_id, "sensors", [sensor])
+        return sensor
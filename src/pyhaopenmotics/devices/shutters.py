@@ -1,10 +1,7 @@
 """Module containing the base of an output."""
 from __future__ import annotations
 
-import json
-from typing import TYPE_CHECKING, Any, List
-
-from pydantic import parse_obj_as
+from typing import TYPE_CHECKING, Any, AsyncIterator, List
 
 from pyhaopenmotics.models.shutter import Shutter
 
@@ -55,7 +52,34 @@ class OpenMoticsShutters:  # noqa: SIM119
         else:
             body = await self.baseclient.get(path)
 
-        return parse_obj_as(list[Shutter], body["data"])
+        shutters = self.baseclient.parse_body(list[Shutter], body, path)
+        self.baseclient.state.ingest(
+            installation_id, "shutters", shutters, complete=not shutter_filter
+        )
+        return shutters
+
+    async def iter_all(
+        self,
+        installation_id: int,
+        shutter_filter: str | None = None,
+    ) -> AsyncIterator[Shutter]:
+        """Iterate over all shutters while the response is parsed.
+
+        Unlike get_all, the shutters are parsed and yielded one at a time,
+        so memory stays bounded for large collections.
+
+        Args:
+            installation_id: int
+            shutter_filter: str
+
+        Yields:
+            Shutter
+        """
+        path = f"/base/installations/{installation_id}/shutters"
+        params = {"filter": shutter_filter} if shutter_filter else None
+        async for shutter in self.baseclient.iter_data(Shutter, path, params=params):
+            self.baseclient.state.ingest(installation_id, "shutters", [shutter])
+            yield shutter
 
     async def get_by_id(  # type: ignore
         self,
@@ -74,7 +98,9 @@ class OpenMoticsShutters:  # noqa: SIM119
         path = f"/base/installations/{installation_id}/shutters/{shutter_id}"
         body = await self.baseclient.get(path)
 
-        return Shutter.parse_obj(body["data"])
+        shutter = self.baseclient.parse_body(Shutter, body, path)
+        self.baseclient.state.ingest(installation_id, "shutters", [shutter])
+        return shutter
 
     async def move_up(
         self,
@@ -152,12 +178,11 @@ class OpenMoticsShutters:  # noqa: SIM119
             f"/base/installations/{installation_id}"
             f"/shutters/{shutter_id}/change_position"
         )
-        payload = json.dumps(
-            {
-                "position": position,
-            }
-        )
-        return await self.baseclient.post(path, json=payload)
+        payload = {"position": position}
+        with self.baseclient.optimistic(
+            installation_id, "shutters", shutter_id, {"status": {"position": position}}
+        ):
+            return await self.baseclient.post(path, json=payload)
 
     async def change_relative_position(
         self,
@@ -184,11 +209,7 @@ class OpenMoticsShutters:  # noqa: SIM119
             f"/base/installations/{installation_id}"
             f"/shutters/{shutter_id}/change_relative_position"
         )
-        payload = json.dumps(
-            {
-                "offset": offset,
-            }
-        )
+        payload = {"offset": offset}
         return await self.baseclient.post(path, json=payload)
 
     async def lock(
@@ -213,7 +234,10 @@ class OpenMoticsShutters:  # noqa: SIM119
             Returns the lock_type as response.
         """
         path = f"/base/installations/{installation_id}/shutters/{shutter_id}/lock"
-        return await self.baseclient.post(path)
+        with self.baseclient.optimistic(
+            installation_id, "shutters", shutter_id, {"status": {"locked": True}}
+        ):
+            return await self.baseclient.post(path)
 
     async def unlock(
         self,
@@ -230,7 +254,10 @@ class OpenMoticsShutters:  # noqa: SIM119
             Returns a shutter with id
         """
         path = f"/base/installations/{installation_id}/shutters/{shutter_id}/unlock"
-        return await self.baseclient.post(path)
+        with self.baseclient.optimistic(
+            installation_id, "shutters", shutter_id, {"status": {"locked": False}}
+        ):
+            return await self.baseclient.post(path)
 
     async def preset(
         self,
@@ -253,11 +280,7 @@ class OpenMoticsShutters:  # noqa: SIM119
             Returns a shutter with id
         """
         path = f"/base/installations/{installation_id}/shutters/{shutter_id}/preset"
-        payload = json.dumps(
-            {
-                "position": position,
-            }
-        )
+        payload = {"position": position}
         return await self.baseclient.post(path, json=payload)
 
     async def move_to_preset(
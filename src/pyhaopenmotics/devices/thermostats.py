@@ -2,9 +2,7 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
-
-from pydantic import parse_obj_as
+from typing import TYPE_CHECKING, Any, AsyncIterator
 
 from pyhaopenmotics.models.thermostats import ThermostatGroup, ThermostatUnit
 
@@ -98,7 +96,31 @@ class OpenMoticsThermostatGroups:  # noqa: SIM119
 
         body = await self.baseclient.get(path)
 
-        return parse_obj_as(list[ThermostatGroup], body["data"])
+        groups = self.baseclient.parse_body(list[ThermostatGroup], body, path)
+        self.baseclient.state.ingest(
+            installation_id, "thermostat_groups", groups, complete=True
+        )
+        return groups
+
+    async def iter_all(
+        self,
+        installation_id: int,
+    ) -> AsyncIterator[ThermostatGroup]:
+        """Iterate over all thermostat groups while the response is parsed.
+
+        Unlike get_all, the thermostat groups are parsed and yielded one at a time,
+        so memory stays bounded for large collections.
+
+        Args:
+            installation_id: int
+
+        Yields:
+            ThermostatGroup
+        """
+        path = f"/base/installations/{installation_id}/thermostats/groups"
+        async for group in self.baseclient.iter_data(ThermostatGroup, path):
+            self.baseclient.state.ingest(installation_id, "thermostat_groups", [group])
+            yield group
 
     async def get_by_id(
         self,
@@ -117,7 +139,9 @@ class OpenMoticsThermostatGroups:  # noqa: SIM119
         path = f"/base/installations/{installation_id}/thermostats/groups/{thermostatgroup_id}"
         body = await self.baseclient.get(path)
 
-        return ThermostatGroup.parse_obj(body["data"])
+        group = self.baseclient.parse_body(ThermostatGroup, body, path)
+        self.baseclient.state.ingest(installation_id, "thermostat_groups", [group])
+        return group
 
     async def set_mode(
         self,
@@ -138,7 +162,13 @@ class OpenMoticsThermostatGroups:  # noqa: SIM119
 
         path = f"/base/installations/{installation_id}/thermostats/groups/{thermostatgroup_id}/mode"
         payload = {"mode": mode}
-        return await self.baseclient.post(path, json=payload)
+        with self.baseclient.optimistic(
+            installation_id,
+            "thermostat_groups",
+            thermostatgroup_id,
+            {"status": {"mode": mode}},
+        ):
+            return await self.baseclient.post(path, json=payload)
 
 
 class OpenMoticsThermostatUnits:  # noqa: SIM119
@@ -173,7 +203,31 @@ class OpenMoticsThermostatUnits:  # noqa: SIM119
 
         print(body["data"])
 
-        return parse_obj_as(list[ThermostatUnit], body["data"])
+        units = self.baseclient.parse_body(list[ThermostatUnit], body, path)
+        self.baseclient.state.ingest(
+            installation_id, "thermostat_units", units, complete=True
+        )
+        return units
+
+    async def iter_all(
+        self,
+        installation_id: int,
+    ) -> AsyncIterator[ThermostatUnit]:
+        """Iterate over all thermostat units while the response is parsed.
+
+        Unlike get_all, the thermostat units are parsed and yielded one at a time,
+        so memory stays bounded for large collections.
+
+        Args:
+            installation_id: int
+
+        Yields:
+            ThermostatUnit
+        """
+        path = f"/base/installations/{installation_id}/thermostats/units"
+        async for unit in self.baseclient.iter_data(ThermostatUnit, path):
+            self.baseclient.state.ingest(installation_id, "thermostat_units", [unit])
+            yield unit
 
     async def get_by_id(
         self,
@@ -192,7 +246,9 @@ class OpenMoticsThermostatUnits:  # noqa: SIM119
         path = f"/base/installations/{installation_id}/thermostats/units/{thermostatunit_id}"
         body = await self.baseclient.get(path)
 
-        return ThermostatUnit.parse_obj(body["data"])
+        unit = self.baseclient.parse_body(ThermostatUnit, body, path)
+        self.baseclient.state.ingest(installation_id, "thermostat_units", [unit])
+        return unit
 
     async def set_state(
         self,
@@ -234,7 +290,13 @@ class OpenMoticsThermostatUnits:  # noqa: SIM119
 
         path = f"/base/installations/{installation_id}/thermostats/units/{thermostatunit_id}/setpoint"
         payload = {"temperature": temperature}
-        return await self.baseclient.post(path, json=payload)
+        with self.baseclient.optimistic(
+            installation_id,
+            "thermostat_units",
+            thermostatunit_id,
+            {"status": {"current_setpoint": temperature}},
+        ):
+            return await self.baseclient.post(path, json=payload)
 
     async def set_preset(
         self,
@@ -255,7 +317,13 @@ class OpenMoticsThermostatUnits:  # noqa: SIM119
 
         path = f"/base/installations/{installation_id}/thermostats/units/{thermostatunit_id}/preset"
         payload = {"preset": preset}
-        return await self.baseclient.post(path, json=payload)
+        with self.baseclient.optimistic(
+            installation_id,
+            "thermostat_units",
+            thermostatunit_id,
+            {"status": {"preset": preset}},
+        ):
+            return await self.baseclient.post(path, json=payload)
 
     async def set_preset_config(
         self,
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import time
 from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
 from re import sub
 from typing import Generator  # , Union
 
@@ -121,6 +123,31 @@ class RequestBackoffException(NonRetryableException):
     response.
     """
 
+    def __init__(
+        self,
+        message: str,
+        request: Request | None = None,
+        response: Response | None = None,
+    ) -> None:
+        """Init Function.
+
+        Args:
+            message: str
+            request: Request
+            response: Response
+        """
+        self.retry_after = _parse_retry_after(response)
+
+        super().__init__(message, request, response)
+
+
+class CircuitOpenException(NonRetryableException):
+    """Exception.
+
+    Exception which is thrown when the circuit breaker is open and the
+    request isn't sent.
+    """
+
 
 class RequestClientException(NonRetryableException):
     """Exception which is thrown when server returns any 4xx response."""
@@ -216,6 +243,31 @@ def client_error_handler() -> Generator[None]:  # type: ignore
         ) from err
 
 
+def _parse_retry_after(response: Response | None) -> float | None:
+    """Parse the Retry-After header.
+
+    Args:
+        response: Response object
+
+    Returns:
+        seconds to wait or None when the header is missing or invalid
+    """
+    if response is None:
+        return None
+
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
 # def _sanitize_request(request: Request) -> Union[dict, None]:
 def _sanitize_request(request: Request) -> dict:
     """Sanitize request.
@@ -0,0 +1,274 @@
+"""Module containing the websocket event stream of the OpenMotics API."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from typing import TYPE_CHECKING, Iterable
+
+from pydantic import BaseModel
+
+from .const import (
+    DEFAULT_EVENTS_RECONNECT_MAX,
+    DEFAULT_EVENTS_RECONNECT_MIN,
+    EVENTS_PATH,
+)
+from .models.light import Light
+from .models.output import Output
+from .models.sensor import Sensor
+from .models.shutter import Shutter
+from .models.thermostats import ThermostatGroup, ThermostatUnit
+from .snapshot import COLLECTIONS
+from .state import IngestSource, StateChange, merge_model
+
+try:
+    import websockets
+except ImportError:  # pragma: no cover
+    websockets = None  # type: ignore
+
+if TYPE_CHECKING:
+    from .base import BaseClient  # pylint: disable=R0401
+
+logger = logging.getLogger(__name__)
+
+# Collections of the state store updated by an event type. Lights are
+# outputs, so output events update both.
+EVENT_KINDS = {
+    "OUTPUT_CHANGE": ("outputs", "lights"),
+    "SENSOR_CHANGE": ("sensors",),
+    "SHUTTER_CHANGE": ("shutters",),
+    "THERMOSTAT_GROUP_CHANGE": ("thermostat_groups",),
+    "THERMOSTAT_UNIT_CHANGE": ("thermostat_units",),
+}
+
+MODELS: dict[str, type[BaseModel]] = {
+    "outputs": Output,
+    "lights": Light,
+    "sensors": Sensor,
+    "shutters": Shutter,
+    "thermostat_groups": ThermostatGroup,
+    "thermostat_units": ThermostatUnit,
+}
+
+
+class EventStream:
+    """Stream of device change events over a single websocket.
+
+    Events are merged into the models of the state store of the client, so
+    listeners subscribed to client.state receive the same StateChange
+    objects as for polls. The stream reconnects with exponential backoff
+    and refreshes the subscribed collections after a reconnect to catch up
+    on missed events.
+
+    Messages are expected as
+    {"type": "EVENT", "data": {"type": "OUTPUT_CHANGE",
+    "installation_id": 1, "data": {"id": 5, "status": {"on": true}}}}.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(
+        self,
+        baseclient: BaseClient,
+        installation_ids: Iterable[int],
+        event_types: Iterable[str] | None = None,
+        url: str | None = None,
+        reconnect_min: float = DEFAULT_EVENTS_RECONNECT_MIN,
+        reconnect_max: float = DEFAULT_EVENTS_RECONNECT_MAX,
+        resync: bool = True,
+    ) -> None:
+        """Init the EventStream object.
+
+        Args:
+            baseclient: BaseClient
+            installation_ids: installations to subscribe to
+            event_types: event types, defaults to all of EVENT_KINDS
+            url: websocket url, defaults to the events url of the client
+            reconnect_min: first delay before reconnecting
+            reconnect_max: maximum delay before reconnecting
+            resync: refresh the subscribed collections after a reconnect
+
+        Raises:
+            ImportError: the websockets package is not installed
+            ValueError: unknown event type
+        """
+        if websockets is None:
+            raise ImportError(
+                "The websockets package is required for the event stream, "
+                "install pyhaopenmotics[websockets]"
+            )
+        self.baseclient = baseclient
+        self.installation_ids = list(installation_ids)
+        self.event_types = list(EVENT_KINDS if event_types is None else event_types)
+        unknown = set(self.event_types) - set(EVENT_KINDS)
+        if unknown:
+            raise ValueError(f"Unknown event types: {', '.join(sorted(unknown))}")
+
+        if url is None:
+            url = baseclient._get_url(EVENTS_PATH)  # pylint: disable=W0212
+            url = url.replace("http", "ws", 1)
+        self.url = url
+        self.reconnect_min = reconnect_min
+        self.reconnect_max = reconnect_max
+        self.resync = resync
+
+        self._task: asyncio.Task | None = None
+        # Created once the stream runs, so it belongs to the running loop.
+        self._connected: asyncio.Event | None = None
+
+    @property
+    def connected(self) -> bool:
+        """Return whether the websocket is connected.
+
+        Returns:
+            True when connected
+        """
+        return self._connected is not None and self._connected.is_set()
+
+    async def wait_connected(self) -> None:
+        """Wait until the websocket is connected."""
+        await self._connected_event().wait()
+
+    def start(self) -> None:
+        """Start streaming events in the background."""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self.run())
+
+    async def stop(self) -> None:
+        """Stop streaming events."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def run(self) -> None:
+        """Stream events and reconnect until cancelled.
+
+        Raises:
+            asyncio.CancelledError: the stream was stopped
+        """
+        connected = self._connected_event()
+        delay = self.reconnect_min
+        reconnect = False
+        while True:
+            try:
+                await self._connect(reconnect)
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:  # pylint: disable=broad-except
+                logger.warning("Event stream disconnected: %s", err)
+            finally:
+                if connected.is_set():
+                    delay = self.reconnect_min
+                connected.clear()
+
+            reconnect = True
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))  # noqa: S311
+            delay = min(delay * 2, self.reconnect_max)
+
+    def _connected_event(self) -> asyncio.Event:
+        """Return the event set while connected, creating it on first use.
+
+        Returns:
+            asyncio.Event
+        """
+        if self._connected is None:
+            self._connected = asyncio.Event()
+        return self._connected
+
+    async def _connect(self, reconnect: bool) -> None:
+        """Connect, subscribe and handle messages until disconnected.
+
+        Args:
+            reconnect: whether this is a reconnect
+        """
+        await self.baseclient._ensure_token()  # pylint: disable=W0212
+        headers = {}
+        if self.baseclient.token is not None:
+            headers["Authorization"] = f"Bearer {self.baseclient.token['access_token']}"
+
+        async with websockets.connect(self.url, additional_headers=headers) as ws:
+            subscription = {
+                "type": "ACTION",
+                "data": {
+                    "action": "set_subscription",
+                    "types": self.event_types,
+                    "installation_ids": self.installation_ids,
+                },
+            }
+            await ws.send(self.baseclient.codec.dumps(subscription).decode())
+            self._connected_event().set()
+            logger.debug("Event stream connected to %s", self.url)
+            if reconnect and self.resync:
+                await self._resync()
+
+            async for message in ws:
+                self.handle(message)
+
+    async def _resync(self) -> None:
+        """Refresh the subscribed collections after missing events."""
+        kinds = {
+            kind for event_type in self.event_types for kind in EVENT_KINDS[event_type]
+        }
+        results = await asyncio.gather(
+            *(
+                COLLECTIONS[kind](self.baseclient, installation_id)
+                for installation_id in self.installation_ids
+                for kind in kinds
+            ),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning("Event stream resync failed: %s", result)
+
+    def handle(self, message: str | bytes) -> list[StateChange]:
+        """Merge an event into the state store.
+
+        Args:
+            message: raw websocket message
+
+        Returns:
+            state changes
+        """
+        if isinstance(message, str):
+            message = message.encode()
+        try:
+            event = self.baseclient.codec.loads(message)
+        except ValueError:
+            logger.debug("Ignoring invalid event message: %r", message)
+            return []
+
+        if isinstance(event, dict) and event.get("type") == "EVENT":
+            event = event.get("data")
+        if not isinstance(event, dict):
+            logger.debug("Ignoring unexpected event message: %r", message)
+            return []
+
+        event_type = event.get("type")
+        kinds = EVENT_KINDS.get(event_type) if isinstance(event_type, str) else None
+        data = event.get("data")
+        if (
+            kinds is None
+            or not isinstance(data, dict)
+            or not isinstance(data.get("id"), int)
+        ):
+            return []
+
+        installation_id = event.get("installation_id")
+        if installation_id is None and len(self.installation_ids) == 1:
+            installation_id = self.installation_ids[0]
+        if not isinstance(installation_id, int):
+            return []
+
+        changes = []
+        state = self.baseclient.state
+        for kind in kinds:
+            old = state.get(installation_id, kind, data["id"])
+            if old is None and kind != kinds[0]:
+                continue
+            model = merge_model(MODELS[kind], old, data)
+            if model is not None:
+                changes.extend(
+                    state.ingest(installation_id, kind, [model], IngestSource.EVENT)
+                )
+        return changes
@@ -0,0 +1,140 @@
+"""Module containing fleet-wide refreshes across all installations."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from .const import DEFAULT_FLEET_CONCURRENCY, DEFAULT_SNAPSHOT_CONCURRENCY
+from .models.installation import Installation
+from .policy import deadline, effective_deadline, wait_until
+from .snapshot import InstallationSnapshot, take_snapshot
+
+if TYPE_CHECKING:
+    from .base import BaseClient  # pylint: disable=R0401
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class FleetSnapshot:
+    """Object holding the snapshots of all installations of an account.
+
+    Installations that failed to refresh are listed in errors instead of
+    failing the whole refresh.
+    """
+
+    installations: tuple[Installation, ...] = ()
+    snapshots: dict[int, InstallationSnapshot] = field(default_factory=dict)
+    errors: dict[int, BaseException] = field(default_factory=dict)
+    taken_at: float = 0.0
+
+    @property
+    def complete(self) -> bool:
+        """Return whether every installation was refreshed.
+
+        Returns:
+            True when there are no errors
+        """
+        return not self.errors
+
+
+class OpenMoticsFleet:  # noqa: SIM119
+    """Object holding information of all OpenMotics installations.
+
+    Fetches the device collections of every installation concurrently.
+    """
+
+    def __init__(self, baseclient: BaseClient) -> None:
+        """Init the fleet object.
+
+        Args:
+            baseclient: BaseClient
+        """
+        self.baseclient = baseclient
+
+    async def get_all(  # noqa: A003
+        self,
+        installation_filter: str | None = None,
+        max_concurrency: int = DEFAULT_FLEET_CONCURRENCY,
+        installation_timeout: float | None = None,
+        snapshot_concurrency: int = DEFAULT_SNAPSHOT_CONCURRENCY,
+    ) -> FleetSnapshot:
+        """Snapshot all installations.
+
+        Args:
+            installation_filter: filter passed to installations.get_all
+            max_concurrency: maximum number of installations refreshed at once
+            installation_timeout: time budget of one installation in seconds
+            snapshot_concurrency: maximum requests in flight per installation
+
+        Returns:
+            FleetSnapshot with the snapshots and the errors per installation
+        """
+        installations = await self.baseclient.installations.get_all(installation_filter)
+        return await self.get_by_installations(
+            installations,
+            max_concurrency=max_concurrency,
+            installation_timeout=installation_timeout,
+            snapshot_concurrency=snapshot_concurrency,
+        )
+
+    async def get_by_installations(
+        self,
+        installations: list[Installation],
+        max_concurrency: int = DEFAULT_FLEET_CONCURRENCY,
+        installation_timeout: float | None = None,
+        snapshot_concurrency: int = DEFAULT_SNAPSHOT_CONCURRENCY,
+    ) -> FleetSnapshot:
+        """Snapshot the given installations.
+
+        Args:
+            installations: installations to refresh
+            max_concurrency: maximum number of installations refreshed at once
+            installation_timeout: time budget of one installation in seconds
+            snapshot_concurrency: maximum requests in flight per installation
+
+        Returns:
+            FleetSnapshot with the snapshots and the errors per installation
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def refresh(installation: Installation) -> InstallationSnapshot:
+            async with semaphore:
+                with ExitStack() as stack:
+                    # The time budget starts once the installation is picked up.
+                    if installation_timeout is not None:
+                        stack.enter_context(deadline(installation_timeout))
+                    return await wait_until(
+                        take_snapshot(
+                            self.baseclient,
+                            installation.idx,
+                            max_concurrency=snapshot_concurrency,
+                            installation=installation,
+                        ),
+                        effective_deadline(),
+                    )
+
+        results = await asyncio.gather(
+            *(refresh(installation) for installation in installations),
+            return_exceptions=True,
+        )
+
+        snapshots: dict[int, InstallationSnapshot] = {}
+        errors: dict[int, BaseException] = {}
+        for installation, result in zip(installations, results):
+            if isinstance(result, BaseException):
+                logger.debug("Refreshing %s failed: %s", installation, result)
+                errors[installation.idx] = result
+            else:
+                snapshots[installation.idx] = result
+
+        return FleetSnapshot(
+            installations=tuple(installations),
+            snapshots=snapshots,
+            errors=errors,
+            taken_at=time.time(),
+        )
@@ -1,12 +1,16 @@
 """Init file for the models."""
 from pyhaopenmotics.models.groupaction import GroupAction
 from pyhaopenmotics.models.installation import Installation
+from pyhaopenmotics.models.location import LOCATIONS, FloorCoordinates, Location
 from pyhaopenmotics.models.output import Output
 from pyhaopenmotics.models.shutter import Shutter
 
 __all__ = [
     "Installation",
     "GroupAction",
+    "FloorCoordinates",
+    "Location",
+    "LOCATIONS",
     "Output",
     "Shutter",
 ]
@@ -0,0 +1,336 @@
+"""Compact representation of the device models for large fleets.
+
+The compact classes are named tuples: slotted, immutable and hashable.
+Nested values that repeat across devices and rarely change, such as
+locations, floor coordinates and capabilities, are interned so equal values
+share one instance, and strings (names, types, capabilities) are interned
+with sys.intern. Statuses change with every poll and are not interned.
+"""
+from __future__ import annotations
+
+import sys
+from collections import OrderedDict
+from typing import Any, Iterable, NamedTuple, Optional, Tuple
+
+from pydantic import BaseModel
+
+from pyhaopenmotics.const import DEFAULT_INTERNER_MAX_ENTRIES
+from pyhaopenmotics.construct import construct_model, is_model
+from pyhaopenmotics.models import light, location, output, sensor, shutter
+
+
+class CompactFloorCoordinates(NamedTuple):
+    """Compact floor coordinates."""
+
+    x: Optional[int] = None
+    y: Optional[int] = None
+
+
+class CompactLocation(NamedTuple):
+    """Compact location, with the fields of all device locations."""
+
+    floor_coordinates: Optional[CompactFloorCoordinates] = None
+    installation_id: Optional[int] = None
+    gateway_id: Optional[int] = None
+    floor_id: Optional[int] = None
+    room_id: Optional[int] = None
+
+
+class CompactOutputStatus(NamedTuple):
+    """Compact status of an output or a light."""
+
+    on: bool = False
+    locked: Optional[bool] = None
+    manual_override: Optional[bool] = None
+    value: Optional[int] = None
+
+
+class CompactSensorStatus(NamedTuple):
+    """Compact status of a sensor."""
+
+    humidity: Optional[float] = None
+    temperature: Optional[float] = None
+    brightness: Optional[int] = None
+
+
+class CompactShutterStatus(NamedTuple):
+    """Compact status of a shutter."""
+
+    locked: Optional[bool] = None
+    manual_override: Optional[bool] = None
+    state: Optional[str] = None
+    position: Optional[int] = None
+    last_change: Optional[float] = None
+    preset_position: Optional[int] = None
+
+
+class CompactShutterAttributes(NamedTuple):
+    """Compact attributes of a shutter."""
+
+    azimuth: Optional[str] = None
+    compass_point: Optional[str] = None
+    surface_area: Optional[str] = None
+
+
+class CompactShutterConfiguration(NamedTuple):
+    """Compact configuration of a shutter."""
+
+    group_1: Optional[int] = None
+    group_2: Optional[int] = None
+    name: Optional[str] = None
+    steps: Optional[int] = None
+    timer_down: Optional[int] = None
+    timer_up: Optional[int] = None
+    up_down_config: Optional[str] = None
+
+
+class CompactOutput(NamedTuple):
+    """Compact Output."""
+
+    idx: int
+    local_id: int
+    name: Optional[str] = None
+    output_type: Optional[str] = None
+    location: Optional[CompactLocation] = None
+    capabilities: Optional[Tuple[str, ...]] = None
+    metadata: Optional[dict] = None
+    status: Optional[CompactOutputStatus] = None
+    last_state_change: Optional[float] = None
+    version: Optional[str] = None
+
+
+class CompactLight(NamedTuple):
+    """Compact Light."""
+
+    idx: int
+    local_id: int
+    name: Optional[str] = None
+    capabilities: Optional[Tuple[str, ...]] = None
+    location: Optional[CompactLocation] = None
+    status: Optional[CompactOutputStatus] = None
+    version: Optional[str] = None
+
+
+class CompactSensor(NamedTuple):
+    """Compact Sensor."""
+
+    idx: int
+    local_id: int
+    name: Optional[str] = None
+    location: Optional[CompactLocation] = None
+    physical_quantity: Optional[str] = None
+    status: Optional[CompactSensorStatus] = None
+    last_state_change: Optional[float] = None
+    version: Optional[str] = None
+
+
+class CompactShutter(NamedTuple):
+    """Compact Shutter."""
+
+    idx: int
+    local_id: int
+    name: Optional[str] = None
+    shutter_type: Optional[str] = None
+    capabilities: Optional[Tuple[str, ...]] = None
+    status: Optional[CompactShutterStatus] = None
+    location: Optional[CompactLocation] = None
+    attributes: Optional[CompactShutterAttributes] = None
+    configuration: Optional[CompactShutterConfiguration] = None
+    metadata: Optional[str] = None
+    version: Optional[str] = None
+
+
+# Values are named tuple classes, which have no common type besides Any.
+COMPACT_TYPES: dict[type[BaseModel], Any] = {
+    location.Location: CompactLocation,
+    location.FloorCoordinates: CompactFloorCoordinates,
+    output.Output: CompactOutput,
+    output.Status: CompactOutputStatus,
+    light.Light: CompactLight,
+    light.Status: CompactOutputStatus,
+    sensor.Sensor: CompactSensor,
+    sensor.Status: CompactSensorStatus,
+    shutter.Shutter: CompactShutter,
+    shutter.Status: CompactShutterStatus,
+    shutter.Attributes: CompactShutterAttributes,
+    shutter.Configuration: CompactShutterConfiguration,
+}
+
+MODEL_TYPES: dict[type, type[BaseModel]] = {
+    CompactOutput: output.Output,
+    CompactLight: light.Light,
+    CompactSensor: sensor.Sensor,
+    CompactShutter: shutter.Shutter,
+}
+
+
+# Nested values interned by default, tuples are capabilities.
+STABLE_TYPES = frozenset(
+    {
+        CompactFloorCoordinates,
+        CompactLocation,
+        CompactShutterAttributes,
+        CompactShutterConfiguration,
+        tuple,
+    }
+)
+
+
+class Interner:
+    """Share one instance of equal nested values.
+
+    Only values of the given types are interned, and the least recently
+    used values are forgotten beyond max_entries.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_INTERNER_MAX_ENTRIES,
+        types: Iterable[type] = STABLE_TYPES,
+    ) -> None:
+        """Init the Interner object.
+
+        Args:
+            max_entries: maximum number of interned values
+            types: types of the interned values, e.g. STABLE_TYPES |
+                {CompactOutputStatus} to share statuses as well
+        """
+        self.max_entries = max_entries
+        self.types = frozenset(types)
+        self._values: OrderedDict[Any, Any] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of interned values.
+
+        Returns:
+            number of values
+        """
+        return len(self._values)
+
+    def __call__(self, value: Any) -> Any:
+        """Return the shared instance equal to value.
+
+        Args:
+            value: hashable value
+
+        Returns:
+            shared instance, or value itself when it is not interned or
+            not hashable
+        """
+        if type(value) not in self.types:
+            return value
+        try:
+            shared = self._values.get(value)
+        except TypeError:
+            return value
+        if shared is not None:
+            self._values.move_to_end(value)
+            return shared
+
+        self._values[value] = value
+        while len(self._values) > self.max_entries:
+            self._values.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """Forget all interned values."""
+        self._values.clear()
+
+
+DEFAULT_INTERNER = Interner()
+
+
+def to_compact(model: BaseModel, interner: Interner | None = None) -> Any:
+    """Convert an Output, Light, Sensor or Shutter to its compact form.
+
+    Args:
+        model: pydantic model
+        interner: shared instances, defaults to a module wide interner
+
+    Returns:
+        compact named tuple
+
+    Raises:
+        TypeError: model has no compact form
+    """
+    if interner is None:
+        interner = DEFAULT_INTERNER
+    compact_type = COMPACT_TYPES.get(type(model))
+    if compact_type is None:
+        raise TypeError(f"No compact form of {type(model).__name__}")
+    return compact_type(
+        *(
+            _compact_value(getattr(model, name, None), interner)
+            for name in compact_type._fields
+        )
+    )
+
+
+def from_compact(compact: Any) -> BaseModel:
+    """Convert a compact named tuple back to its pydantic model.
+
+    Args:
+        compact: compact named tuple
+
+    Returns:
+        pydantic model
+
+    Raises:
+        TypeError: compact is not a compact device
+    """
+    model_type = MODEL_TYPES.get(type(compact))
+    if model_type is None:
+        raise TypeError(f"No model of {type(compact).__name__}")
+    return construct_model(model_type, _model_data(model_type, compact))
+
+
+def _compact_value(value: Any, interner: Interner) -> Any:
+    """Convert a field value to its compact, interned form.
+
+    Args:
+        value: field value
+        interner: shared instances
+
+    Returns:
+        compact value
+    """
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, BaseModel):
+        compact_type = COMPACT_TYPES.get(type(value))
+        if compact_type is None:
+            return value
+        return interner(
+            compact_type(
+                *(
+                    _compact_value(getattr(value, name, None), interner)
+                    for name in compact_type._fields
+                )
+            )
+        )
+    if isinstance(value, list):
+        return interner(tuple(_compact_value(item, interner) for item in value))
+    return value
+
+
+def _model_data(model_type: type[BaseModel], compact: Any) -> dict[str, Any]:
+    """Return the json of a model from its compact form.
+
+    Args:
+        model_type: pydantic model
+        compact: compact named tuple
+
+    Returns:
+        decoded json keyed by alias
+    """
+    data = {}
+    for name, field in model_type.__fields__.items():
+        value = getattr(compact, name, None)
+        if value is None:
+            continue
+        if is_model(field.type_) and isinstance(value, tuple):
+            value = _model_data(field.type_, value)
+        elif isinstance(value, tuple):
+            value = list(value)
+        data[field.alias] = value
+    return data
@@ -0,0 +1,168 @@
+"""Location Model for the OpenMotics API.
+
+Locations are shared by all device models. They are immutable, and equal
+locations are interned while parsing, so all devices in the same room of
+an installation hold one Location object. The interning cache doubles as
+a registry of the floors and rooms of each installation.
+"""
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+DEFAULT_LOCATION_CACHE_MAX_ENTRIES = 8192
+
+
+class FloorCoordinates(BaseModel):
+    """Class holding the floor_coordinates."""
+
+    x: Optional[int] = None
+    y: Optional[int] = None
+
+    class Config:
+        """Config of the floor coordinates."""
+
+        frozen = True
+
+
+class Location(BaseModel):
+    """Class holding the location."""
+
+    floor_coordinates: Optional[FloorCoordinates] = None
+    installation_id: Optional[int] = None
+    gateway_id: Optional[int] = None
+    floor_id: Optional[int] = None
+    room_id: Optional[int] = None
+
+    class Config:
+        """Config of the location."""
+
+        frozen = True
+
+    @classmethod
+    def validate(cls, value: Any) -> Any:
+        """Validate a location, returning the interned instance.
+
+        Args:
+            value: decoded json or location
+
+        Returns:
+            shared location
+        """
+        if isinstance(value, dict):
+            return LOCATIONS.intern(cls, value)
+        return super().validate(value)
+
+
+class LocationCache:
+    """Interning cache of locations and registry of floors and rooms.
+
+    When the cache is full it is cleared; locations already held by models
+    stay valid, they are only no longer shared with new ones.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_LOCATION_CACHE_MAX_ENTRIES) -> None:
+        """Init the LocationCache object.
+
+        Args:
+            max_entries: maximum number of interned locations
+        """
+        self.max_entries = max_entries
+        self._locations: dict[Any, Location] = {}
+        self._rooms: dict[int | None, dict[int | None, set[int]]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of interned locations.
+
+        Returns:
+            number of locations
+        """
+        return len(self._locations)
+
+    def intern(self, cls: type[Location], data: dict[str, Any]) -> Location:
+        """Return the shared location equal to data, validating new ones.
+
+        Args:
+            cls: Location or a subclass
+            data: decoded json of a location
+
+        Returns:
+            shared location
+        """
+        try:
+            key = (cls, _freeze(data))
+        except TypeError:
+            return super(Location, cls).validate(data)  # type: ignore
+
+        location = self._locations.get(key)
+        if location is None:
+            location = super(Location, cls).validate(data)  # type: ignore
+            if len(self._locations) >= self.max_entries:
+                self._locations.clear()
+            self._locations[key] = location
+            self._register(location)
+        return location
+
+    def floors(self, installation_id: int) -> list[int]:
+        """Return the floors of an installation.
+
+        Args:
+            installation_id: int
+
+        Returns:
+            floor ids
+        """
+        floors = self._rooms.get(installation_id, {})
+        return sorted(floor_id for floor_id in floors if floor_id is not None)
+
+    def rooms(self, installation_id: int, floor_id: int | None = None) -> list[int]:
+        """Return the rooms of an installation, optionally of one floor.
+
+        Args:
+            installation_id: int
+            floor_id: only return the rooms on this floor
+
+        Returns:
+            room ids
+        """
+        floors = self._rooms.get(installation_id, {})
+        if floor_id is not None:
+            return sorted(floors.get(floor_id, ()))
+        return sorted({room_id for rooms in floors.values() for room_id in rooms})
+
+    def clear(self) -> None:
+        """Forget all locations, floors and rooms."""
+        self._locations.clear()
+        self._rooms.clear()
+
+    def _register(self, location: Location) -> None:
+        """Add the floor and room of a location to the registry.
+
+        Args:
+            location: Location
+        """
+        floors = self._rooms.setdefault(location.installation_id, {})
+        rooms = floors.setdefault(location.floor_id, set())
+        if location.room_id is not None:
+            rooms.add(location.room_id)
+
+
+def _freeze(value: Any) -> Any:
+    """Return a hashable key of decoded json.
+
+    Args:
+        value: decoded json
+
+    Returns:
+        hashable key
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    hash(value)
+    return value
+
+
+LOCATIONS = LocationCache()
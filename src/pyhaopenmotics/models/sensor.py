@@ -5,21 +5,7 @@ from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
-
-class FloorCoordinates(BaseModel):
-    """Class holding the floor_coordinates."""
-
-    x: Optional[int] = None
-    y: Optional[int] = None
-
-
-class Location(BaseModel):
-    """Class holding the location."""
-
-    floor_coordinates: Optional[FloorCoordinates] = None
-    floor_id: Optional[int] = None
-    installation_id: Optional[int] = None
-    room_id: Optional[int] = None
+from pyhaopenmotics.models.location import FloorCoordinates, Location  # noqa: F401
 
 
 class Status(BaseModel):
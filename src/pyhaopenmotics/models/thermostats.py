@@ -7,29 +7,16 @@ from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
+from pyhaopenmotics.models.location import FloorCoordinates, Location  # noqa: F401
 
-class FloorCoordinates(BaseModel):
-    """Class holding the floor_coordinates."""
+# Thermostat groups use the shared location.
+GroupLocation = Location
 
-    x: Optional[int] = None
-    y: Optional[int] = None
 
-
-class GroupLocation(BaseModel):
-    """Class holding the location."""
-
-    floor_coordinates: Optional[FloorCoordinates] = None
-    floor_id: Optional[int] = None
-    installation_id: Optional[int] = None
-    room_id: Optional[int] = None
-
-
-class UnitLocation(BaseModel):
-    """Class holding the location."""
+class UnitLocation(Location):
+    """Class holding the location of a thermostat unit."""
 
     thermostat_group_id: Optional[int] = None
-    installation_id: Optional[int] = None
-    room_id: Optional[int] = None
 
 
 class GroupStatus(BaseModel):
@@ -31,6 +31,7 @@ class CloudClient(BaseClient):
         self.client_id = client_id
         self.client_secret = client_secret
         self.scope = "control view"
+        self.token_store_key = f"{self.token_url}#{self.client_id}"
 
         self._client = BackendApplicationClient(client_id=self.client_id)
         self._session = AsyncOAuth2Client(  # noqa: S106
@@ -41,28 +42,21 @@ class CloudClient(BaseClient):
             token_endpoint=self.token_url,
             grant_type="client_credentials",
             update_token=self.token_saver,
+            **self._get_session_kwargs(),
         )
 
-        self.token = None
+    async def _fetch_token(self):
+        """Fetch a new token.
 
-    async def token_saver(self, token, **kwargs):
-        """Save the token to self.token.
-
-        Args:
-            token: str
-            **kwargs: any
-        """
-        self.token = token
-
-    async def get_token(self):
-        """Get a new token.
+        Returns:
+            token
 
         Raises:
             RequestUnauthorizedException: blabla
             ApiException: blabla
         """
         try:
-            self.token = await self._session.fetch_token(
+            return await self._session.fetch_token(
                 url=self.token_url,
                 grant_type="client_credentials",
             )
@@ -78,8 +72,6 @@ class CloudClient(BaseClient):
                 None,
             ) from exc
 
-        return
-
 
 class LocalGatewayClient(BaseClient):
     """Doc String."""
@@ -101,6 +93,7 @@ class LocalGatewayClient(BaseClient):
         self.username = username
         self.password = password
         self.scope = "control view"
+        self.token_store_key = f"{self.token_url}#{self.username}"
         self._client = LegacyApplicationClient(client_id="Legacy")
 
         self._session = AsyncOAuth2Client(  # noqa: S106
@@ -111,19 +104,21 @@ class LocalGatewayClient(BaseClient):
             token_endpoint=self.token_url,
             grant_type="client_credentials",
             update_token=self.token_saver,
+            **self._get_session_kwargs(),
         )
 
-        self.token = None
+    async def _fetch_token(self):
+        """Fetch a new token.
 
-    async def get_token(self):
-        """Get a new token.
+        Returns:
+            token
 
         Raises:
             RequestUnauthorizedException: blabla
             ApiException: blabla
         """
         try:
-            self.token = await self._session.fetch_token(
+            return await self._session.fetch_token(
                 url=self.token_url,
                 username=self.username,
                 password=self.password,
@@ -139,14 +134,3 @@ class LocalGatewayClient(BaseClient):
                 None,
                 None,
             ) from exc
-
-        return
-
-    async def token_saver(self, token, **kwargs):
-        """Save the token to self.token.
-
-        Args:
-            token: str
-            **kwargs: any
-        """
-        self.token = token
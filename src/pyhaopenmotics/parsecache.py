@@ -0,0 +1,123 @@
+"""Module containing a cache of validated models per device."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, List, get_args, get_origin
+
+from pydantic import BaseModel, parse_obj_as
+
+from .const import DEFAULT_PARSE_CACHE_MAX_ENTRIES
+from .construct import construct_model, construct_obj_as, is_model
+
+
+class ParseCache:
+    """Reuse validated models for objects that did not change.
+
+    Models are cached per scope, model type and id, together with the raw
+    dict they were validated from. The scope keeps devices of different
+    installations with the same id apart. When a poll returns an identical dict for the
+    same id, the cached model instance is returned instead of validating
+    the dict again. Comparing dicts is far cheaper than validation, and
+    unchanged devices keep their identity between polls.
+
+    Models returned from the cache are shared between calls and must be
+    treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_PARSE_CACHE_MAX_ENTRIES) -> None:
+        """Init the ParseCache object.
+
+        Args:
+            max_entries: maximum number of cached models
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[
+            tuple[Any, type, Any], tuple[Any, BaseModel]
+        ] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached models.
+
+        Returns:
+            number of models
+        """
+        return len(self._entries)
+
+    def parse(
+        self, type_: Any, data: Any, trusted: bool = False, scope: Any = None
+    ) -> Any:
+        """Parse data into a model or a list of models.
+
+        Args:
+            type_: model or list of models, e.g. list[Output]
+            data: decoded json
+            trusted: build models with construct_model instead of validating
+            scope: where data comes from, e.g. the installation id
+
+        Returns:
+            parsed models
+        """
+        if get_origin(type_) in (list, List) and isinstance(data, list):
+            args = get_args(type_)
+            if len(args) == 1 and is_model(args[0]):
+                return [self._parse_one(args[0], item, trusted, scope) for item in data]
+        elif is_model(type_):
+            return self._parse_one(type_, data, trusted, scope)
+        if trusted:
+            return construct_obj_as(type_, data)
+        return parse_obj_as(type_, data)
+
+    def clear(self) -> None:
+        """Remove all cached models."""
+        self._entries.clear()
+
+    def _parse_one(
+        self, model: type[BaseModel], raw: Any, trusted: bool, scope: Any
+    ) -> BaseModel:
+        """Return the cached model of raw or validate it.
+
+        Args:
+            model: pydantic model
+            raw: decoded json of one object
+            trusted: build the model with construct_model
+            scope: where raw comes from, e.g. the installation id
+
+        Returns:
+            model instance
+        """
+        idx = raw.get("id") if isinstance(raw, dict) else None
+        if idx is None or not isinstance(idx, (int, str)):
+            return self._validate(model, raw, trusted)
+
+        key = (scope, model, idx)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == raw:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        parsed = self._validate(model, raw, trusted)
+        self._entries[key] = (raw, parsed)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return parsed
+
+    @staticmethod
+    def _validate(model: type[BaseModel], raw: Any, trusted: bool) -> BaseModel:
+        """Build a model from raw, validating it unless trusted.
+
+        Args:
+            model: pydantic model
+            raw: decoded json of one object
+            trusted: build the model with construct_model
+
+        Returns:
+            model instance
+        """
+        if trusted:
+            return construct_model(model, raw)
+        return model.parse_obj(raw)
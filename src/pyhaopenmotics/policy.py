@@ -0,0 +1,198 @@
+"""Module containing request policies: timeouts, retries and deadlines."""
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Generator
+
+from tenacity import (
+    AsyncRetrying,
+    retry_if_exception_type,
+    stop_after_attempt,
+    stop_after_delay,
+    wait_random_exponential,
+)
+
+from .errors import NetworkTimeoutException, RetryableException
+
+_current_policy: ContextVar[RequestPolicy | None] = ContextVar(
+    "pyhaopenmotics_policy", default=None
+)
+_current_deadline: ContextVar[float | None] = ContextVar(
+    "pyhaopenmotics_deadline", default=None
+)
+
+
+@dataclass(frozen=True)
+class RequestPolicy:
+    """Timeout and retry policy of a request.
+
+    timeout bounds a single attempt, max_attempts and max_delay bound the
+    retries of retryable exceptions, and deadline bounds the total time of
+    the request including all retries and backoff.
+    """
+
+    timeout: float = 15.0
+    max_attempts: int = 10
+    max_delay: float = 300.0
+    backoff_multiplier: float = 1.0
+    backoff_max: float = 30.0
+    deadline: float | None = None
+
+    @classmethod
+    def interactive(cls, deadline: float = 0.8) -> RequestPolicy:
+        """Return a policy for commands a user is waiting on.
+
+        Args:
+            deadline: total time in seconds
+
+        Returns:
+            single attempt policy bounded by deadline
+        """
+        return cls(timeout=deadline, max_attempts=1, max_delay=0, deadline=deadline)
+
+    @classmethod
+    def background(cls) -> RequestPolicy:
+        """Return a policy for background polls.
+
+        Returns:
+            policy with generous retries
+        """
+        return cls(timeout=30.0, max_attempts=20, max_delay=600.0, backoff_max=60.0)
+
+    async def call(self, func: Callable[[float], Awaitable[Any]]) -> Any:
+        """Call func with retries, bounded by this policy and any deadline.
+
+        Args:
+            func: coroutine function taking the timeout of one attempt
+
+        Returns:
+            result of func
+        """
+        deadline = effective_deadline(self)
+        retrying = AsyncRetrying(
+            retry=retry_if_exception_type(RetryableException),
+            stop=(
+                stop_after_delay(self.max_delay) | stop_after_attempt(self.max_attempts)
+            ),
+            wait=wait_random_exponential(
+                multiplier=self.backoff_multiplier, max=self.backoff_max
+            ),
+            reraise=True,
+        )
+
+        async def attempts() -> Any:
+            async for attempt in retrying:
+                with attempt:
+                    timeout = self.timeout
+                    if deadline is not None:
+                        timeout = min(timeout, max(0.0, deadline - time.monotonic()))
+                    return await func(timeout)
+
+        if deadline is None:
+            return await attempts()
+        return await wait_until(attempts(), deadline)
+
+
+def effective_deadline(policy: RequestPolicy | None = None) -> float | None:
+    """Return the earliest of the propagated deadline and the policy deadline.
+
+    Args:
+        policy: policy of the request
+
+    Returns:
+        deadline in time.monotonic() seconds or None
+    """
+    deadline = _current_deadline.get()
+    if policy is not None and policy.deadline is not None:
+        policy_deadline = time.monotonic() + policy.deadline
+        if deadline is None or policy_deadline < deadline:
+            deadline = policy_deadline
+    return deadline
+
+
+async def wait_until(awaitable: Awaitable[Any], deadline: float | None) -> Any:
+    """Await awaitable, giving up at deadline.
+
+    Args:
+        awaitable: awaitable
+        deadline: deadline in time.monotonic() seconds or None
+
+    Returns:
+        result of awaitable
+
+    Raises:
+        NetworkTimeoutException: deadline exceeded
+    """
+    if deadline is None:
+        return await awaitable
+
+    try:
+        return await asyncio.wait_for(awaitable, max(0.0, deadline - time.monotonic()))
+    except asyncio.TimeoutError as err:
+        raise NetworkTimeoutException(
+            "Deadline exceeded before the API answered.", None, None
+        ) from err
+
+
+def current_policy() -> RequestPolicy | None:
+    """Return the policy set with use_policy.
+
+    Returns:
+        policy or None
+    """
+    return _current_policy.get()
+
+
+def clear_deadline() -> None:
+    """Drop the propagated deadline from the current context.
+
+    For tasks whose result is shared between callers that each enforce
+    their own deadline, so the task doesn't end at the deadline of the
+    caller that started it.
+    """
+    _current_deadline.set(None)
+
+
+@contextmanager
+def use_policy(policy: RequestPolicy) -> Generator[RequestPolicy, None, None]:
+    """Apply a policy to all requests made in this context.
+
+    Args:
+        policy: policy
+
+    Yields:
+        policy
+    """
+    token = _current_policy.set(policy)
+    try:
+        yield policy
+    finally:
+        _current_policy.reset(token)
+
+
+@contextmanager
+def deadline(seconds: float) -> Generator[float, None, None]:
+    """Bound the total time of all requests made in this context.
+
+    Nested deadlines can only shorten the outer deadline.
+
+    Args:
+        seconds: time budget
+
+    Yields:
+        deadline in time.monotonic() seconds
+    """
+    at = time.monotonic() + seconds
+    outer = _current_deadline.get()
+    if outer is not None:
+        at = min(at, outer)
+
+    token = _current_deadline.set(at)
+    try:
+        yield at
+    finally:
+        _current_deadline.reset(token)
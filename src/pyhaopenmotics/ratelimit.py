@@ -0,0 +1,137 @@
+"""Module containing a client-side token-bucket rate limiter."""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+from .cache import parse_path
+from .const import (
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_RATE_LIMIT_BURST,
+    DEFAULT_RETRY_AFTER,
+    MAX_BACKOFF_RETRIES,
+)
+
+
+class TokenBucket:
+    """Token bucket refilling at a fixed rate.
+
+    Callers reserve a token up front, so concurrent callers are queued in
+    order and paced at the configured rate instead of all waking at once.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Init the TokenBucket object.
+
+        Args:
+            rate: tokens added per second
+            burst: maximum number of tokens in the bucket
+            clock: monotonic time in seconds
+        """
+        self.rate = rate
+        self.burst = burst
+
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+
+    def reserve(self) -> float:
+        """Take a token, going into debt when the bucket is empty.
+
+        Returns:
+            seconds to wait before the token may be used
+        """
+        now = self._clock()
+        self._tokens = min(
+            float(self.burst), self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.rate
+
+
+class RateLimiter:
+    """Pace requests with a global and a per-installation token bucket.
+
+    When the server answers 429 Too Many Requests, all requests are held
+    back for the Retry-After period and then retried instead of failing.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE_LIMIT,
+        burst: int = DEFAULT_RATE_LIMIT_BURST,
+        installation_rate: float | None = None,
+        installation_burst: int | None = None,
+        max_backoff_retries: int = MAX_BACKOFF_RETRIES,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ) -> None:
+        """Init the RateLimiter object.
+
+        Args:
+            rate: requests per second for the whole client
+            burst: requests allowed in a burst for the whole client
+            installation_rate: requests per second per installation
+            installation_burst: requests allowed in a burst per installation
+            max_backoff_retries: 429 responses retried before giving up
+            clock: monotonic time in seconds
+            sleep: coroutine function waiting a number of seconds
+        """
+        self.max_backoff_retries = max_backoff_retries
+
+        self._clock = clock
+        self._sleep = sleep
+        self._bucket = TokenBucket(rate, burst, clock)
+        self._installation_rate = installation_rate
+        self._installation_burst = installation_burst or burst
+        self._installation_buckets: dict[int, TokenBucket] = {}
+        self._paused_until = 0.0
+
+    async def acquire(self, path: str) -> None:
+        """Wait until a request to path may be sent.
+
+        Args:
+            path: path of the request
+        """
+        await self._wait_pause()
+
+        delay = self._bucket.reserve()
+        installation_id, _ = parse_path(path)
+        if self._installation_rate and installation_id is not None:
+            bucket = self._installation_buckets.get(installation_id)
+            if bucket is None:
+                bucket = TokenBucket(
+                    self._installation_rate, self._installation_burst, self._clock
+                )
+                self._installation_buckets[installation_id] = bucket
+            delay = max(delay, bucket.reserve())
+
+        if delay > 0:
+            await self._sleep(delay)
+            # A 429 may have been received while this request was queued.
+            await self._wait_pause()
+
+    async def _wait_pause(self) -> None:
+        """Wait until a pause after a 429 response has passed."""
+        while (pause := self._paused_until - self._clock()) > 0:
+            await self._sleep(pause)
+
+    def backoff(self, retry_after: float | None) -> None:
+        """Hold back all requests after a 429 response.
+
+        Args:
+            retry_after: seconds from the Retry-After header, if any
+        """
+        if retry_after is None:
+            retry_after = DEFAULT_RETRY_AFTER
+        self._paused_until = max(self._paused_until, self._clock() + retry_after)
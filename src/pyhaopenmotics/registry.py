@@ -0,0 +1,372 @@
+"""Module containing an indexed registry of the devices of installations."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Iterable, Iterator, Tuple
+
+from .state import IngestSource
+
+if TYPE_CHECKING:
+    from .snapshot import InstallationSnapshot
+    from .state import DeviceStateStore
+
+# installation id, kind, device id
+DeviceKey = Tuple[int, str, int]
+
+REGISTRY_KINDS = ("outputs", "lights", "sensors", "shutters", "thermostat_units")
+
+# Field holding the type of a device, per collection.
+TYPE_FIELDS = {
+    "outputs": "output_type",
+    "sensors": "physical_quantity",
+    "shutters": "shutter_type",
+}
+
+# Rooms and floors are numbered per installation, so their index keys
+# include the installation id.
+INDEXES = ("installation", "kind", "room", "floor", "gateway", "type", "capability")
+
+
+class DeviceRegistry:
+    """Devices of one or many installations with secondary indexes.
+
+    Every index maps a value to the set of device keys having it, so
+    lookups by room, floor, gateway, type or capability do not scan the
+    devices. The indexes are updated per device, and only when an indexed
+    value changed.
+    """
+
+    def __init__(self, kinds: Iterable[str] = REGISTRY_KINDS) -> None:
+        """Init the DeviceRegistry object.
+
+        Args:
+            kinds: collections to register, others are ignored
+        """
+        self.kinds = frozenset(kinds)
+        self._devices: dict[DeviceKey, Any] = {}
+        self._keys: dict[DeviceKey, tuple[tuple[str, Hashable], ...]] = {}
+        self._indexes: dict[str, dict[Hashable, set[DeviceKey]]] = {
+            name: {} for name in INDEXES
+        }
+
+    def __len__(self) -> int:
+        """Return the number of devices.
+
+        Returns:
+            number of devices
+        """
+        return len(self._devices)
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate over the models of all devices.
+
+        Yields:
+            pydantic model
+        """
+        yield from self._devices.values()
+
+    def get(self, installation_id: int, kind: str, device_id: int) -> Any | None:
+        """Return a device.
+
+        Args:
+            installation_id: int
+            kind: collection, e.g. "outputs"
+            device_id: int
+
+        Returns:
+            model or None
+        """
+        return self._devices.get((installation_id, kind, device_id))
+
+    def by_room(
+        self, installation_id: int, room_id: int, kind: str | None = None
+    ) -> list[Any]:
+        """Return the devices in a room.
+
+        Args:
+            installation_id: int
+            room_id: int
+            kind: only return devices of this collection
+
+        Returns:
+            list of models
+        """
+        return self.find(installation_id, kind, room_id=room_id)
+
+    def by_floor(
+        self, installation_id: int, floor_id: int, kind: str | None = None
+    ) -> list[Any]:
+        """Return the devices on a floor.
+
+        Args:
+            installation_id: int
+            floor_id: int
+            kind: only return devices of this collection
+
+        Returns:
+            list of models
+        """
+        return self.find(installation_id, kind, floor_id=floor_id)
+
+    def by_gateway(self, gateway_id: int, kind: str | None = None) -> list[Any]:
+        """Return the devices of a gateway.
+
+        Args:
+            gateway_id: int
+            kind: only return devices of this collection
+
+        Returns:
+            list of models
+        """
+        return self.find(kind=kind, gateway_id=gateway_id)
+
+    def by_type(self, type_: str, kind: str | None = None) -> list[Any]:
+        """Return the devices of a type, e.g. "OUTLET" or "temperature".
+
+        Args:
+            type_: output type, shutter type or physical quantity
+            kind: only return devices of this collection
+
+        Returns:
+            list of models
+        """
+        return self.find(kind=kind, type_=type_)
+
+    def by_capability(self, capability: str, kind: str | None = None) -> list[Any]:
+        """Return the devices with a capability, e.g. "RANGE".
+
+        Args:
+            capability: str
+            kind: only return devices of this collection
+
+        Returns:
+            list of models
+        """
+        return self.find(kind=kind, capability=capability)
+
+    def find(  # pylint: disable=too-many-arguments
+        self,
+        installation_id: int | None = None,
+        kind: str | None = None,
+        room_id: int | None = None,
+        floor_id: int | None = None,
+        gateway_id: int | None = None,
+        type_: str | None = None,
+        capability: str | None = None,
+    ) -> list[Any]:
+        """Return the devices matching all given criteria.
+
+        The index sets are intersected from small to large, e.g. all
+        dimmable outputs in room 5:
+        registry.find(21, "outputs", room_id=5, capability="RANGE")
+
+        Room and floor require the installation id.
+
+        Args:
+            installation_id: int
+            kind: collection, e.g. "outputs"
+            room_id: int
+            floor_id: int
+            gateway_id: int
+            type_: output type, shutter type or physical quantity
+            capability: str
+
+        Returns:
+            list of models, ordered by installation, kind and device id
+
+        Raises:
+            ValueError: room or floor without installation id
+        """
+        if installation_id is None and (room_id is not None or floor_id is not None):
+            raise ValueError("room_id and floor_id require an installation_id")
+
+        criteria = (
+            ("installation", installation_id, installation_id),
+            ("kind", kind, kind),
+            ("room", room_id, (installation_id, room_id)),
+            ("floor", floor_id, (installation_id, floor_id)),
+            ("gateway", gateway_id, gateway_id),
+            ("type", type_, type_),
+            ("capability", capability, capability),
+        )
+        sets = [
+            self._indexes[name].get(key, set())
+            for name, value, key in criteria
+            if value is not None
+        ]
+        if not sets:
+            keys: Iterable[DeviceKey] = self._devices
+        else:
+            sets.sort(key=len)
+            keys = sets[0].intersection(*sets[1:])
+        return [self._devices[key] for key in sorted(keys)]
+
+    def values(self, index: str, installation_id: int | None = None) -> list[Any]:
+        """Return the indexed values, e.g. all rooms or capabilities.
+
+        Args:
+            index: one of INDEXES
+            installation_id: only return values of this installation
+
+        Returns:
+            values, (installation id, id) tuples for rooms and floors
+
+        Raises:
+            ValueError: unknown index
+        """
+        if index not in self._indexes:
+            raise ValueError(f"Unknown index: {index}")
+        values = list(self._indexes[index])
+        if installation_id is not None:
+            installations = self._indexes["installation"].get(installation_id, set())
+            values = [
+                value
+                for value, keys in self._indexes[index].items()
+                if not keys.isdisjoint(installations)
+            ]
+        return sorted(values)
+
+    def update(  # pylint: disable=unused-argument
+        self,
+        installation_id: int,
+        kind: str,
+        models: Iterable[Any],
+        source: IngestSource = IngestSource.API,
+        complete: bool = False,
+    ) -> None:
+        """Add or update devices.
+
+        Has the signature of an ingest listener of the DeviceStateStore.
+        Devices of every source are registered, so the registry holds the
+        same models as the state store.
+
+        Args:
+            installation_id: int
+            kind: collection, e.g. "outputs"
+            models: pydantic models
+            source: origin of the models
+            complete: models are the whole collection of the installation,
+                registered devices that are missing are removed
+        """
+        if kind not in self.kinds:
+            return
+        models = list(models)
+        if complete:
+            present = {model.idx for model in models}
+            for key in [
+                key
+                for key in self._indexes["kind"].get(kind, set())
+                if key[0] == installation_id and key[2] not in present
+            ]:
+                self.remove(*key)
+
+        for model in models:
+            key = (installation_id, kind, model.idx)
+            if self._devices.get(key) is model:
+                continue
+            self._devices[key] = model
+
+            index_keys = _index_keys(installation_id, kind, model)
+            old_keys = self._keys.get(key, ())
+            if index_keys == old_keys:
+                continue
+            for name, value in set(old_keys) - set(index_keys):
+                self._discard(name, value, key)
+            for name, value in set(index_keys) - set(old_keys):
+                self._indexes[name].setdefault(value, set()).add(key)
+            self._keys[key] = index_keys
+
+    def update_snapshot(self, snapshot: InstallationSnapshot) -> None:
+        """Replace the devices of an installation with those of a snapshot.
+
+        Args:
+            snapshot: InstallationSnapshot
+        """
+        for kind in self.kinds:
+            self.update(
+                snapshot.installation_id,
+                kind,
+                getattr(snapshot, kind, ()),
+                complete=True,
+            )
+
+    def remove(self, installation_id: int, kind: str, device_id: int) -> None:
+        """Remove a device.
+
+        Args:
+            installation_id: int
+            kind: collection, e.g. "outputs"
+            device_id: int
+        """
+        key = (installation_id, kind, device_id)
+        self._devices.pop(key, None)
+        for name, value in self._keys.pop(key, ()):
+            self._discard(name, value, key)
+
+    def attach(self, state: DeviceStateStore) -> Callable[[], None]:
+        """Keep the registry up to date with every poll and event.
+
+        Devices are removed when a complete collection without them is
+        ingested, e.g. by get_all without filter or a snapshot.
+
+        Args:
+            state: DeviceStateStore, e.g. client.state
+
+        Returns:
+            callable detaching the registry
+        """
+        return state.add_ingest_listener(self.update)
+
+    def clear(self) -> None:
+        """Remove all devices."""
+        self._devices.clear()
+        self._keys.clear()
+        for index in self._indexes.values():
+            index.clear()
+
+    def _discard(self, name: str, value: Hashable, key: DeviceKey) -> None:
+        """Remove a device from an index, dropping empty entries.
+
+        Args:
+            name: index
+            value: indexed value
+            key: device key
+        """
+        index = self._indexes[name]
+        keys = index.get(value)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del index[value]
+
+
+def _index_keys(
+    installation_id: int, kind: str, model: Any
+) -> tuple[tuple[str, Hashable], ...]:
+    """Return the (index, value) pairs of a device.
+
+    Args:
+        installation_id: int
+        kind: collection
+        model: pydantic model
+
+    Returns:
+        index keys
+    """
+    keys: list[tuple[str, Hashable]] = [
+        ("installation", installation_id),
+        ("kind", kind),
+    ]
+    location = getattr(model, "location", None)
+    if location is not None:
+        if location.room_id is not None:
+            keys.append(("room", (installation_id, location.room_id)))
+        if location.floor_id is not None:
+            keys.append(("floor", (installation_id, location.floor_id)))
+        if location.gateway_id is not None:
+            keys.append(("gateway", location.gateway_id))
+    type_field = TYPE_FIELDS.get(kind)
+    if type_field is not None and getattr(model, type_field, None) is not None:
+        keys.append(("type", getattr(model, type_field)))
+    for capability in getattr(model, "capabilities", None) or ():
+        keys.append(("capability", capability))
+    return tuple(keys)
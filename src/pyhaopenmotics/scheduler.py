@@ -0,0 +1,215 @@
+"""Module containing an adaptive poller of the device collections."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Callable
+
+from .cache import invalidation_scopes
+from .const import (
+    DEFAULT_FAST_POLL_DURATION,
+    DEFAULT_FAST_POLL_INTERVAL,
+    DEFAULT_MAX_POLL_BACKOFF,
+    DEFAULT_POLL_BACKOFF_FACTOR,
+    DEFAULT_POLL_INTERVALS,
+)
+from .snapshot import COLLECTIONS
+from .state import StateChange
+
+if TYPE_CHECKING:
+    from .base import BaseClient  # pylint: disable=R0401
+
+logger = logging.getLogger(__name__)
+
+# Collections whose state is changed by a command on a resource, for the
+# resources that are not a collection themselves.
+COMMAND_TARGETS = {
+    "thermostats": ("thermostat_groups", "thermostat_units"),
+    "groupactions": ("outputs", "lights", "shutters"),
+}
+
+
+class PollScheduler:
+    """Poll the device collections of an installation, each at its own pace.
+
+    A collection is polled at its base interval. After a command is sent to
+    it, it is polled at the fast interval for a while. When a poll finds no
+    state changes the interval grows up to max_backoff times the base
+    interval, and it drops back to the base interval on the next change.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(
+        self,
+        baseclient: BaseClient,
+        installation_id: int,
+        intervals: dict[str, float] | None = None,
+        fast_interval: float = DEFAULT_FAST_POLL_INTERVAL,
+        fast_duration: float = DEFAULT_FAST_POLL_DURATION,
+        backoff_factor: float = DEFAULT_POLL_BACKOFF_FACTOR,
+        max_backoff: float = DEFAULT_MAX_POLL_BACKOFF,
+    ) -> None:
+        """Init the PollScheduler object.
+
+        Args:
+            baseclient: BaseClient
+            installation_id: int
+            intervals: base interval per collection, e.g. {"outputs": 10}
+            fast_interval: interval after a command
+            fast_duration: seconds to poll fast after a command
+            backoff_factor: interval multiplier after a poll without changes
+            max_backoff: maximum interval as a multiple of the base interval
+
+        Raises:
+            ValueError: unknown collection
+        """
+        self.baseclient = baseclient
+        self.installation_id = installation_id
+        self.intervals = dict(
+            DEFAULT_POLL_INTERVALS if intervals is None else intervals
+        )
+        unknown = set(self.intervals) - set(COLLECTIONS)
+        if unknown:
+            raise ValueError(f"Unknown collections: {', '.join(sorted(unknown))}")
+
+        self.fast_interval = fast_interval
+        self.fast_duration = fast_duration
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+
+        self._current = dict(self.intervals)
+        self._fast_until: dict[str, float] = {}
+        self._changes: dict[str, int] = dict.fromkeys(self.intervals, 0)
+        # Created by the pollers, so they belong to the running loop.
+        self._wakeups: dict[str, asyncio.Event] = {}
+        self._tasks: list[asyncio.Task] = []
+        self._unsubscribe: list[Callable[[], None]] = []
+
+    def interval(self, kind: str) -> float:
+        """Return the interval until the next poll of a collection.
+
+        Args:
+            kind: collection, e.g. "outputs"
+
+        Returns:
+            interval in seconds
+        """
+        if time.monotonic() < self._fast_until.get(kind, 0.0):
+            return min(self.fast_interval, self._current[kind])
+        return self._current[kind]
+
+    def boost(self, kind: str, duration: float | None = None) -> None:
+        """Poll a collection at the fast interval, starting now.
+
+        Args:
+            kind: collection, e.g. "outputs"
+            duration: seconds to poll fast, defaults to fast_duration
+        """
+        if kind not in self.intervals:
+            return
+        if duration is None:
+            duration = self.fast_duration
+        self._fast_until[kind] = time.monotonic() + duration
+        self._current[kind] = self.intervals[kind]
+        wakeup = self._wakeups.get(kind)
+        if wakeup is not None:
+            wakeup.set()
+
+    async def poll(self, kind: str) -> bool:
+        """Poll a collection once and adapt its interval.
+
+        The interval doesn't grow while the collection is polled fast, and
+        it starts over from the base interval when that ends.
+
+        Args:
+            kind: collection, e.g. "outputs"
+
+        Returns:
+            whether the state of a device changed
+
+        Raises:
+            asyncio.CancelledError: the poll was cancelled
+        """
+        before = self._changes[kind]
+        try:
+            await COLLECTIONS[kind](self.baseclient, self.installation_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:  # pylint: disable=broad-except
+            logger.warning("Polling %s failed: %s", kind, err)
+        changed = self._changes[kind] != before
+
+        base = self.intervals[kind]
+        fast_until = self._fast_until.get(kind)
+        if fast_until is not None and time.monotonic() >= fast_until:
+            del self._fast_until[kind]
+            self._current[kind] = base
+        elif changed or fast_until is not None:
+            self._current[kind] = base
+        else:
+            self._current[kind] = min(
+                self._current[kind] * self.backoff_factor, base * self.max_backoff
+            )
+        return changed
+
+    def start(self) -> None:
+        """Start polling all collections in the background."""
+        if self._tasks:
+            return
+        self._unsubscribe = [
+            self.baseclient.state.subscribe(self._on_state_change),
+            self.baseclient.add_command_listener(self._on_command),
+        ]
+        self._tasks = [
+            asyncio.ensure_future(self._run(kind)) for kind in self.intervals
+        ]
+
+    async def stop(self) -> None:
+        """Stop polling."""
+        for unsubscribe in self._unsubscribe:
+            unsubscribe()
+        self._unsubscribe = []
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _run(self, kind: str) -> None:
+        """Poll a collection until stopped.
+
+        Args:
+            kind: collection, e.g. "outputs"
+        """
+        wakeup = self._wakeups[kind] = asyncio.Event()
+        while True:
+            wakeup.clear()
+            await self.poll(kind)
+            try:
+                await asyncio.wait_for(wakeup.wait(), self.interval(kind))
+            except asyncio.TimeoutError:
+                pass
+
+    def _on_state_change(self, change: StateChange) -> None:
+        """Count the state changes per collection.
+
+        Args:
+            change: StateChange
+        """
+        if (
+            change.installation_id == self.installation_id
+            and change.kind in self._changes
+        ):
+            self._changes[change.kind] += 1
+
+    def _on_command(self, path: str) -> None:
+        """Poll the collections changed by a command fast.
+
+        Args:
+            path: path of the command
+        """
+        for installation_id, resource in invalidation_scopes(path):
+            if installation_id != self.installation_id or resource is None:
+                continue
+            for kind in COMMAND_TARGETS.get(resource, (resource,)):
+                self.boost(kind)
@@ -0,0 +1,74 @@
+"""Module containing request coalescing for identical in-flight calls."""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share the same key.
+
+    The first caller for a key starts the call, every caller that arrives
+    while it is still running awaits the same result (or exception).
+    """
+
+    def __init__(self) -> None:
+        """Init the SingleFlight object."""
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        """Return the number of calls in flight.
+
+        Returns:
+            number of calls in flight
+        """
+        return len(self._calls)
+
+    async def do(
+        self,
+        key: Hashable,
+        func: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Run func once for all concurrent callers with the same key.
+
+        Args:
+            key: key identifying identical calls
+            func: coroutine function starting the call
+
+        Returns:
+            result of the shared call
+        """
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func())
+            self._calls[key] = future
+            future.add_done_callback(lambda fut: self._forget(key, fut))
+
+        # Shield the shared call so a cancelled waiter doesn't cancel the
+        # request for all other waiters.
+        return await asyncio.shield(future)
+
+    def discard_if(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Stop sharing the calls whose key matches predicate.
+
+        Callers already waiting still get the result, new callers start a
+        fresh call.
+
+        Args:
+            predicate: function returning True for keys to discard
+        """
+        for key in [key for key in self._calls if predicate(key)]:
+            del self._calls[key]
+
+    def _forget(self, key: Hashable, future: asyncio.Future) -> None:
+        """Remove a finished call.
+
+        Args:
+            key: key of the call
+            future: the finished call
+        """
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        if not future.cancelled():
+            # Mark the exception as retrieved when all waiters went away.
+            future.exception()
@@ -0,0 +1,115 @@
+"""Module containing an immutable snapshot of all devices of an installation."""
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+from .const import DEFAULT_SNAPSHOT_CONCURRENCY
+from .models.groupaction import GroupAction
+from .models.installation import Installation
+from .models.light import Light
+from .models.output import Output
+from .models.sensor import Sensor
+from .models.shutter import Shutter
+from .models.thermostats import ThermostatGroup, ThermostatUnit
+
+if TYPE_CHECKING:
+    from .base import BaseClient  # pylint: disable=R0401
+
+
+def _get_all(attr: str) -> Callable[[BaseClient, int], Awaitable[list[Any]]]:
+    """Return a function fetching a collection of an installation.
+
+    Args:
+        attr: dotted device module of the client, e.g. "thermostats.units"
+
+    Returns:
+        function taking the client and the installation id
+    """
+    module = attrgetter(attr)
+    return lambda client, installation_id: module(client).get_all(installation_id)
+
+
+COLLECTIONS: dict[str, Callable[[BaseClient, int], Awaitable[list[Any]]]] = {
+    "outputs": _get_all("outputs"),
+    "lights": _get_all("lights"),
+    "sensors": _get_all("sensors"),
+    "shutters": _get_all("shutters"),
+    "groupactions": _get_all("groupactions"),
+    "thermostat_groups": _get_all("thermostats.groups"),
+    "thermostat_units": _get_all("thermostats.units"),
+}
+
+
+@dataclass(frozen=True)
+class InstallationSnapshot:
+    """Object holding all device collections of an installation.
+
+    The snapshot is immutable, the collections are tuples.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    installation_id: int
+    outputs: tuple[Output, ...] = ()
+    lights: tuple[Light, ...] = ()
+    sensors: tuple[Sensor, ...] = ()
+    shutters: tuple[Shutter, ...] = ()
+    groupactions: tuple[GroupAction, ...] = ()
+    thermostat_groups: tuple[ThermostatGroup, ...] = ()
+    thermostat_units: tuple[ThermostatUnit, ...] = ()
+    installation: Installation | None = None
+    taken_at: float = 0.0
+
+
+async def take_snapshot(
+    client: BaseClient,
+    installation_id: int,
+    max_concurrency: int = DEFAULT_SNAPSHOT_CONCURRENCY,
+    semaphore: asyncio.Semaphore | None = None,
+    installation: Installation | None = None,
+) -> InstallationSnapshot:
+    """Fetch all device collections of an installation concurrently.
+
+    Args:
+        client: BaseClient
+        installation_id: int
+        max_concurrency: maximum number of requests in flight
+        semaphore: semaphore shared with other snapshots, overrides
+            max_concurrency
+        installation: the installation, stored on the snapshot
+
+    Returns:
+        InstallationSnapshot
+
+    Raises:
+        BaseException: the error of the first failed collection, or the
+            cancellation of the snapshot, after cancelling the others
+    """
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch(name: str) -> tuple[Any, ...]:
+        async with semaphore:  # type: ignore
+            return tuple(await COLLECTIONS[name](client, installation_id))
+
+    names = list(COLLECTIONS)
+    tasks = [asyncio.ensure_future(fetch(name)) for name in names]
+    try:
+        results = await asyncio.gather(*tasks)
+    except BaseException:
+        # The snapshot failed or was cancelled, stop fetching the other
+        # collections instead of leaving them running in the background.
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+    return InstallationSnapshot(
+        installation_id=installation_id,
+        installation=installation,
+        taken_at=time.time(),
+        **dict(zip(names, results)),
+    )
@@ -0,0 +1,375 @@
+"""Module containing the device state store and its change events."""
+from __future__ import annotations
+
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Generator, Iterable, Tuple, Union
+
+from pydantic import BaseModel, ValidationError
+
+from .models.util import StrEnum
+
+if TYPE_CHECKING:
+    from .snapshot import InstallationSnapshot
+
+logger = logging.getLogger(__name__)
+
+DeviceKey = Tuple[int, str, int]
+
+# Collections of an InstallationSnapshot that hold devices with a state.
+DEVICE_KINDS = (
+    "outputs",
+    "lights",
+    "sensors",
+    "shutters",
+    "thermostat_groups",
+    "thermostat_units",
+)
+
+# Only changes of these fields are reported to the listeners.
+WATCHED_FIELDS = ("status", "last_state_change")
+
+# Expected state after a command, or a callable returning it from the model.
+Update = Union[dict[str, Any], Callable[[Any], dict[str, Any]]]
+
+
+class IngestSource(StrEnum):
+    """Origin of ingested models."""
+
+    API = "api"
+    EVENT = "event"
+    # Expected state of a command, or its rollback when the command failed.
+    OPTIMISTIC = "optimistic"
+    # Topology loaded from disk, without status.
+    CACHE = "cache"
+
+
+# Receives installation id, kind, models, source and whether the models are
+# the complete collection of the installation.
+IngestListener = Callable[[int, str, list[Any], IngestSource, bool], None]
+
+
+@dataclass(frozen=True)
+class StateChange:
+    """Object holding the change of a device between two polls.
+
+    changes maps dotted field names (e.g. "status.on") to (old, new) values.
+    old is None for a device seen for the first time.
+    """
+
+    installation_id: int
+    kind: str
+    device_id: int
+    old: BaseModel | None
+    new: BaseModel
+    changes: dict[str, tuple[Any, Any]] = field(default_factory=dict)
+
+
+class DeviceStateStore:
+    """In-memory state of all devices, keyed by installation, kind and id.
+
+    Poll results are ingested, diffed field by field against the previous
+    state, and listeners are called only for devices whose status or
+    last_state_change changed.
+    """
+
+    def __init__(self) -> None:
+        """Init the DeviceStateStore object."""
+        self._devices: dict[DeviceKey, BaseModel] = {}
+        self._listeners: list[Callable[[StateChange], None]] = []
+        self._ingest_listeners: list[IngestListener] = []
+
+    def __len__(self) -> int:
+        """Return the number of known devices.
+
+        Returns:
+            number of devices
+        """
+        return len(self._devices)
+
+    def get(self, installation_id: int, kind: str, device_id: int) -> Any | None:
+        """Return the last known state of a device.
+
+        Args:
+            installation_id: int
+            kind: collection, e.g. "outputs"
+            device_id: int
+
+        Returns:
+            model or None
+        """
+        return self._devices.get((installation_id, kind, device_id))
+
+    def devices(self, installation_id: int, kind: str) -> list[Any]:
+        """Return the last known state of all devices of a kind.
+
+        Args:
+            installation_id: int
+            kind: collection, e.g. "outputs"
+
+        Returns:
+            list of models
+        """
+        return [
+            model
+            for (i_id, i_kind, _), model in self._devices.items()
+            if i_id == installation_id and i_kind == kind
+        ]
+
+    def subscribe(self, listener: Callable[[StateChange], None]) -> Callable[[], None]:
+        """Call listener for every state change.
+
+        Args:
+            listener: callable receiving a StateChange
+
+        Returns:
+            callable removing the listener
+        """
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def add_ingest_listener(self, listener: IngestListener) -> Callable[[], None]:
+        """Call listener with every ingested batch, changed or not.
+
+        Args:
+            listener: callable receiving installation id, kind, models,
+                source and complete
+
+        Returns:
+            callable removing the listener
+        """
+        self._ingest_listeners.append(listener)
+        return lambda: self._ingest_listeners.remove(listener)
+
+    def ingest(
+        self,
+        installation_id: int,
+        kind: str,
+        models: Iterable[BaseModel],
+        source: IngestSource = IngestSource.API,
+        complete: bool = False,
+    ) -> list[StateChange]:
+        """Store poll results and report the devices whose state changed.
+
+        Args:
+            installation_id: int
+            kind: collection, e.g. "outputs"
+            models: models returned by the poll
+            source: origin of the models, passed to the ingest listeners
+            complete: models are the whole collection of the installation,
+                devices missing from it are forgotten
+
+        Returns:
+            state changes, also passed to the listeners
+        """
+        models = list(models)
+        if complete:
+            seen = {model.idx for model in models}  # type: ignore
+            for key in [
+                key
+                for key in self._devices
+                if key[:2] == (installation_id, kind) and key[2] not in seen
+            ]:
+                del self._devices[key]
+
+        events = []
+        for model in models:
+            key = (installation_id, kind, model.idx)  # type: ignore
+            old = self._devices.get(key)
+            self._devices[key] = model
+            if old is model:
+                continue
+
+            if old is None:
+                changes = {}
+            else:
+                changes = diff(old.dict(), model.dict())
+                if not any(_is_watched(name) for name in changes):
+                    continue
+
+            events.append(
+                StateChange(installation_id, kind, key[2], old, model, changes)
+            )
+
+        for listener in list(self._ingest_listeners):
+            try:
+                listener(installation_id, kind, models, source, complete)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Error in ingest listener")
+
+        for event in events:
+            self._notify(event)
+        return events
+
+    def ingest_snapshot(
+        self,
+        snapshot: InstallationSnapshot,
+        source: IngestSource = IngestSource.API,
+    ) -> list[StateChange]:
+        """Store all device collections of a snapshot.
+
+        Args:
+            snapshot: InstallationSnapshot
+            source: origin of the snapshot
+
+        Returns:
+            state changes
+        """
+        events = []
+        for kind in DEVICE_KINDS:
+            events.extend(
+                self.ingest(
+                    snapshot.installation_id,
+                    kind,
+                    getattr(snapshot, kind),
+                    source,
+                    complete=True,
+                )
+            )
+        return events
+
+    @contextmanager
+    def optimistic(
+        self,
+        installation_id: int,
+        kind: str,
+        device_id: int,
+        update: Update,
+    ) -> Generator[Any | None, None, None]:
+        """Apply the expected state of a command while it is sent.
+
+        The expected model replaces the known model immediately and
+        listeners are notified. The next poll or event reconciles it with
+        the real state. When the command fails, the previous model is
+        restored unless a newer state arrived in the meantime.
+
+        Args:
+            installation_id: int
+            kind: collection, e.g. "outputs"
+            device_id: int
+            update: expected values, e.g. {"status": {"on": True}}
+
+        Yields:
+            expected model, or None when the device is unknown
+
+        Raises:
+            BaseException: the error of the command, after the rollback
+        """
+        previous = self.get(installation_id, kind, device_id)
+        expected = None
+        if previous is not None:
+            values = update(previous) if callable(update) else update
+            expected = merge_model(type(previous), previous, values)
+        if expected is not None:
+            self.ingest(installation_id, kind, [expected], IngestSource.OPTIMISTIC)
+
+        try:
+            yield expected
+        except BaseException:
+            if (
+                expected is not None
+                and self.get(installation_id, kind, device_id) is expected
+            ):
+                self.ingest(
+                    installation_id,
+                    kind,
+                    [previous],  # type: ignore
+                    IngestSource.OPTIMISTIC,
+                )
+            raise
+
+    def clear(self) -> None:
+        """Forget all devices."""
+        self._devices.clear()
+
+    def _notify(self, event: StateChange) -> None:
+        """Call the listeners.
+
+        Args:
+            event: StateChange
+        """
+        for listener in list(self._listeners):
+            try:
+                listener(event)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Error in state change listener")
+
+
+def merge_model(
+    model_type: type[BaseModel], old: BaseModel | None, data: dict[str, Any]
+) -> BaseModel | None:
+    """Return a new model with partial data merged into the old one.
+
+    The old model is left untouched.
+
+    Args:
+        model_type: pydantic model of the collection
+        old: last known model or None
+        data: new values, may be partial
+
+    Returns:
+        new model, or None when the merged values are not a valid model
+    """
+    values = _deep_update(old.dict(by_alias=True), data) if old else data
+    try:
+        return model_type.parse_obj(values)
+    except ValidationError:
+        logger.debug("Ignoring invalid state of device %s", values.get("id"))
+        return None
+
+
+def _deep_update(values: dict[str, Any], update: dict[str, Any]) -> dict[str, Any]:
+    """Merge nested dicts.
+
+    Args:
+        values: original values
+        update: new values
+
+    Returns:
+        merged values
+    """
+    for key, value in update.items():
+        if isinstance(value, dict) and isinstance(values.get(key), dict):
+            values[key] = _deep_update(values[key], value)
+        else:
+            values[key] = value
+    return values
+
+
+def diff(
+    old: dict[str, Any], new: dict[str, Any], prefix: str = ""
+) -> dict[str, tuple[Any, Any]]:
+    """Return the fields that differ between two model dicts.
+
+    Args:
+        old: old values
+        new: new values
+        prefix: prefix of the dotted field names
+
+    Returns:
+        (old, new) values per dotted field name
+    """
+    changes: dict[str, tuple[Any, Any]] = {}
+    for name in old.keys() | new.keys():
+        old_value = old.get(name)
+        new_value = new.get(name)
+        if old_value == new_value:
+            continue
+        if isinstance(old_value, dict) and isinstance(new_value, dict):
+            changes.update(diff(old_value, new_value, f"{prefix}{name}."))
+        else:
+            changes[f"{prefix}{name}"] = (old_value, new_value)
+    return changes
+
+
+def _is_watched(name: str) -> bool:
+    """Check whether a changed field is reported to listeners.
+
+    Args:
+        name: dotted field name
+
+    Returns:
+        True for status and last_state_change fields
+    """
+    return name.split(".", 1)[0] in WATCHED_FIELDS
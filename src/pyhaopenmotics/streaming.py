@@ -0,0 +1,54 @@
+"""Module containing the incremental parsing of streamed response bodies."""
+from __future__ import annotations
+
+from typing import Any, AsyncIterator
+
+try:
+    import ijson  # type: ignore
+except ImportError:  # pragma: no cover
+    ijson = None  # type: ignore
+
+
+def can_stream() -> bool:
+    """Return whether response bodies can be parsed incrementally.
+
+    Returns:
+        True when ijson is installed
+    """
+    return ijson is not None
+
+
+async def iter_items(
+    chunks: AsyncIterator[bytes], key: str = "data"
+) -> AsyncIterator[Any]:
+    """Decode the items of a json array while the body is received.
+
+    Only one item is held in memory at a time, besides the unparsed part of
+    the current chunk.
+
+    Args:
+        chunks: raw body chunks, e.g. response.aiter_bytes()
+        key: member of the top-level object holding the array
+
+    Yields:
+        decoded json of one item
+
+    Raises:
+        ImportError: ijson is not installed
+    """
+    if ijson is None:
+        raise ImportError(
+            "ijson is required for streaming, install pyhaopenmotics[ijson]"
+        )
+
+    items = ijson.sendable_list()
+    # use_float decodes numbers like json.loads does, instead of Decimal.
+    coro = ijson.items_coro(items, f"{key}.item", use_float=True)
+    async for chunk in chunks:
+        coro.send(chunk)
+        for item in items:
+            yield item
+        del items[:]
+    coro.close()
+    for item in items:
+        yield item
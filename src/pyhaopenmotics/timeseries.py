@@ -0,0 +1,344 @@
+"""Module containing an in-process time series store of sensor readings."""
+from __future__ import annotations
+
+import math
+import time
+from array import array
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Iterator, NamedTuple, Tuple
+
+from .const import DEFAULT_SERIES_CAPACITY, DEFAULT_TIMESERIES_MAX_BYTES
+from .state import IngestSource
+
+if TYPE_CHECKING:
+    from .state import DeviceStateStore
+
+# installation id, kind, device id, field
+SeriesKey = Tuple[int, str, int, str]
+
+# Status fields recorded per collection of the state store.
+SERIES_FIELDS = {
+    "sensors": ("temperature", "humidity", "brightness"),
+    "thermostat_units": ("actual_temperature", "current_setpoint"),
+}
+
+# Bytes per point: a float64 timestamp and a float64 value.
+POINT_SIZE = 16
+
+# Only models read from the API are readings, optimistic states are guesses.
+RECORDED_SOURCES = frozenset({IngestSource.API, IngestSource.EVENT})
+
+
+class Bucket(NamedTuple):
+    """Aggregated points of one downsampling bucket."""
+
+    start: float
+    samples: int
+    min: float  # noqa: A003
+    max: float  # noqa: A003
+    mean: float
+
+
+class RingBuffer:
+    """Fixed-size series of (timestamp, value) points.
+
+    Points are stored in two preallocated float64 arrays. When the buffer
+    is full, new points overwrite the oldest ones.
+    """
+
+    __slots__ = ("capacity", "_times", "_values", "_next", "_len")
+
+    def __init__(self, capacity: int = DEFAULT_SERIES_CAPACITY) -> None:
+        """Init the RingBuffer object.
+
+        Args:
+            capacity: maximum number of points
+
+        Raises:
+            ValueError: capacity is not positive
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._times = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        self._next = 0
+        self._len = 0
+
+    def __len__(self) -> int:
+        """Return the number of points.
+
+        Returns:
+            number of points
+        """
+        return self._len
+
+    def __iter__(self) -> Iterator[tuple[float, float]]:
+        """Iterate over the points from old to new.
+
+        Yields:
+            (timestamp, value)
+        """
+        start = (self._next - self._len) % self.capacity
+        for offset in range(self._len):
+            index = (start + offset) % self.capacity
+            yield self._times[index], self._values[index]
+
+    @property
+    def nbytes(self) -> int:
+        """Return the memory held by the points.
+
+        Returns:
+            bytes
+        """
+        return self.capacity * POINT_SIZE
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Add a point, overwriting the oldest one when full.
+
+        Args:
+            timestamp: seconds since the epoch
+            value: reading
+        """
+        self._times[self._next] = timestamp
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self._len = min(self._len + 1, self.capacity)
+
+    def last(self) -> tuple[float, float] | None:
+        """Return the newest point.
+
+        Returns:
+            (timestamp, value) or None when empty
+        """
+        if not self._len:
+            return None
+        index = (self._next - 1) % self.capacity
+        return self._times[index], self._values[index]
+
+    def window(
+        self, since: float | None = None, until: float | None = None
+    ) -> list[tuple[float, float]]:
+        """Return the points within a time window.
+
+        Args:
+            since: first timestamp, inclusive
+            until: last timestamp, exclusive
+
+        Returns:
+            (timestamp, value) points from old to new
+        """
+        return [
+            (timestamp, value)
+            for timestamp, value in self
+            if (since is None or timestamp >= since)
+            and (until is None or timestamp < until)
+        ]
+
+    def downsample(
+        self,
+        bucket: float,
+        since: float | None = None,
+        until: float | None = None,
+    ) -> list[Bucket]:
+        """Aggregate the points per time bucket.
+
+        Buckets are aligned to multiples of the bucket size since the epoch,
+        buckets without points are left out.
+
+        Args:
+            bucket: bucket size in seconds
+            since: first timestamp, inclusive
+            until: last timestamp, exclusive
+
+        Returns:
+            buckets from old to new
+
+        Raises:
+            ValueError: bucket is not positive
+        """
+        if bucket <= 0:
+            raise ValueError("bucket must be positive")
+
+        buckets: list[Bucket] = []
+        current = 0.0
+        samples = 0
+        total = minimum = maximum = 0.0
+        for timestamp, value in self.window(since, until):
+            start = float(math.floor(timestamp / bucket) * bucket)
+            if not samples or start != current:
+                if samples:
+                    buckets.append(
+                        Bucket(current, samples, minimum, maximum, total / samples)
+                    )
+                current, samples, total = start, 0, 0.0
+                minimum = maximum = value
+            samples += 1
+            total += value
+            minimum = min(minimum, value)
+            maximum = max(maximum, value)
+        if samples:
+            buckets.append(Bucket(current, samples, minimum, maximum, total / samples))
+        return buckets
+
+
+class TimeSeriesStore:
+    """Short-term history of sensor and thermostat readings.
+
+    Every series (installation, kind, device, field) is a RingBuffer of a
+    fixed capacity. When the buffers would exceed max_bytes, the least
+    recently updated series is dropped.
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_SERIES_CAPACITY,
+        max_bytes: int = DEFAULT_TIMESERIES_MAX_BYTES,
+    ) -> None:
+        """Init the TimeSeriesStore object.
+
+        Args:
+            capacity: maximum number of points per series
+            max_bytes: maximum memory of all series
+
+        Raises:
+            ValueError: max_bytes does not fit a single series
+        """
+        if max_bytes < capacity * POINT_SIZE:
+            raise ValueError("max_bytes does not fit a single series")
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self._series: OrderedDict[SeriesKey, RingBuffer] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of series.
+
+        Returns:
+            number of series
+        """
+        return len(self._series)
+
+    @property
+    def nbytes(self) -> int:
+        """Return the memory held by all series.
+
+        Returns:
+            bytes
+        """
+        return len(self._series) * self.capacity * POINT_SIZE
+
+    def keys(self) -> list[SeriesKey]:
+        """Return the keys of all series.
+
+        Returns:
+            (installation id, kind, device id, field) keys
+        """
+        return list(self._series)
+
+    def series(self, key: SeriesKey) -> RingBuffer | None:
+        """Return a series.
+
+        Args:
+            key: (installation id, kind, device id, field)
+
+        Returns:
+            RingBuffer or None
+        """
+        return self._series.get(key)
+
+    def record(
+        self, key: SeriesKey, value: float, timestamp: float | None = None
+    ) -> None:
+        """Add a reading to a series.
+
+        Args:
+            key: (installation id, kind, device id, field)
+            value: reading
+            timestamp: seconds since the epoch, defaults to now
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        buffer = self._series.get(key)
+        if buffer is None:
+            while (len(self._series) + 1) * self.capacity * POINT_SIZE > self.max_bytes:
+                self._series.popitem(last=False)
+            buffer = self._series[key] = RingBuffer(self.capacity)
+        else:
+            self._series.move_to_end(key)
+        buffer.append(timestamp, value)
+
+    def ingest(
+        self,
+        installation_id: int,
+        kind: str,
+        models: list[Any],
+        source: IngestSource = IngestSource.API,
+        complete: bool = False,  # pylint: disable=unused-argument
+        timestamp: float | None = None,
+    ) -> None:
+        """Record the readings of polled sensors or thermostat units.
+
+        Missing readings are skipped, other collections and models that
+        were not read from the API are ignored.
+
+        Args:
+            installation_id: int
+            kind: collection, e.g. "sensors"
+            models: models returned by the poll
+            source: origin of the models
+            complete: models are the whole collection
+            timestamp: seconds since the epoch, defaults to now
+        """
+        fields = SERIES_FIELDS.get(kind)
+        if fields is None or source not in RECORDED_SOURCES:
+            return
+        if timestamp is None:
+            timestamp = time.time()
+        for model in models:
+            status = model.status
+            if status is None:
+                continue
+            for field in fields:
+                value = getattr(status, field, None)
+                if value is not None:
+                    self.record(
+                        (installation_id, kind, model.idx, field), value, timestamp
+                    )
+
+    def downsample(
+        self,
+        key: SeriesKey,
+        bucket: float,
+        since: float | None = None,
+        until: float | None = None,
+    ) -> list[Bucket]:
+        """Aggregate a series per time bucket.
+
+        Args:
+            key: (installation id, kind, device id, field)
+            bucket: bucket size in seconds
+            since: first timestamp, inclusive
+            until: last timestamp, exclusive
+
+        Returns:
+            buckets from old to new, empty for an unknown series
+        """
+        buffer = self._series.get(key)
+        if buffer is None:
+            return []
+        return buffer.downsample(bucket, since, until)
+
+    def attach(self, state: DeviceStateStore) -> Callable[[], None]:
+        """Record every poll ingested in a state store.
+
+        Args:
+            state: DeviceStateStore, e.g. client.state
+
+        Returns:
+            callable detaching the store
+        """
+        return state.add_ingest_listener(self.ingest)
+
+    def clear(self) -> None:
+        """Remove all series."""
+        self._series.clear()
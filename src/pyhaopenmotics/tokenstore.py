@@ -0,0 +1,173 @@
+"""Module containing stores to persist OAuth tokens between processes."""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Generator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+
+class TokenStore:
+    """Base class of a token store.
+
+    A token store keeps tokens per key (token endpoint and client), so
+    restarted or parallel workers can reuse a token that is still valid.
+    """
+
+    def load(self, key: str) -> dict[str, Any] | None:
+        """Load a token.
+
+        Subclasses should implement this!
+
+        Args:
+            key: token key
+
+        Raises:
+            NotImplementedError: blabla
+        """
+        raise NotImplementedError()
+
+    def save(self, key: str, token: dict[str, Any]) -> None:
+        """Save a token.
+
+        Subclasses should implement this!
+
+        Args:
+            key: token key
+            token: token
+
+        Raises:
+            NotImplementedError: blabla
+        """
+        raise NotImplementedError()
+
+
+class MemoryTokenStore(TokenStore):
+    """Token store shared by the clients of one process."""
+
+    def __init__(self) -> None:
+        """Init the MemoryTokenStore object."""
+        self._tokens: dict[str, dict[str, Any]] = {}
+
+    def load(self, key: str) -> dict[str, Any] | None:
+        """Load a token.
+
+        Args:
+            key: token key
+
+        Returns:
+            token or None
+        """
+        return self._tokens.get(key)
+
+    def save(self, key: str, token: dict[str, Any]) -> None:
+        """Save a token.
+
+        Args:
+            key: token key
+            token: token
+        """
+        self._tokens[key] = dict(token)
+
+
+class FileTokenStore(TokenStore):
+    """Token store backed by a JSON file.
+
+    Access is serialized between processes with an advisory lock on a
+    sidecar lock file, and the file is replaced atomically on save.
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        """Init the FileTokenStore object.
+
+        Args:
+            path: path of the token file
+        """
+        self.path = Path(path)
+        self._lock_path = self.path.with_name(f"{self.path.name}.lock")
+
+    def load(self, key: str) -> dict[str, Any] | None:
+        """Load a token.
+
+        Args:
+            key: token key
+
+        Returns:
+            token or None
+        """
+        with self._lock(shared=True):
+            return self._read().get(key)
+
+    def save(self, key: str, token: dict[str, Any]) -> None:
+        """Save a token.
+
+        Args:
+            key: token key
+            token: token
+
+        Raises:
+            BaseException: the error writing the token, after removing the
+                temporary file
+        """
+        with self._lock(shared=False):
+            tokens = self._read()
+            tokens[key] = dict(token)
+
+            fd, tmp_path = tempfile.mkstemp(
+                dir=self.path.parent, prefix=f".{self.path.name}."
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+                    json.dump(tokens, tmp_file)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+    def _read(self) -> dict[str, dict[str, Any]]:
+        """Read all tokens.
+
+        Returns:
+            tokens per key
+        """
+        try:
+            with open(self.path, encoding="utf-8") as token_file:
+                tokens = json.load(token_file)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            logger.warning("Ignoring corrupt token file %s", self.path)
+            return {}
+
+        if not isinstance(tokens, dict):
+            return {}
+        return tokens
+
+    @contextmanager
+    def _lock(self, shared: bool) -> Generator[None, None, None]:
+        """Hold the lock file.
+
+        Args:
+            shared: take a shared (read) lock instead of an exclusive one
+
+        Yields:
+            None
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self._lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
@@ -0,0 +1,382 @@
+"""Module containing an on-disk cache of the topology of installations.
+
+The topology is everything of a device except its state: names, types,
+capabilities, locations and configuration. It is stored in SQLite per
+installation, collection and device together with the `_version` of the
+device, so a restarted client can load it in milliseconds and revalidate
+it against the API in the background.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import TYPE_CHECKING, Any, Iterable
+
+from pydantic import BaseModel
+
+from .construct import construct_model
+from .models.groupaction import GroupAction
+from .models.installation import Installation
+from .models.light import Light
+from .models.output import Output
+from .models.sensor import Sensor
+from .models.shutter import Shutter
+from .models.thermostats import ThermostatGroup, ThermostatUnit
+from .snapshot import COLLECTIONS, InstallationSnapshot
+from .state import WATCHED_FIELDS, IngestSource
+
+if TYPE_CHECKING:
+    from .base import BaseClient
+    from .fleet import FleetSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored json no longer matches the models.
+SCHEMA_VERSION = 1
+
+INSTALLATIONS = "installations"
+
+TOPOLOGY_MODELS: dict[str, type[BaseModel]] = {
+    INSTALLATIONS: Installation,
+    "outputs": Output,
+    "lights": Light,
+    "sensors": Sensor,
+    "shutters": Shutter,
+    "groupactions": GroupAction,
+    "thermostat_groups": ThermostatGroup,
+    "thermostat_units": ThermostatUnit,
+}
+
+# State is not topology, it is left out of the cache.
+VOLATILE_FIELDS = frozenset(WATCHED_FIELDS)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS devices (
+    installation_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    device_id INTEGER NOT NULL,
+    version TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (installation_id, kind, device_id)
+);
+CREATE TABLE IF NOT EXISTS validations (
+    installation_id INTEGER PRIMARY KEY,
+    validated_at REAL NOT NULL
+);
+"""
+
+
+class TopologyCache:
+    """SQLite cache of the devices of installations, without their state.
+
+    warm_start loads the cached devices into the state store of a client
+    and revalidates them with a fleet refresh in the background. Devices
+    are only rewritten when their `_version` changed.
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        """Init the TopologyCache object.
+
+        Args:
+            path: database file, created when missing
+        """
+        self.path = os.fspath(path)
+        self.revalidation: asyncio.Task | None = None
+        self._lock = threading.Lock()
+        self._migrate()
+
+    def load(
+        self, installation_ids: Iterable[int] | None = None
+    ) -> dict[int, InstallationSnapshot]:
+        """Load the cached installations.
+
+        Args:
+            installation_ids: only load these installations
+
+        Returns:
+            snapshot per installation id, devices have no status; taken_at
+            is the time of the last revalidation
+        """
+        query = "SELECT installation_id, kind, data FROM devices"
+        params: tuple[int, ...] = ()
+        if installation_ids is not None:
+            params = tuple(installation_ids)
+            query += f" WHERE installation_id IN ({','.join('?' * len(params))})"
+        query += " ORDER BY installation_id, kind, device_id"
+
+        with self._lock, closing(self._connect()) as conn:
+            rows = conn.execute(query, params).fetchall()
+            validated = dict(
+                conn.execute("SELECT installation_id, validated_at FROM validations")
+            )
+
+        collections: dict[int, dict[str, list[Any]]] = {}
+        for installation_id, kind, data in rows:
+            model = TOPOLOGY_MODELS.get(kind)
+            if model is None:
+                continue
+            collections.setdefault(installation_id, {}).setdefault(kind, []).append(
+                construct_model(model, json.loads(data))
+            )
+
+        snapshots = {}
+        for installation_id, kinds in collections.items():
+            installations = kinds.pop(INSTALLATIONS, [None])
+            snapshots[installation_id] = InstallationSnapshot(
+                installation_id=installation_id,
+                installation=installations[0],
+                taken_at=validated.get(installation_id, 0.0),
+                **{kind: tuple(models) for kind, models in kinds.items()},
+            )
+        return snapshots
+
+    def save(
+        self,
+        installation_id: int,
+        kind: str,
+        models: Iterable[Any],
+        complete: bool = False,
+    ) -> int:
+        """Store the devices of a collection whose version changed.
+
+        Args:
+            installation_id: int
+            kind: collection, e.g. "outputs", or "installations"
+            models: pydantic models
+            complete: models is the whole collection, cached devices that
+                are missing are removed
+
+        Returns:
+            number of written and removed devices
+        """
+        with self._lock, closing(self._connect()) as conn, conn:
+            return self._save(conn, installation_id, kind, models, complete)
+
+    def save_snapshot(self, snapshot: InstallationSnapshot) -> int:
+        """Store all collections of a snapshot, replacing the cached ones.
+
+        Args:
+            snapshot: InstallationSnapshot
+
+        Returns:
+            number of written and removed devices
+        """
+        installation_id = snapshot.installation_id
+        changed = 0
+        with self._lock, closing(self._connect()) as conn, conn:
+            if snapshot.installation is not None:
+                changed += self._save(
+                    conn, installation_id, INSTALLATIONS, [snapshot.installation]
+                )
+            for kind in COLLECTIONS:
+                changed += self._save(
+                    conn, installation_id, kind, getattr(snapshot, kind), True
+                )
+            conn.execute(
+                "INSERT OR REPLACE INTO validations VALUES (?, ?)",
+                (installation_id, snapshot.taken_at or time.time()),
+            )
+        return changed
+
+    def save_fleet(self, fleet: FleetSnapshot, complete: bool = False) -> int:
+        """Store the snapshots of a fleet refresh.
+
+        Installations that failed to refresh keep their cached devices.
+
+        Args:
+            fleet: FleetSnapshot
+            complete: fleet holds all installations of the account, cached
+                installations that are missing are removed
+
+        Returns:
+            number of written and removed devices
+        """
+        changed = sum(
+            self.save_snapshot(snapshot) for snapshot in fleet.snapshots.values()
+        )
+        if complete:
+            known = {installation.idx for installation in fleet.installations}
+            for installation_id in set(self.installation_ids()) - known:
+                self.forget(installation_id)
+                changed += 1
+        return changed
+
+    def installation_ids(self) -> list[int]:
+        """Return the cached installations.
+
+        Returns:
+            installation ids
+        """
+        with self._lock, closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT installation_id FROM devices ORDER BY 1"
+            ).fetchall()
+        return [installation_id for (installation_id,) in rows]
+
+    def forget(self, installation_id: int) -> None:
+        """Remove an installation from the cache.
+
+        Args:
+            installation_id: int
+        """
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute(
+                "DELETE FROM devices WHERE installation_id = ?", (installation_id,)
+            )
+            conn.execute(
+                "DELETE FROM validations WHERE installation_id = ?", (installation_id,)
+            )
+
+    def clear(self) -> None:
+        """Remove all installations from the cache."""
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM devices")
+            conn.execute("DELETE FROM validations")
+
+    async def warm_start(
+        self,
+        client: BaseClient,
+        installation_ids: Iterable[int] | None = None,
+        revalidate: bool = True,
+    ) -> dict[int, InstallationSnapshot]:
+        """Load the cached devices into the state store of a client.
+
+        The devices are available immediately, without status. Their state
+        and any topology change arrive with the revalidation, which runs
+        as a background task in self.revalidation.
+
+        Args:
+            client: BaseClient
+            installation_ids: only load and revalidate these installations
+            revalidate: start the background revalidation
+
+        Returns:
+            cached snapshot per installation id
+        """
+        if installation_ids is not None:
+            installation_ids = list(installation_ids)
+        snapshots = await asyncio.get_running_loop().run_in_executor(
+            None, self.load, installation_ids
+        )
+        for snapshot in snapshots.values():
+            client.state.ingest_snapshot(snapshot, IngestSource.CACHE)
+
+        if revalidate:
+            self.revalidation = asyncio.ensure_future(
+                self.revalidate(client, installation_ids)
+            )
+        return snapshots
+
+    async def revalidate(
+        self, client: BaseClient, installation_ids: Iterable[int] | None = None
+    ) -> FleetSnapshot:
+        """Refresh the installations and update the cache.
+
+        The refresh feeds the state store of the client as usual.
+
+        Args:
+            client: BaseClient
+            installation_ids: only refresh these installations, all
+                installations of the account when omitted
+
+        Returns:
+            FleetSnapshot
+        """
+        installations = await client.installations.get_all()
+        complete = installation_ids is None
+        if not complete:
+            wanted = set(installation_ids)  # type: ignore
+            installations = [i for i in installations if i.idx in wanted]
+
+        fleet = await client.fleet.get_by_installations(installations)
+        changed = await asyncio.get_running_loop().run_in_executor(
+            None, self.save_fleet, fleet, complete
+        )
+        logger.debug(
+            "Revalidated %d installations, %d devices changed, %d failed",
+            len(fleet.snapshots),
+            changed,
+            len(fleet.errors),
+        )
+        return fleet
+
+    def _save(
+        self,
+        conn: sqlite3.Connection,
+        installation_id: int,
+        kind: str,
+        models: Iterable[Any],
+        complete: bool = False,
+    ) -> int:
+        """Store the devices whose version changed within a transaction.
+
+        Args:
+            conn: sqlite3.Connection
+            installation_id: int
+            kind: collection
+            models: pydantic models
+            complete: remove cached devices that are missing
+
+        Returns:
+            number of written and removed devices
+        """
+        models = list(models)
+        versions = dict(
+            conn.execute(
+                "SELECT device_id, version FROM devices "
+                "WHERE installation_id = ? AND kind = ?",
+                (installation_id, kind),
+            )
+        )
+        rows = [
+            (
+                installation_id,
+                kind,
+                model.idx,
+                model.version,
+                model.json(by_alias=True, exclude=VOLATILE_FIELDS),
+            )
+            for model in models
+            # Devices without a version are always rewritten.
+            if model.version is None or versions.get(model.idx) != model.version
+        ]
+        conn.executemany("INSERT OR REPLACE INTO devices VALUES (?, ?, ?, ?, ?)", rows)
+
+        removed: list[tuple[int, str, int]] = []
+        if complete:
+            present = {model.idx for model in models}
+            removed = [
+                (installation_id, kind, device_id)
+                for device_id in versions
+                if device_id not in present
+            ]
+            conn.executemany(
+                "DELETE FROM devices "
+                "WHERE installation_id = ? AND kind = ? AND device_id = ?",
+                removed,
+            )
+        return len(rows) + len(removed)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database.
+
+        Returns:
+            sqlite3.Connection
+        """
+        return sqlite3.connect(self.path)
+
+    def _migrate(self) -> None:
+        """Create the tables, dropping a cache of another schema version."""
+        with self._lock, closing(self._connect()) as conn, conn:
+            (version,) = conn.execute("PRAGMA user_version").fetchone()
+            if version != SCHEMA_VERSION:
+                conn.execute("DROP TABLE IF EXISTS devices")
+                conn.execute("DROP TABLE IF EXISTS validations")
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.executescript(SCHEMA)
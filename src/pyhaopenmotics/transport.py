@@ -0,0 +1,59 @@
+"""Module containing helpers to configure the httpx transport."""
+from __future__ import annotations
+
+from httpx import AsyncHTTPTransport, Limits
+
+from .const import (
+    DEFAULT_KEEPALIVE_EXPIRY,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+)
+
+
+def create_limits(
+    max_connections: int | None = DEFAULT_MAX_CONNECTIONS,
+    max_keepalive_connections: int | None = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry: float | None = DEFAULT_KEEPALIVE_EXPIRY,
+) -> Limits:
+    """Create the connection pool limits.
+
+    Args:
+        max_connections: maximum number of concurrent connections
+        max_keepalive_connections: maximum number of idle connections kept open
+        keepalive_expiry: seconds an idle connection is kept open
+
+    Returns:
+        httpx Limits
+    """
+    return Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry,
+    )
+
+
+def create_shared_transport(
+    limits: Limits | None = None,
+    http2: bool = False,
+    retries: int = 0,
+) -> AsyncHTTPTransport:
+    """Create a transport that can be shared between several clients.
+
+    Pass the returned transport as `transport=` to every CloudClient or
+    LocalGatewayClient that should use the same connection pool. The clients
+    do not close a transport that was handed to them, the owner has to call
+    `aclose()` on it when all clients are done.
+
+    Args:
+        limits: connection pool limits, see create_limits
+        http2: enable HTTP/2 multiplexing (requires the h2 package)
+        retries: number of connection retries on connect errors
+
+    Returns:
+        httpx AsyncHTTPTransport
+    """
+    return AsyncHTTPTransport(
+        limits=limits or create_limits(),
+        http2=http2,
+        retries=retries,
+    )
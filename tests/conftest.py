@@ -0,0 +1,92 @@
+"""Fixtures for the pyhaopenmotics tests."""
+from __future__ import annotations
+
+import json
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Union
+
+import httpx
+import pytest
+
+from pyhaopenmotics import CloudClient
+
+TOKEN_URL_SUFFIX = "/authentication/oauth2/token"  # noqa: S105
+TOKEN = {
+    "access_token": "12345",  # noqa: S105
+    "token_type": "bearer",  # noqa: S105
+    "expires_in": 3600,
+}
+
+# Handlers may be plain or coroutine functions, as in httpx.MockTransport.
+Handler = Callable[[httpx.Request], Union[httpx.Response, Awaitable[httpx.Response]]]
+
+
+class Clock:
+    """Controllable monotonic clock, advanced by its sleep."""
+
+    def __init__(self) -> None:
+        """Init the Clock object."""
+        self.now = 1000.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+    async def sleep(self, delay: float) -> None:
+        """Record the delay and advance the clock by it."""
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+def json_response(data: Any, status_code: int = 200) -> httpx.Response:
+    """Return a json response.
+
+    Args:
+        data: decoded json body
+        status_code: http status
+
+    Returns:
+        httpx Response
+    """
+    response = httpx.Response(
+        status_code,
+        content=json.dumps(data).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    # Error handling reads the duration, set by the network layer.
+    response.elapsed = timedelta(0)
+    return response
+
+
+@pytest.fixture
+def clock() -> Clock:
+    """Return a clock to inject or patch into the code under test."""
+    return Clock()
+
+
+@pytest.fixture
+def make_client() -> Callable[..., CloudClient]:
+    """Return a factory of clients answering requests with a handler.
+
+    Token requests are answered with TOKEN, all other requests are passed
+    to the handler.
+
+    Returns:
+        factory taking the handler and the client arguments
+    """
+
+    def factory(handler: Handler, **kwargs: Any) -> CloudClient:
+        def dispatch(request: httpx.Request) -> Any:
+            if request.url.path.endswith(TOKEN_URL_SUFFIX):
+                return json_response(TOKEN)
+            return handler(request)
+
+        return CloudClient(
+            client_id="abc",
+            client_secret="abc",
+            transport=httpx.MockTransport(dispatch),
+            **kwargs,
+        )
+
+    return factory
@@ -0,0 +1,111 @@
+"""Sample device json, shared by the tests and the benchmarks."""
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from pydantic import BaseModel
+
+from pyhaopenmotics.models.groupaction import GroupAction
+from pyhaopenmotics.models.installation import Installation
+from pyhaopenmotics.models.output import Output
+from pyhaopenmotics.models.sensor import Sensor
+from pyhaopenmotics.models.shutter import Shutter
+from pyhaopenmotics.models.thermostats import ThermostatGroup, ThermostatUnit
+
+
+def location(idx: int) -> dict[str, Any]:
+    """Return one of a few locations, as in a real installation."""
+    return {
+        "floor_coordinates": {"x": None, "y": None},
+        "installation_id": 21,
+        "gateway_id": 408,
+        "floor_id": idx % 3,
+        "room_id": idx % 40,
+    }
+
+
+# Json of device idx as returned by the API, per model. Some values are of
+# another type than the field (e.g. an int for a float) to exercise coercion.
+SAMPLES: dict[type[BaseModel], Callable[[int], dict[str, Any]]] = {
+    Output: lambda idx: {
+        "id": idx,
+        "local_id": idx % 256,
+        "name": f"output{idx % 256}",
+        "type": "OUTLET",
+        "capabilities": ["ON_OFF", "RANGE"],
+        "location": location(idx),
+        "metadata": None,
+        "status": {"on": idx % 2 == 0, "locked": False, "manual_override": False},
+        "last_state_change": 1633099611.275243,
+        "_version": 1.0,
+    },
+    Sensor: lambda idx: {
+        "id": idx,
+        "local_id": idx % 256,
+        "name": f"sensor{idx % 256}",
+        "location": location(idx),
+        "physical_quantity": "temperature",
+        "status": {
+            "temperature": 20.0 + idx % 8 / 2,
+            "humidity": None,
+            "brightness": 3,
+        },
+        "last_state_change": 1633099611,
+        "_version": "1.0",
+    },
+    Shutter: lambda idx: {
+        "id": idx,
+        "local_id": idx % 256,
+        "name": f"shutter{idx % 256}",
+        "type": "SHUTTER",
+        "capabilities": ["UP_DOWN", "POSITION"],
+        "status": {
+            "state": "UP",
+            "position": 0,
+            "last_change": 1633099611.2,
+            "locked": False,
+        },
+        "location": location(idx),
+        "attributes": {"azimuth": None, "compass_point": "N"},
+        "configuration": {"steps": 100, "timer_up": 30, "timer_down": 30},
+        "_version": 1.0,
+    },
+    GroupAction: lambda idx: {
+        "id": idx,
+        "local_id": idx,
+        "name": f"scene{idx}",
+        "actions": [0, idx, 1, idx],
+        "location": {"installation_id": 21},
+        "_version": 1.0,
+    },
+    ThermostatGroup: lambda idx: {
+        "id": idx,
+        "local_id": idx,
+        "name": f"group{idx}",
+        "location": {"installation_id": 21},
+        "status": {"mode": "HEATING", "state": True},
+        "_version": 1.0,
+        "_acl": {"set_state": {"allowed": True}, "set_mode": {"allowed": False}},
+        "thermostat_ids": {"heating": [1, 2], "cooling": []},
+    },
+    ThermostatUnit: lambda idx: {
+        "id": idx,
+        "local_id": idx,
+        "name": f"unit{idx}",
+        "location": {"thermostat_group_id": 1, "installation_id": 21},
+        "status": {"actual_temperature": 20, "current_setpoint": 21.5},
+        "_version": 1.0,
+    },
+    Installation: lambda idx: {
+        "id": idx,
+        "name": f"installation{idx}",
+        "description": "",
+        "gateway_model": "openmotics",
+        "_acl": {"configure": {"allowed": True}, "view": {"allowed": True}},
+        "_version": 1.0,
+        "user_role": {"role": "ADMIN", "user_id": 1},
+        "network": {"local_ip_address": "172.16.1.25"},
+        "flags": {},
+        "features": {"outputs": {"available": True}},
+    },
+}
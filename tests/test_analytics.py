@@ -0,0 +1,129 @@
+"""Tests of the columnar sensor analytics."""
+from __future__ import annotations
+
+import math
+from typing import Any
+
+import pytest
+
+from pyhaopenmotics import SensorFrame
+from pyhaopenmotics.analytics import MISSING_ID
+from pyhaopenmotics.models.sensor import Sensor
+from pyhaopenmotics.snapshot import InstallationSnapshot
+
+np = pytest.importorskip("numpy")
+
+
+def sensor(
+    idx: int,
+    temperature: float | None,
+    room_id: int | None = 1,
+    floor_id: int | None = 0,
+    installation_id: int | None = 21,
+) -> Sensor:
+    """Return a sensor with a temperature in a room."""
+    data: dict[str, Any] = {
+        "id": idx,
+        "local_id": idx,
+        "status": {"temperature": temperature, "humidity": None},
+    }
+    if room_id is not None or installation_id is not None:
+        data["location"] = {
+            "installation_id": installation_id,
+            "floor_id": floor_id,
+            "room_id": room_id,
+        }
+    return Sensor.parse_obj(data)
+
+
+def test_frame_columns() -> None:
+    """Missing ids become MISSING_ID, missing readings NaN."""
+    frame = SensorFrame.from_sensors(
+        [sensor(1, 20.5), sensor(2, None, room_id=None, installation_id=None)],
+        installation_id=22,
+    )
+
+    assert len(frame) == 2
+    assert frame.ids.tolist() == [1, 2]
+    assert frame.installation_ids.tolist() == [21, 22]
+    assert frame.room_ids.tolist() == [1, MISSING_ID]
+    assert frame.floor_ids.tolist() == [0, MISSING_ID]
+    assert frame.temperature[0] == 20.5
+    assert np.isnan(frame.temperature[1])
+    assert np.isnan(frame.humidity).all()
+
+
+def test_aggregate_per_room() -> None:
+    """Rooms are grouped per installation, NaN readings are skipped."""
+    frame = SensorFrame.from_sensors(
+        [
+            sensor(1, 20.0),
+            sensor(2, 22.0),
+            sensor(3, None),
+            sensor(4, 18.0, room_id=2),
+            sensor(5, None, room_id=3),
+            # Room 1 of another installation is another room.
+            sensor(6, 30.0, installation_id=22),
+        ]
+    )
+    stats = frame.aggregate("temperature")
+
+    assert stats.keys.tolist() == [[21, 1], [21, 2], [21, 3], [22, 1]]
+    assert stats.count.tolist() == [2, 1, 0, 1]
+    assert stats.to_dict("min") == {
+        (21, 1): 20.0,
+        (21, 2): 18.0,
+        (21, 3): pytest.approx(math.nan, nan_ok=True),
+        (22, 1): 30.0,
+    }
+    assert stats.mean.tolist()[:2] == [21.0, 18.0]
+    assert np.isnan(stats.mean[2])
+    assert stats.max.tolist()[0] == 22.0
+
+
+def test_aggregate_per_floor_and_installation() -> None:
+    """Floors and installations group the rooms on them."""
+    frame = SensorFrame.from_sensors(
+        [
+            sensor(1, 20.0, room_id=1, floor_id=0),
+            sensor(2, 24.0, room_id=2, floor_id=0),
+            sensor(3, 18.0, room_id=3, floor_id=1),
+            sensor(4, 30.0, installation_id=22),
+        ]
+    )
+
+    assert frame.aggregate("temperature", by="floor").to_dict() == {
+        (21, 0): 22.0,
+        (21, 1): 18.0,
+        (22, 0): 30.0,
+    }
+    by_installation = frame.aggregate("temperature", by="installation")
+    assert by_installation.to_dict("count") == {21: 3, 22: 1}
+    assert len(by_installation) == 2
+
+
+def test_frames_from_snapshots() -> None:
+    """Snapshots are concatenated, sensors default to their installation."""
+    frame = SensorFrame.from_snapshots(
+        [
+            InstallationSnapshot(21, sensors=(sensor(1, 20.0),)),
+            InstallationSnapshot(
+                22, sensors=(sensor(1, 19.0, room_id=None, installation_id=None),)
+            ),
+            InstallationSnapshot(23),
+        ]
+    )
+
+    assert frame.installation_ids.tolist() == [21, 22]
+    assert frame.temperature.tolist() == [20.0, 19.0]
+    assert len(SensorFrame.from_snapshots([])) == 0
+    assert len(SensorFrame.from_sensors([]).aggregate("humidity")) == 0
+
+
+def test_unknown_reading_or_grouping() -> None:
+    """Aggregating an unknown reading or grouping raises ValueError."""
+    frame = SensorFrame.from_sensors([sensor(1, 20.0)])
+    with pytest.raises(ValueError):
+        frame.aggregate("pressure")
+    with pytest.raises(ValueError):
+        frame.aggregate("temperature", by="gateway")
@@ -0,0 +1,125 @@
+"""Tests of the response cache."""
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from pyhaopenmotics import ResponseCache
+from pyhaopenmotics.cache import invalidation_scopes, parse_path
+
+from .conftest import Clock, json_response
+
+
+@pytest.fixture
+def clock(monkeypatch, clock: Clock) -> Clock:
+    """Return the clock, patched into the cache."""
+    monkeypatch.setattr("pyhaopenmotics.cache.time.monotonic", clock)
+    return clock
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        ("/base/installations", (None, "installations")),
+        ("/base/installations/1", (1, "installations")),
+        ("/base/installations/1/outputs", (1, "outputs")),
+        ("/base/installations/1/outputs/2/turn_on", (1, "outputs")),
+        ("/authentication/oauth2/token", (None, None)),
+    ],
+)
+def test_parse_path(path, expected) -> None:
+    """Paths are split into installation and resource."""
+    assert parse_path(path) == expected
+
+
+def test_commands_invalidate_related_resources() -> None:
+    """A command invalidates the collections it changes."""
+    assert invalidation_scopes("/base/installations/1/outputs/2/turn_on") == {
+        (1, "outputs"),
+        (1, "lights"),
+    }
+    assert invalidation_scopes("/base/installations/1/shutters/2/up") == {
+        (1, "shutters")
+    }
+
+
+def test_entries_expire_after_their_ttl(clock) -> None:
+    """Entries are served until their ttl passed."""
+    cache = ResponseCache(ttls={"sensors": 2.0})
+    cache.set("sensors", "/base/installations/1/sensors", {"data": []}, 10)
+    cache.set("outputs", "/base/installations/1/outputs", {"data": [1]}, 10)
+
+    clock.now += 2.5
+    assert cache.get("sensors") is None
+    assert cache.get("outputs") == {"data": [1]}
+    assert cache.size == 10
+
+
+def test_zero_ttl_is_not_cached(clock) -> None:
+    """Resources with a zero ttl are not cached."""
+    cache = ResponseCache(ttls={"sensors": 0})
+    cache.set("sensors", "/base/installations/1/sensors", {"data": []}, 10)
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entries_are_evicted(clock) -> None:
+    """The least recently used entries are evicted beyond the limits."""
+    cache = ResponseCache(max_entries=2, max_bytes=100)
+    cache.set("a", "/base/installations/1/outputs", "a", 10)
+    cache.set("b", "/base/installations/2/outputs", "b", 10)
+    cache.get("a")
+    cache.set("c", "/base/installations/3/outputs", "c", 10)
+    assert cache.get("b") is None
+    assert cache.get("a") == "a"
+
+    cache.set("d", "/base/installations/4/outputs", "d", 95)
+    assert len(cache) == 1
+    assert cache.size == 95
+    cache.set("e", "/base/installations/5/outputs", "e", 101)
+    assert cache.get("e") is None
+
+
+def test_invalidate_removes_the_scope(clock) -> None:
+    """Invalidating a path removes the entries of its scope."""
+    cache = ResponseCache()
+    cache.set("outputs", "/base/installations/1/outputs", "outputs", 1)
+    cache.set("lights", "/base/installations/1/lights", "lights", 1)
+    cache.set("other", "/base/installations/2/outputs", "other", 1)
+
+    cache.invalidate("/base/installations/1/outputs/3/toggle")
+    assert cache.get("outputs") is None
+    assert cache.get("lights") is None
+    assert cache.get("other") == "other"
+
+
+def test_response_racing_a_command_is_not_cached(clock) -> None:
+    """A response started before a command is not stored."""
+    cache = ResponseCache()
+    path = "/base/installations/1/outputs"
+    generation = cache.generation(path)
+    cache.invalidate(f"{path}/3/toggle")
+    cache.set("outputs", path, "stale", 1, generation)
+    assert cache.get("outputs") is None
+
+
+@pytest.mark.asyncio
+async def test_client_caches_gets_until_a_command(make_client) -> None:
+    """The client serves cached GETs until a command is sent."""
+    gets = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal gets
+        if request.method == "GET":
+            gets += 1
+            return json_response({"data": [gets]})
+        return json_response({})
+
+    async with make_client(handler, cache=ResponseCache()) as client:
+        await client.get_token()
+        path = "/base/installations/1/lights"
+        assert await client.get(path) == {"data": [1]}
+        assert await client.get(path) == {"data": [1]}
+
+        await client.post("/base/installations/1/outputs/2/turn_off")
+        assert await client.get(path) == {"data": [2]}
+    assert gets == 2
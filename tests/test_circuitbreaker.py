@@ -0,0 +1,171 @@
+"""Tests of the circuit breaker."""
+# pylint: disable=protected-access
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from pyhaopenmotics import CircuitBreaker, CircuitOpenException, RequestPolicy
+from pyhaopenmotics.circuitbreaker import CircuitState
+from pyhaopenmotics.errors import (
+    ApiException,
+    NetworkException,
+    RequestClientException,
+    RequestServerException,
+)
+
+from .conftest import json_response
+
+PATH = "/base/installations"
+
+
+def failure() -> NetworkException:
+    """Return a failure that counts towards opening the circuit."""
+    return NetworkException("down", None, None)
+
+
+def open_breaker(reset_timeout: float = 0.0) -> CircuitBreaker:
+    """Return a breaker opened by one failure."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=reset_timeout)
+    breaker.before_request()
+    breaker.record(failure())
+    return breaker
+
+
+def test_opens_after_consecutive_failures() -> None:
+    """The circuit opens at the failure threshold."""
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    for _ in range(2):
+        breaker.before_request()
+        breaker.record(failure())
+    assert breaker.state == CircuitState.CLOSED
+
+    breaker.before_request()
+    breaker.record(failure())
+    assert breaker.state == CircuitState.OPEN
+    with pytest.raises(CircuitOpenException):
+        breaker.before_request()
+
+
+def test_success_resets_failure_count() -> None:
+    """A success resets the consecutive failures."""
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record(failure())
+    breaker.record(None)
+    breaker.record(failure())
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_client_errors_do_not_count() -> None:
+    """4xx errors don't count as failures."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record(RequestClientException("bad request", None, None))
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_half_open_lets_one_probe_through() -> None:
+    """A half open circuit lets one probe through."""
+    breaker = open_breaker()
+    assert breaker.state == CircuitState.HALF_OPEN
+
+    assert breaker.before_request() is True
+    with pytest.raises(CircuitOpenException):
+        breaker.before_request()
+
+    breaker.record(None)
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.before_request() is False
+
+
+def test_failed_probe_reopens() -> None:
+    """A failed probe opens the circuit again."""
+    breaker = open_breaker(reset_timeout=60)
+    breaker._opened_at -= 60
+    assert breaker.before_request() is True
+
+    breaker.record(RequestServerException("unavailable", None, None))
+    assert breaker.state == CircuitState.OPEN
+    with pytest.raises(CircuitOpenException):
+        breaker.before_request()
+
+
+def test_released_probe_lets_another_request_probe() -> None:
+    """A released probe lets the next request probe."""
+    breaker = open_breaker()
+    assert breaker.before_request() is True
+    breaker.release()
+    assert breaker.before_request() is True
+
+
+def test_cancelled_probe_lets_another_request_probe() -> None:
+    """A cancelled probe lets the next request probe."""
+    breaker = open_breaker()
+    breaker.before_request()
+    breaker.record(asyncio.CancelledError())
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.before_request() is True
+
+
+@pytest.mark.asyncio
+async def test_probe_failing_before_send_does_not_lock_out(make_client, monkeypatch):
+    """A probe failing before it is sent releases the probe."""
+    healthy = False
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if not healthy:
+            return json_response({}, 503)
+        return json_response({"data": []})
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    client = make_client(
+        handler, circuit_breaker=breaker, policy=RequestPolicy(max_attempts=1)
+    )
+    async with client:
+        await client.get_token()
+        with pytest.raises(RequestServerException):
+            await client.get(PATH)
+
+        async def failing_token() -> None:
+            raise ApiException("token refresh failed", None, None)
+
+        with monkeypatch.context() as patch:
+            patch.setattr(client, "_ensure_token", failing_token)
+            with pytest.raises(ApiException):
+                await client.get(PATH)
+
+        healthy = True
+        assert await client.get(PATH) == {"data": []}
+        assert breaker.state == CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_probe_cancelled_before_send_does_not_lock_out(make_client):
+    """A probe cancelled before it is sent releases the probe."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        return json_response({"data": []})
+
+    class StuckLimiter:
+        """Rate limiter that never grants a request."""
+
+        async def acquire(self, path: str) -> None:
+            await asyncio.Event().wait()
+
+    breaker = open_breaker()
+    # Without coalescing, cancelling the caller cancels the request itself.
+    client = make_client(
+        handler,
+        circuit_breaker=breaker,
+        policy=RequestPolicy(max_attempts=1),
+        coalesce_requests=False,
+    )
+    async with client:
+        await client.get_token()
+        client._rate_limiter = StuckLimiter()
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(client.get(PATH), 0.05)
+
+        client._rate_limiter = None
+        assert await client.get(PATH) == {"data": []}
+        assert breaker.state == CircuitState.CLOSED
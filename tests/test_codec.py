@@ -0,0 +1,50 @@
+"""Tests of the JSON codecs."""
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from pyhaopenmotics.codec import JsonCodec, OrjsonCodec, default_codec, orjson
+
+from .conftest import json_response
+
+PAYLOAD = {
+    "data": [
+        {"id": 1, "name": "kitchen é", "status": {"on": True, "value": 55.5}},
+        {"id": 2, "name": None, "capabilities": []},
+    ]
+}
+
+needs_orjson = pytest.mark.skipif(orjson is None, reason="orjson is not installed")
+
+
+@needs_orjson
+def test_orjson_matches_stdlib() -> None:
+    """Both codecs encode to the same bytes and decode to the same objects."""
+    stdlib, fast = JsonCodec(), OrjsonCodec()
+    assert fast.dumps(PAYLOAD) == stdlib.dumps(PAYLOAD)
+    assert fast.loads(stdlib.dumps(PAYLOAD)) == PAYLOAD
+    assert stdlib.loads(fast.dumps(PAYLOAD)) == PAYLOAD
+    assert isinstance(default_codec(), OrjsonCodec)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "codec", [JsonCodec(), pytest.param("orjson", marks=needs_orjson)]
+)
+async def test_client_encodes_and_decodes_with_codec(make_client, codec) -> None:
+    """The client sends and reads bodies with its codec."""
+    if codec == "orjson":
+        codec = OrjsonCodec()
+    bodies = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(request.content)
+        return json_response(PAYLOAD)
+
+    async with make_client(handler, codec=codec) as client:
+        await client.get_token()
+        result = await client.post("/base/installations/1/outputs", json=PAYLOAD)
+
+    assert result == PAYLOAD
+    assert bodies == [JsonCodec().dumps(PAYLOAD)]
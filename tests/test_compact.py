@@ -0,0 +1,83 @@
+"""Tests of the compact device models."""
+from __future__ import annotations
+
+from pyhaopenmotics.models.compact import (
+    STABLE_TYPES,
+    CompactLocation,
+    CompactOutputStatus,
+    Interner,
+    from_compact,
+    to_compact,
+)
+from pyhaopenmotics.models.output import Output
+
+from .samples import SAMPLES, location
+
+
+def output(idx: int, on: bool = False) -> Output:
+    """Return an output in room 1."""
+    data = SAMPLES[Output](idx)
+    data["location"] = location(1)
+    data["status"]["on"] = on
+    return Output.parse_obj(data)
+
+
+def test_round_trip() -> None:
+    """A compact model converts back to an equal model."""
+    model = output(1, on=True)
+    assert from_compact(to_compact(model, Interner())) == model
+
+
+def test_stable_values_are_shared() -> None:
+    """Equal locations and capabilities are one object."""
+    interner = Interner()
+    first = to_compact(output(1), interner)
+    second = to_compact(output(2), interner)
+
+    assert first.location is second.location
+    assert first.capabilities is second.capabilities
+    assert first.name is not second.name
+
+
+def test_statuses_are_not_shared_by_default() -> None:
+    """Statuses change often and are not interned by default."""
+    interner = Interner()
+    for idx in range(10):
+        to_compact(output(idx, on=idx % 2 == 0), interner)
+    first = to_compact(output(1), interner)
+    second = to_compact(output(2), interner)
+
+    assert first.status == second.status
+    assert first.status is not second.status
+    # The floor coordinates, the location and the capabilities.
+    assert len(interner) == 3
+
+
+def test_statuses_are_shared_when_asked() -> None:
+    """Statuses are interned when their type is added."""
+    interner = Interner(types=STABLE_TYPES | {CompactOutputStatus})
+    first = to_compact(output(1), interner)
+    second = to_compact(output(2), interner)
+    assert first.status is second.status
+
+
+def test_least_recently_used_values_are_forgotten() -> None:
+    """The interner drops the least recently used values."""
+    interner = Interner(max_entries=2)
+    locations = [CompactLocation(room_id=room_id) for room_id in range(3)]
+    interner(locations[0])
+    interner(locations[1])
+    interner(locations[0])
+    interner(locations[2])
+
+    assert len(interner) == 2
+    assert interner(CompactLocation(room_id=0)) is locations[0]
+    assert interner(CompactLocation(room_id=1)) is not locations[1]
+
+
+def test_unhashable_values_are_not_interned() -> None:
+    """Unhashable values are returned as they are."""
+    interner = Interner()
+    value = ({"a": 1},)
+    assert interner(value) is value
+    assert len(interner) == 0
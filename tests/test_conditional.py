@@ -0,0 +1,68 @@
+"""Tests of the conditional GET requests."""
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from pyhaopenmotics.conditional import ValidatorStore
+
+from .conftest import json_response
+
+PATH = "/base/installations/21/outputs"
+ETAG = '"v1"'
+LAST_MODIFIED = "Wed, 21 Oct 2015 07:28:00 GMT"
+OUTPUTS = {"data": [{"id": 1, "local_id": 1, "name": "kitchen"}]}
+
+
+def validated_response(status_code: int = 200) -> httpx.Response:
+    """Return the outputs with validators, or an empty 304."""
+    if status_code == 304:
+        response = json_response(None, 304)
+        response.headers["ETag"] = ETAG
+        return response
+    response = json_response(OUTPUTS)
+    response.headers["ETag"] = ETAG
+    response.headers["Last-Modified"] = LAST_MODIFIED
+    return response
+
+
+def test_store_keeps_only_responses_with_validators() -> None:
+    """Responses without ETag or Last-Modified are not stored."""
+    store = ValidatorStore(max_entries=1)
+    store.store("plain", json_response(OUTPUTS), OUTPUTS)
+    assert store.headers("plain") == {}
+
+    store.store("a", validated_response(), OUTPUTS)
+    assert store.headers("a") == {
+        "If-None-Match": ETAG,
+        "If-Modified-Since": LAST_MODIFIED,
+    }
+    store.store("b", validated_response(), {"data": []})
+    assert len(store) == 1
+    assert store.headers("a") == {}
+
+
+@pytest.mark.asyncio
+async def test_not_modified_returns_stored_body(make_client) -> None:
+    """The second GET revalidates and reuses the body on 304."""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("If-None-Match") == ETAG:
+            return validated_response(304)
+        return validated_response()
+
+    async with make_client(handler, conditional_requests=True) as client:
+        await client.get_token()
+        first = await client.get(PATH)
+        second = await client.get(PATH)
+        outputs = await client.outputs.get_all(21)
+        again = await client.outputs.get_all(21)
+
+    assert first == second == OUTPUTS
+    assert "If-None-Match" not in requests[0].headers
+    assert requests[1].headers["If-None-Match"] == ETAG
+    assert requests[1].headers["If-Modified-Since"] == LAST_MODIFIED
+    # The models parsed from the stored body are reused as well.
+    assert outputs[0] is again[0]
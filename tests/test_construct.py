@@ -0,0 +1,61 @@
+"""Tests of building models from trusted data."""
+from __future__ import annotations
+
+from typing import Any, List
+
+import pytest
+from pydantic import BaseModel, ValidationError, parse_obj_as
+
+from pyhaopenmotics.construct import construct_model, construct_obj_as
+from pyhaopenmotics.models.output import Output
+
+from .samples import SAMPLES
+
+
+def assert_equivalent(validated: BaseModel, constructed: BaseModel) -> None:
+    """Assert that both parsing paths built the same model."""
+    assert type(validated) is type(constructed)
+    assert validated == constructed
+    assert validated.__fields_set__ == constructed.__fields_set__
+    assert validated.dict(by_alias=True) == constructed.dict(by_alias=True)
+
+
+@pytest.mark.parametrize("model", list(SAMPLES), ids=lambda model: model.__name__)
+def test_construct_matches_validation(model: type[BaseModel]) -> None:
+    """Trusted parsing builds the same models as validation."""
+    data = [SAMPLES[model](idx) for idx in range(20)]
+    type_ = List[model]  # type: ignore
+
+    validated = parse_obj_as(type_, data)
+    constructed = construct_obj_as(type_, data)
+    assert len(constructed) == len(validated)
+    for left, right in zip(validated, constructed):
+        assert_equivalent(left, right)
+
+
+@pytest.mark.parametrize(
+    "update",
+    [
+        {"id": "5"},
+        {"status": {"on": 1, "locked": False, "manual_override": False}},
+        {"status": {"on": "yes", "locked": False, "manual_override": False}},
+        {"_version": "1.0"},
+        {"location": None},
+        {"capabilities": None},
+    ],
+)
+def test_construct_coerces_like_validation(update: dict[str, Any]) -> None:
+    """Trusted parsing coerces values as validation does."""
+    data = {**SAMPLES[Output](5), **update}
+    assert_equivalent(Output.parse_obj(data), construct_model(Output, data))
+
+
+def test_construct_validates_invalid_data() -> None:
+    """Invalid data falls back to validation and raises."""
+    data = SAMPLES[Output](5)
+    del data["local_id"]
+    with pytest.raises(ValidationError):
+        construct_model(Output, data)
+
+    with pytest.raises(ValidationError):
+        construct_model(Output, {**SAMPLES[Output](5), "id": "five"})
@@ -0,0 +1,123 @@
+"""Tests of the websocket event stream."""
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+import websockets
+
+from pyhaopenmotics import EventStream
+from pyhaopenmotics.models.output import Output
+
+from .conftest import json_response
+
+OUTPUT = {
+    "id": 5,
+    "local_id": 5,
+    "name": "kitchen",
+    "type": "OUTLET",
+    "capabilities": ["ON_OFF"],
+    "status": {"on": False, "locked": False, "manual_override": False},
+}
+
+
+def output_event(status: dict, installation_id: int = 21) -> str:
+    """Return an output change event as sent by the API."""
+    return json.dumps(
+        {
+            "type": "EVENT",
+            "data": {
+                "type": "OUTPUT_CHANGE",
+                "installation_id": installation_id,
+                "data": {"id": OUTPUT["id"], "status": status},
+            },
+        }
+    )
+
+
+@pytest.fixture
+def client(make_client):
+    """Return a client whose state holds OUTPUT of installation 21."""
+    client = make_client(lambda request: json_response({"data": []}))
+    client.state.ingest(21, "outputs", [Output.parse_obj(OUTPUT)])
+    return client
+
+
+def test_stream_defaults_to_the_events_url(client) -> None:
+    """The websocket url is the events url of the client."""
+    stream = EventStream(client, [21])
+    url = client._get_url("/ws/events")  # pylint: disable=protected-access
+    assert stream.url == url.replace("https", "wss", 1)
+    assert stream.url.startswith("wss://")
+    assert not stream.connected
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "not json",
+        "[1, 2]",
+        '"EVENT"',
+        "5",
+        "null",
+        '{"type": "EVENT", "data": [1]}',
+        '{"type": "EVENT", "data": "OUTPUT_CHANGE"}',
+        '{"type": ["OUTPUT_CHANGE"], "data": {"id": 5}}',
+        '{"type": "OUTPUT_CHANGE", "data": [5]}',
+        '{"type": "OUTPUT_CHANGE", "data": {"id": [5]}}',
+        '{"type": "OUTPUT_CHANGE", "installation_id": {}, "data": {"id": 5}}',
+        b"\xff",
+    ],
+)
+def test_unexpected_messages_are_ignored(client, message) -> None:
+    """Malformed or unknown messages leave the state alone."""
+    stream = EventStream(client, [21], url="ws://127.0.0.1:1")
+    assert stream.handle(message) == []
+    assert client.state.get(21, "outputs", 5).status.on is False
+
+
+def test_event_is_merged_into_state(client) -> None:
+    """An event is merged into the known model."""
+    stream = EventStream(client, [21], url="ws://127.0.0.1:1")
+    changes = stream.handle(output_event({"on": True}).encode())
+
+    assert [change.kind for change in changes] == ["outputs"]
+    output = client.state.get(21, "outputs", 5)
+    assert output.status.on is True
+    assert output.name == "kitchen"
+
+
+@pytest.mark.asyncio
+async def test_stream_survives_unexpected_messages(client) -> None:
+    """The stream keeps its connection after unexpected messages."""
+    connections = []
+    subscriptions = []
+
+    async def server(ws) -> None:
+        connections.append(ws)
+        subscriptions.append(json.loads(await ws.recv()))
+        for message in ("[1, 2]", '{"type": "EVENT", "data": 5}', "null"):
+            await ws.send(message)
+        await ws.send(output_event({"on": True}))
+        await ws.wait_closed()
+
+    async with websockets.serve(server, "127.0.0.1", 0) as ws_server:
+        port = ws_server.sockets[0].getsockname()[1]
+        async with client:
+            await client.get_token()
+            stream = EventStream(client, [21], url=f"ws://127.0.0.1:{port}")
+            stream.start()
+            try:
+                await asyncio.wait_for(stream.wait_connected(), 1)
+                for _ in range(100):
+                    if client.state.get(21, "outputs", 5).status.on:
+                        break
+                    await asyncio.sleep(0.01)
+                assert client.state.get(21, "outputs", 5).status.on is True
+                assert stream.connected
+            finally:
+                await stream.stop()
+
+    assert len(connections) == 1
+    assert subscriptions[0]["data"]["installation_ids"] == [21]
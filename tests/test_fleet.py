@@ -0,0 +1,48 @@
+"""Tests of the fleet-wide refresh."""
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from pyhaopenmotics import RequestPolicy
+from pyhaopenmotics.errors import NetworkTimeoutException, RequestClientException
+from pyhaopenmotics.snapshot import COLLECTIONS
+
+from .conftest import json_response
+
+INSTALLATIONS = [{"id": idx, "name": f"home{idx}"} for idx in (1, 2, 3)]
+
+
+@pytest.mark.asyncio
+async def test_failed_installations_are_reported_not_raised(make_client) -> None:
+    """A failing or slow installation doesn't fail the others."""
+    paths = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/installations"):
+            return json_response({"data": INSTALLATIONS})
+        if "/installations/2/" in path and path.endswith("/outputs"):
+            return json_response({}, 400)
+        if "/installations/3/" in path and path.endswith("/sensors"):
+            await asyncio.Event().wait()
+        paths.append(path)
+        return json_response({"data": []})
+
+    # Without coalescing, the timeout cancels the request itself.
+    client = make_client(
+        handler, policy=RequestPolicy(max_attempts=1), coalesce_requests=False
+    )
+    async with client:
+        await client.get_token()
+        fleet = await client.fleet.get_all(installation_timeout=0.2)
+
+    assert [installation.idx for installation in fleet.installations] == [1, 2, 3]
+    assert list(fleet.snapshots) == [1]
+    assert fleet.snapshots[1].installation == fleet.installations[0]
+    assert isinstance(fleet.errors[2], RequestClientException)
+    assert isinstance(fleet.errors[3], NetworkTimeoutException)
+    assert not fleet.complete
+    assert sum("/installations/1/" in path for path in paths) == len(COLLECTIONS)
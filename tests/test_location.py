@@ -0,0 +1,88 @@
+"""Tests of the interned locations."""
+from __future__ import annotations
+
+import pytest
+from pydantic import ValidationError
+
+from pyhaopenmotics.construct import construct_model
+from pyhaopenmotics.models.location import Location, LocationCache
+from pyhaopenmotics.models.output import Output
+from pyhaopenmotics.models.sensor import Sensor
+from pyhaopenmotics.models.thermostats import ThermostatUnit
+
+from .samples import SAMPLES, location
+
+
+def test_devices_in_one_room_share_the_location() -> None:
+    """Devices of any type in the same room hold one Location object."""
+    output = Output.parse_obj(SAMPLES[Output](1))
+    sensor = Sensor.parse_obj(SAMPLES[Sensor](1))
+    # Same floor and room as device 1.
+    trusted = construct_model(Output, SAMPLES[Output](121))
+    other_room = Output.parse_obj(SAMPLES[Output](2))
+
+    assert isinstance(trusted, Output)
+    assert output.location is sensor.location
+    assert output.location is trusted.location
+    assert other_room.location is not None
+    assert other_room.location is not output.location
+    assert other_room.location.room_id == 2
+
+
+def test_other_installations_and_subclasses_are_kept_apart() -> None:
+    """Equal rooms of other installations or location types aren't shared."""
+    cache = LocationCache()
+    data = location(1)
+    home = cache.intern(Location, data)
+    office = cache.intern(Location, {**data, "installation_id": 22})
+    unit = ThermostatUnit.parse_obj(
+        {"id": 1, "local_id": 1, "location": {**data, "thermostat_group_id": 1}}
+    )
+
+    assert cache.intern(Location, dict(data)) is home
+    assert office is not home
+    assert office.installation_id == 22
+    assert unit.location is not None
+    assert unit.location.thermostat_group_id == 1
+
+
+def test_locations_are_immutable() -> None:
+    """Shared locations can't be changed through one of the devices."""
+    output = Output.parse_obj(SAMPLES[Output](1))
+    assert output.location is not None
+    with pytest.raises(TypeError):
+        output.location.room_id = 5  # type: ignore[misc]
+
+
+def test_invalid_location_is_rejected() -> None:
+    """Invalid locations raise and are not interned."""
+    cache = LocationCache()
+    with pytest.raises(ValidationError):
+        cache.intern(Location, {"room_id": "kitchen"})
+    assert len(cache) == 0
+
+
+def test_cache_registers_floors_and_rooms() -> None:
+    """The floors and rooms of each installation are recorded."""
+    cache = LocationCache()
+    for idx in range(6):
+        cache.intern(Location, location(idx))
+    cache.intern(Location, {"installation_id": 22, "room_id": 9})
+
+    assert cache.floors(21) == [0, 1, 2]
+    assert cache.rooms(21) == [0, 1, 2, 3, 4, 5]
+    assert cache.rooms(21, floor_id=1) == [1, 4]
+    assert cache.floors(22) == []
+    assert cache.rooms(22) == [9]
+
+
+def test_full_cache_starts_over() -> None:
+    """A full cache is cleared, existing locations stay valid."""
+    cache = LocationCache(max_entries=2)
+    first = cache.intern(Location, location(1))
+    cache.intern(Location, location(2))
+    cache.intern(Location, location(3))
+
+    assert len(cache) == 1
+    assert cache.intern(Location, location(1)) is not first
+    assert first.room_id == 1
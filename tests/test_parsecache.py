@@ -0,0 +1,62 @@
+"""Tests of the parse cache."""
+# pylint: disable=protected-access
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from pyhaopenmotics.models.output import Output
+from pyhaopenmotics.parsecache import ParseCache
+
+from .conftest import json_response
+
+
+def outputs_data(name: str) -> list[dict]:
+    """Return the json of outputs 1 and 2."""
+    return [{"id": idx, "local_id": idx, "name": f"{name}{idx}"} for idx in (1, 2)]
+
+
+def test_unchanged_objects_reuse_their_model() -> None:
+    """Identical dicts reuse the model, changed dicts are validated again."""
+    cache = ParseCache(max_entries=10)
+    first = cache.parse(list[Output], outputs_data("a"), scope=21)
+    second = cache.parse(list[Output], outputs_data("a"), scope=21)
+    assert [a is b for a, b in zip(first, second)] == [True, True]
+
+    changed = cache.parse(Output, {"id": 1, "local_id": 1, "name": "b"}, scope=21)
+    assert changed is not first[0]
+    assert changed.name == "b"
+    assert (cache.hits, cache.misses) == (2, 3)
+
+
+def test_scopes_are_cached_apart() -> None:
+    """The same id in another scope is another device."""
+    cache = ParseCache(max_entries=10)
+    home = cache.parse(list[Output], outputs_data("home"), scope=21)
+    office = cache.parse(list[Output], outputs_data("office"), scope=22)
+    assert [output.name for output in office] == ["office1", "office2"]
+    assert cache.parse(list[Output], outputs_data("home"), scope=21) == home
+    assert cache.hits == 2
+    assert len(cache) == 4
+
+
+@pytest.mark.asyncio
+async def test_polling_two_installations_hits_both(make_client) -> None:
+    """Alternating polls of two installations keep hitting the cache."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        installation_id = request.url.path.split("/")[-2]
+        return json_response({"data": outputs_data(f"home{installation_id}")})
+
+    async with make_client(
+        handler, parse_cache=True, coalesce_requests=False
+    ) as client:
+        await client.get_token()
+        first = {idx: await client.outputs.get_all(idx) for idx in (21, 22)}
+        second = {idx: await client.outputs.get_all(idx) for idx in (21, 22)}
+
+    cache = client._parse_cache
+    assert (cache.hits, cache.misses) == (4, 4)
+    for idx in (21, 22):
+        assert [a is b for a, b in zip(first[idx], second[idx])] == [True, True]
+        assert second[idx][0].name == f"home{idx}1"
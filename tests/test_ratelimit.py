@@ -0,0 +1,95 @@
+"""Tests of the client-side rate limiter."""
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from pyhaopenmotics import RateLimiter, RequestPolicy
+from pyhaopenmotics.errors import RequestBackoffException
+from pyhaopenmotics.ratelimit import TokenBucket
+
+from .conftest import Clock, json_response
+
+
+def test_bucket_allows_a_burst_then_paces(clock: Clock) -> None:
+    """A full bucket allows a burst, then paces at the rate."""
+    bucket = TokenBucket(rate=2.0, burst=3, clock=clock)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_bucket_refills_up_to_the_burst(clock: Clock) -> None:
+    """An idle bucket refills, but not beyond the burst."""
+    bucket = TokenBucket(rate=1.0, burst=2, clock=clock)
+    bucket.reserve()
+    bucket.reserve()
+    clock.now += 10
+    assert [bucket.reserve() for _ in range(2)] == [0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+@pytest.mark.asyncio
+async def test_limiter_paces_per_installation(clock: Clock) -> None:
+    """Each installation has its own bucket."""
+    limiter = RateLimiter(
+        rate=100.0,
+        burst=100,
+        installation_rate=1.0,
+        installation_burst=1,
+        clock=clock,
+        sleep=clock.sleep,
+    )
+    await limiter.acquire("/base/installations/1/outputs")
+    await limiter.acquire("/base/installations/2/outputs")
+    assert clock.sleeps == []
+
+    await limiter.acquire("/base/installations/1/outputs")
+    assert clock.sleeps == [pytest.approx(1.0)]
+
+
+@pytest.mark.asyncio
+async def test_limiter_holds_back_after_a_429(clock: Clock) -> None:
+    """Requests wait until the Retry-After of a 429 passed."""
+    limiter = RateLimiter(clock=clock, sleep=clock.sleep)
+    limiter.backoff(3.0)
+    await limiter.acquire("/base/installations")
+    assert clock.sleeps == [pytest.approx(3.0)]
+
+
+@pytest.mark.asyncio
+async def test_client_retries_after_retry_after(make_client) -> None:
+    """The client retries a 429 after its Retry-After."""
+    responses = [429, 200]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        """Answer 429 once, then the installations."""
+        response = json_response({"data": []}, responses.pop(0))
+        response.headers["Retry-After"] = "0"
+        return response
+
+    policy = RequestPolicy(max_attempts=1)
+    async with make_client(
+        handler, rate_limiter=RateLimiter(), policy=policy
+    ) as client:
+        await client.get_token()
+        assert await client.get("/base/installations") == {"data": []}
+    assert not responses
+
+
+@pytest.mark.asyncio
+async def test_client_gives_up_after_max_backoff_retries(make_client) -> None:
+    """The client raises once the 429 retries are used up."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        """Answer 429 to every request."""
+        response = json_response({}, 429)
+        response.headers["Retry-After"] = "0"
+        return response
+
+    limiter = RateLimiter(max_backoff_retries=2)
+    policy = RequestPolicy(max_attempts=1)
+    async with make_client(handler, rate_limiter=limiter, policy=policy) as client:
+        await client.get_token()
+        with pytest.raises(RequestBackoffException):
+            await client.get("/base/installations")
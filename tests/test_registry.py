@@ -0,0 +1,113 @@
+"""Tests of the device registry."""
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from pyhaopenmotics import DeviceRegistry, DeviceStateStore
+from pyhaopenmotics.models.output import Output
+from pyhaopenmotics.snapshot import InstallationSnapshot
+
+from .conftest import json_response
+
+
+def output_data(idx: int, room_id: int = 1, capabilities=("ON_OFF",)) -> dict:
+    """Return the json of an output."""
+    return {
+        "id": idx,
+        "local_id": idx,
+        "name": f"output{idx}",
+        "type": "OUTLET",
+        "capabilities": list(capabilities),
+        "location": {"installation_id": 21, "room_id": room_id, "gateway_id": 408},
+    }
+
+
+def output(idx: int, **kwargs) -> Output:
+    """Return an output."""
+    return Output.parse_obj(output_data(idx, **kwargs))
+
+
+def ids(models) -> list[int]:
+    """Return the ids of models."""
+    return [model.idx for model in models]
+
+
+def test_find_intersects_indexes() -> None:
+    """Finding devices returns those matching every criterion."""
+    registry = DeviceRegistry()
+    registry.update(
+        21,
+        "outputs",
+        [output(1), output(2, capabilities=("RANGE",)), output(3, room_id=2)],
+    )
+
+    assert ids(registry.by_room(21, 1)) == [1, 2]
+    assert ids(registry.find(21, "outputs", room_id=1, capability="RANGE")) == [2]
+    assert ids(registry.by_gateway(408)) == [1, 2, 3]
+    assert registry.values("room") == [(21, 1), (21, 2)]
+    with pytest.raises(ValueError):
+        registry.find(room_id=1)
+
+
+def test_moved_device_is_reindexed() -> None:
+    """A device that moved room leaves the old room index."""
+    registry = DeviceRegistry()
+    registry.update(21, "outputs", [output(1)])
+    registry.update(21, "outputs", [output(1, room_id=2)])
+
+    assert registry.by_room(21, 1) == []
+    assert ids(registry.by_room(21, 2)) == [1]
+    assert registry.values("room") == [(21, 2)]
+
+
+def test_complete_collection_removes_missing_devices() -> None:
+    """Only complete collections remove devices."""
+    state = DeviceStateStore()
+    registry = DeviceRegistry()
+    registry.attach(state)
+    state.ingest(21, "outputs", [output(1), output(2)], complete=True)
+    state.ingest(22, "outputs", [output(1)], complete=True)
+
+    # A partial batch, such as an event, keeps the other devices.
+    state.ingest(21, "outputs", [output(1)])
+    assert len(registry) == 3
+
+    state.ingest(21, "outputs", [output(1)], complete=True)
+    assert registry.get(21, "outputs", 2) is None
+    assert ids(registry.by_capability("ON_OFF")) == [1, 1]
+    assert len(registry) == 2
+
+
+def test_snapshot_replaces_devices() -> None:
+    """A snapshot replaces the devices of its installation."""
+    registry = DeviceRegistry()
+    registry.update(21, "outputs", [output(1), output(2)])
+    registry.update_snapshot(InstallationSnapshot(21, outputs=(output(2),)))
+    assert ids(registry) == [2]
+
+
+@pytest.mark.asyncio
+async def test_get_all_removes_deleted_devices(make_client) -> None:
+    """Unfiltered get_all calls remove deleted devices."""
+    outputs = [output_data(1), output_data(2)]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.params.get("filter"):
+            return json_response({"data": outputs[:1]})
+        return json_response({"data": outputs})
+
+    async with make_client(handler, coalesce_requests=False) as client:
+        await client.get_token()
+        registry = DeviceRegistry()
+        registry.attach(client.state)
+        await client.outputs.get_all(21)
+        assert ids(registry) == [1, 2]
+
+        # A filtered list is not the whole collection.
+        await client.outputs.get_all(21, output_filter="x")
+        assert ids(registry) == [1, 2]
+
+        del outputs[0]
+        await client.outputs.get_all(21)
+        assert ids(registry) == [2]
@@ -0,0 +1,106 @@
+"""Tests of the adaptive poll scheduler."""
+# pylint: disable=protected-access
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from pyhaopenmotics import PollScheduler
+
+from .conftest import json_response
+
+
+def outputs_handler(statuses: list[bool], requests: list[httpx.Request]):
+    """Return a handler answering the outputs with the first status."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        output = {"id": 1, "local_id": 1, "status": {"on": statuses[0]}}
+        return json_response({"data": [output]})
+
+    return handler
+
+
+def scheduler_for(client) -> PollScheduler:
+    """Return a scheduler of the outputs counting the state changes."""
+    scheduler = PollScheduler(
+        client, 21, intervals={"outputs": 10.0}, backoff_factor=2, max_backoff=4
+    )
+    client.state.subscribe(scheduler._on_state_change)
+    return scheduler
+
+
+def test_scheduler_can_be_created_without_a_loop() -> None:
+    """No asyncio objects are created before the scheduler starts."""
+    scheduler = PollScheduler(object(), 21)  # type: ignore[arg-type]
+    scheduler.boost("outputs")
+    assert scheduler._wakeups == {}
+
+
+@pytest.mark.asyncio
+async def test_interval_backs_off_and_resets_on_change(make_client) -> None:
+    """Polls without changes back off up to the maximum, a change resets."""
+    statuses = [False]
+    async with make_client(outputs_handler(statuses, [])) as client:
+        await client.get_token()
+        scheduler = scheduler_for(client)
+
+        # The first poll finds a new device.
+        assert await scheduler.poll("outputs") is True
+        assert scheduler.interval("outputs") == 10.0
+        intervals = []
+        for _ in range(3):
+            assert await scheduler.poll("outputs") is False
+            intervals.append(scheduler.interval("outputs"))
+        assert intervals == [20.0, 40.0, 40.0]
+
+        statuses[0] = True
+        assert await scheduler.poll("outputs") is True
+        assert scheduler.interval("outputs") == 10.0
+
+
+@pytest.mark.asyncio
+async def test_boost_holds_the_base_interval_until_it_ends(make_client) -> None:
+    """The interval doesn't grow while boosted and starts over afterwards."""
+    async with make_client(outputs_handler([False], [])) as client:
+        await client.get_token()
+        scheduler = scheduler_for(client)
+        await scheduler.poll("outputs")
+        await scheduler.poll("outputs")
+        assert scheduler.interval("outputs") == 20.0
+
+        scheduler.boost("outputs", duration=60)
+        for _ in range(2):
+            await scheduler.poll("outputs")
+            assert scheduler.interval("outputs") == scheduler.fast_interval
+            assert scheduler._current["outputs"] == 10.0
+
+        # The boost ends: back to the base interval, then backing off again.
+        scheduler.boost("outputs", duration=0)
+        scheduler._current["outputs"] = 40.0
+        await scheduler.poll("outputs")
+        assert scheduler.interval("outputs") == 10.0
+        await scheduler.poll("outputs")
+        assert scheduler.interval("outputs") == 20.0
+
+
+@pytest.mark.asyncio
+async def test_command_wakes_up_the_poller(make_client) -> None:
+    """A command to a collection polls it right away."""
+    requests: list[httpx.Request] = []
+    async with make_client(outputs_handler([False], requests)) as client:
+        await client.get_token()
+        scheduler = PollScheduler(client, 21, intervals={"outputs": 60.0})
+        scheduler.start()
+        try:
+            while not requests:
+                await asyncio.sleep(0)
+            await client.outputs.turn_on(21, 1)
+            while len(requests) < 3:
+                await asyncio.sleep(0.001)
+        finally:
+            await scheduler.stop()
+
+    assert [request.method for request in requests] == ["GET", "POST", "GET"]
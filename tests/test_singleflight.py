@@ -0,0 +1,183 @@
+"""Tests of the coalescing of identical in-flight requests."""
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from pyhaopenmotics import CloudClient, RequestPolicy, deadline
+from pyhaopenmotics.errors import NetworkTimeoutException
+from pyhaopenmotics.singleflight import SingleFlight
+
+from .conftest import json_response
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_call() -> None:
+    """Concurrent callers with the same key share one call."""
+    flight = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def call() -> int:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return calls
+
+    waiters = [asyncio.ensure_future(flight.do("key", call)) for _ in range(5)]
+    await asyncio.sleep(0)
+    assert len(flight) == 1
+
+    release.set()
+    assert await asyncio.gather(*waiters) == [1] * 5
+    assert calls == 1
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_finished_call_is_not_reused() -> None:
+    """A key is called again once its call finished."""
+    flight = SingleFlight()
+    calls = 0
+
+    async def call() -> int:
+        nonlocal calls
+        calls += 1
+        return calls
+
+    assert await flight.do("key", call) == 1
+    assert await flight.do("key", call) == 2
+
+
+@pytest.mark.asyncio
+async def test_exception_reaches_every_caller() -> None:
+    """The exception of a shared call is raised to every caller."""
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def call() -> None:
+        await release.wait()
+        raise ValueError("failed")
+
+    waiters = [asyncio.ensure_future(flight.do("key", call)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_others() -> None:
+    """Cancelling one caller leaves the call running for the others."""
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def call() -> str:
+        await release.wait()
+        return "done"
+
+    first = asyncio.ensure_future(flight.do("key", call))
+    second = asyncio.ensure_future(flight.do("key", call))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == "done"
+    assert first.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_discarded_call_is_not_shared() -> None:
+    """New callers of a discarded key start a fresh call."""
+    flight = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def call() -> int:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return calls
+
+    first = asyncio.ensure_future(flight.do("key", call))
+    await asyncio.sleep(0)
+    flight.discard_if(lambda key: key == "key")
+    second = asyncio.ensure_future(flight.do("key", call))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert sorted(await asyncio.gather(first, second)) == [2, 2]
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_client_coalesces_identical_gets(make_client) -> None:
+    """Identical GETs of a client share one request."""
+    requests = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        await asyncio.sleep(0.01)
+        return json_response({"data": []})
+
+    async with make_client(handler) as client:
+        await client.get_token()
+        results = await asyncio.gather(
+            client.get("/base/installations"),
+            client.get("/base/installations"),
+            client.get("/base/installations", params={"filter": "x"}),
+        )
+
+    assert results == [{"data": []}] * 3
+    assert len(requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_shared_get_ignores_deadline_of_first_caller(make_client) -> None:
+    """A caller's deadline doesn't end the GET shared with others."""
+    requests = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        await asyncio.sleep(0.2)
+        return json_response({"data": []})
+
+    async def get_with_deadline(client: CloudClient) -> dict:
+        with deadline(0.05):
+            return await client.get("/base/installations")
+
+    async with make_client(handler) as client:
+        await client.get_token()
+        first = asyncio.ensure_future(get_with_deadline(client))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(client.get("/base/installations"))
+
+        with pytest.raises(NetworkTimeoutException):
+            await first
+        assert await second == {"data": []}
+
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_gets_with_other_policies_are_not_shared(make_client) -> None:
+    """A GET with another retry policy sends its own request."""
+    requests = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        await asyncio.sleep(0.01)
+        return json_response({"data": []})
+
+    async with make_client(handler) as client:
+        await client.get_token()
+        await asyncio.gather(
+            client.get("/base/installations"),
+            client.get("/base/installations", policy=RequestPolicy(max_attempts=1)),
+            # Only the deadline differs, the call is shared.
+            client.get("/base/installations", policy=RequestPolicy(deadline=5)),
+        )
+
+    assert len(requests) == 2
@@ -0,0 +1,64 @@
+"""Tests of the installation snapshots."""
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from pyhaopenmotics import RequestPolicy
+from pyhaopenmotics.errors import RequestClientException
+from pyhaopenmotics.snapshot import COLLECTIONS, take_snapshot
+
+from .conftest import json_response
+
+
+@pytest.mark.asyncio
+async def test_snapshot_fetches_every_collection(make_client) -> None:
+    """A snapshot fetches each collection once."""
+    paths = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path)
+        return json_response({"data": []})
+
+    async with make_client(handler) as client:
+        await client.get_token()
+        snapshot = await take_snapshot(client, 21)
+
+    assert snapshot.installation_id == 21
+    assert snapshot.outputs == ()
+    assert snapshot.taken_at > 0
+    assert len(paths) == len(COLLECTIONS)
+
+
+@pytest.mark.asyncio
+async def test_failed_collection_cancels_the_others(make_client) -> None:
+    """A failed collection cancels the fetches still running."""
+    started = []
+    cancelled = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/outputs"):
+            return json_response({}, 400)
+        started.append(request.url.path)
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.append(request.url.path)
+            raise
+        raise AssertionError("unreachable")
+
+    # Without coalescing, cancelling a fetch cancels the request itself.
+    client = make_client(
+        handler, policy=RequestPolicy(max_attempts=1), coalesce_requests=False
+    )
+    async with client:
+        await client.get_token()
+        with pytest.raises(RequestClientException):
+            await asyncio.wait_for(
+                take_snapshot(client, 21, max_concurrency=len(COLLECTIONS)), 1
+            )
+
+    assert started
+    assert cancelled == started
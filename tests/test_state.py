@@ -0,0 +1,185 @@
+"""Tests of the device state store."""
+from __future__ import annotations
+
+import contextlib
+from typing import Any
+
+import httpx
+import pytest
+
+from pyhaopenmotics import DeviceStateStore, IngestSource, RequestPolicy, StateChange
+from pyhaopenmotics.errors import RequestClientException
+from pyhaopenmotics.models.light import Light
+from pyhaopenmotics.models.output import Output
+from pyhaopenmotics.state import diff
+
+from .conftest import json_response
+
+
+def output(idx: int, on: bool = False, name: str = "kitchen") -> Output:
+    """Return an output."""
+    return Output.parse_obj(
+        {"id": idx, "local_id": idx, "name": name, "status": {"on": on}}
+    )
+
+
+def is_on(state: DeviceStateStore, kind: str = "outputs") -> bool:
+    """Return whether device 1 of installation 21 is on."""
+    return state.devices(21, kind)[0].status.on
+
+
+def test_diff_reports_nested_fields() -> None:
+    """Nested dicts are diffed into dotted field names."""
+    old = {"name": "a", "status": {"on": False, "value": 10}}
+    new = {"name": "a", "status": {"on": True, "value": 10}, "extra": 1}
+    assert diff(old, new) == {"status.on": (False, True), "extra": (None, 1)}
+    assert diff(old, old) == {}
+
+
+def test_ingest_reports_new_and_changed_devices() -> None:
+    """New devices and status changes are reported, with their changes."""
+    state = DeviceStateStore()
+    events: list[StateChange] = []
+    state.subscribe(events.append)
+
+    first = state.ingest(21, "outputs", [output(1), output(2)])
+    assert [(event.device_id, event.old, event.changes) for event in first] == [
+        (1, None, {}),
+        (2, None, {}),
+    ]
+
+    changed = state.ingest(21, "outputs", [output(1, on=True), output(2)])
+    assert len(changed) == 1
+    assert changed[0].device_id == 1
+    assert changed[0].changes == {"status.on": (False, True)}
+    assert events == first + changed
+    assert state.devices(21, "outputs")[0].status.on is True
+
+
+def test_unwatched_changes_update_the_state_silently() -> None:
+    """A renamed device is stored but not reported."""
+    state = DeviceStateStore()
+    state.ingest(21, "outputs", [output(1)])
+
+    assert state.ingest(21, "outputs", [output(1, name="hall")]) == []
+    assert state.devices(21, "outputs")[0].name == "hall"
+
+
+def test_failing_listener_does_not_stop_the_others() -> None:
+    """An exception in one listener is logged, the others are still called."""
+    state = DeviceStateStore()
+    seen: list[Any] = []
+
+    def broken(*args: Any) -> None:
+        """Fail on every call."""
+        raise RuntimeError("broken listener")
+
+    state.subscribe(broken)
+    state.subscribe(seen.append)
+    state.add_ingest_listener(broken)
+    state.add_ingest_listener(lambda *args: seen.append(args))
+
+    events = state.ingest(21, "outputs", [output(1)])
+    assert seen == [(21, "outputs", [output(1)], IngestSource.API, False)] + events
+
+
+def test_ingest_listeners_receive_every_batch() -> None:
+    """Ingest listeners get unchanged batches too, until they unsubscribe."""
+    state = DeviceStateStore()
+    batches: list[tuple[Any, ...]] = []
+    remove = state.add_ingest_listener(lambda *args: batches.append(args))
+    models = [output(1)]
+
+    state.ingest(21, "outputs", models, complete=True)
+    state.ingest(21, "outputs", models, IngestSource.EVENT)
+    remove()
+    state.ingest(21, "outputs", models)
+
+    assert batches == [
+        (21, "outputs", models, IngestSource.API, True),
+        (21, "outputs", models, IngestSource.EVENT, False),
+    ]
+
+
+@pytest.mark.parametrize("complete, expected", [(False, [1, 2]), (True, [2])])
+def test_complete_batch_forgets_missing_devices(complete, expected) -> None:
+    """Only a complete collection removes the devices missing from it."""
+    state = DeviceStateStore()
+    state.ingest(21, "outputs", [output(1), output(2)])
+    state.ingest(21, "lights", [output(1)])
+    state.ingest(22, "outputs", [output(1)])
+
+    state.ingest(21, "outputs", [output(2)], complete=complete)
+
+    assert [model.idx for model in state.devices(21, "outputs")] == expected
+    assert state.get(21, "lights", 1) is not None
+    assert state.get(22, "outputs", 1) is not None
+
+
+def test_optimistic_applies_the_expected_state() -> None:
+    """The expected state is stored while the command runs and kept after."""
+    state = DeviceStateStore()
+    state.ingest(21, "outputs", [output(1)])
+    sources: list[IngestSource] = []
+    state.add_ingest_listener(lambda *args: sources.append(args[3]))
+
+    with state.optimistic(21, "outputs", 1, {"status": {"on": True}}) as expected:
+        assert expected is not None
+        assert expected.status.on is True
+        assert is_on(state)
+    assert is_on(state)
+    assert sources == [IngestSource.OPTIMISTIC]
+
+    with state.optimistic(21, "outputs", 2, {"status": {"on": True}}) as unknown:
+        assert unknown is None
+    assert state.get(21, "outputs", 2) is None
+
+
+def test_optimistic_rolls_back_a_failed_command() -> None:
+    """The previous state is restored when the command fails."""
+    state = DeviceStateStore()
+    state.ingest(21, "outputs", [output(1)])
+
+    update = {"status": {"on": True}}
+    with pytest.raises(RuntimeError), state.optimistic(21, "outputs", 1, update):
+        raise RuntimeError("command failed")
+    assert not is_on(state)
+
+
+def test_optimistic_keeps_a_newer_state_on_failure() -> None:
+    """A state that arrived during the command isn't rolled back."""
+    state = DeviceStateStore()
+    state.ingest(21, "outputs", [output(1)])
+
+    update = {"status": {"on": True}}
+    with pytest.raises(RuntimeError), state.optimistic(21, "outputs", 1, update):
+        state.ingest(21, "outputs", [output(1, on=True, name="hall")])
+        raise RuntimeError("command failed")
+    assert is_on(state)
+    assert state.devices(21, "outputs")[0].name == "hall"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status_code", [200, 400])
+async def test_output_commands_update_lights_too(make_client, status_code) -> None:
+    """Lights are outputs, a command updates and rolls back both."""
+    states = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        states.append((is_on(client.state), is_on(client.state, "lights")))
+        return json_response({}, status_code)
+
+    client = make_client(
+        handler, optimistic_updates=True, policy=RequestPolicy(max_attempts=1)
+    )
+    client.state.ingest(21, "outputs", [output(1)])
+    light = Light.parse_obj({"id": 1, "local_id": 1, "status": {"on": False}})
+    client.state.ingest(21, "lights", [light])
+    async with client:
+        await client.get_token()
+        with contextlib.suppress(RequestClientException):
+            await client.outputs.turn_on(21, 1)
+
+    assert states == [(True, True)]
+    on = status_code == 200
+    assert (is_on(client.state), is_on(client.state, "lights")) == (on, on)
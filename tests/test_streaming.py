@@ -0,0 +1,98 @@
+"""Tests of the streaming iter_all generators."""
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from pyhaopenmotics import RequestPolicy
+from pyhaopenmotics.streaming import can_stream
+
+from .conftest import json_response
+
+SENSORS = [
+    {"id": idx, "local_id": idx, "status": {"temperature": 20.0 + idx}}
+    for idx in range(3)
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sensor_filter", [None, "temperature"])
+async def test_iter_all_sends_filter(make_client, sensor_filter) -> None:
+    """The filter is sent and the sensors reach the state store."""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return json_response({"data": SENSORS})
+
+    async with make_client(handler) as client:
+        await client.get_token()
+        sensors = [
+            sensor async for sensor in client.sensors.iter_all(21, sensor_filter)
+        ]
+
+    assert [sensor.idx for sensor in sensors] == [0, 1, 2]
+    assert requests[0].url.params.get("filter") == sensor_filter
+    assert client.state.get(21, "sensors", 2).status.temperature == 22.0
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not can_stream(), reason="ijson is not installed")
+async def test_iter_all_parses_chunked_body(make_client) -> None:
+    """Items are parsed from a body that arrives in chunks."""
+    body = json_response({"data": SENSORS}).content
+
+    async def chunks():
+        for offset in range(0, len(body), 7):
+            yield body[offset:][:7]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200, content=chunks(), headers={"Content-Type": "application/json"}
+        )
+
+    async with make_client(handler) as client:
+        await client.get_token()
+        sensors = [sensor async for sensor in client.sensors.iter_all(21)]
+
+    assert [sensor.status.temperature for sensor in sensors] == [20.0, 21.0, 22.0]
+
+
+class BrokenBody(httpx.AsyncByteStream):
+    """Body of an error response whose connection drops while reading."""
+
+    def __init__(self) -> None:
+        """Init the BrokenBody object."""
+        self.closed = False
+
+    async def __aiter__(self):
+        """Fail on the first chunk."""
+        raise httpx.ReadError("connection lost")
+        yield b""  # pylint: disable=unreachable
+
+    async def aclose(self) -> None:
+        """Record that the response was closed."""
+        self.closed = True
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not can_stream(), reason="ijson is not installed")
+async def test_failed_attempt_is_closed_before_retrying(make_client) -> None:
+    """Each attempt closes its response when it fails."""
+    broken = BrokenBody()
+    closed_before_retry: list[bool | None] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if not closed_before_retry:
+            closed_before_retry.append(None)
+            return httpx.Response(503, stream=broken)
+        closed_before_retry.append(broken.closed)
+        return json_response({"data": SENSORS})
+
+    policy = RequestPolicy(max_attempts=2, backoff_multiplier=0.001)
+    async with make_client(handler, policy=policy) as client:
+        await client.get_token()
+        sensors = [sensor async for sensor in client.sensors.iter_all(21)]
+
+    assert len(sensors) == 3
+    assert closed_before_retry == [None, True]
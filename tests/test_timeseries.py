@@ -0,0 +1,102 @@
+"""Tests of the time series store."""
+from __future__ import annotations
+
+import pytest
+
+from pyhaopenmotics import DeviceStateStore, IngestSource, TimeSeriesStore
+from pyhaopenmotics.models.sensor import Sensor
+from pyhaopenmotics.timeseries import Bucket, RingBuffer
+
+KEY = (21, "sensors", 3, "temperature")
+
+
+def values(store: TimeSeriesStore) -> list[float]:
+    """Return the recorded temperatures of sensor 3."""
+    series = store.series(KEY)
+    assert series is not None
+    return [value for _, value in series]
+
+
+def sensor(temperature: float) -> Sensor:
+    """Return sensor 3 with a temperature."""
+    return Sensor.parse_obj(
+        {"id": 3, "local_id": 3, "status": {"temperature": temperature}}
+    )
+
+
+def test_ring_buffer_overwrites_oldest_points() -> None:
+    """A full ring buffer overwrites its oldest points."""
+    buffer = RingBuffer(capacity=3)
+    for timestamp in range(5):
+        buffer.append(float(timestamp), timestamp * 10.0)
+
+    assert len(buffer) == 3
+    assert list(buffer) == [(2.0, 20.0), (3.0, 30.0), (4.0, 40.0)]
+    assert buffer.last() == (4.0, 40.0)
+    assert buffer.window(since=3.0) == [(3.0, 30.0), (4.0, 40.0)]
+
+
+def test_downsample() -> None:
+    """Points are aggregated into buckets of a fixed width."""
+    buffer = RingBuffer(capacity=10)
+    for timestamp, value in [(0, 1.0), (30, 3.0), (60, 2.0), (200, 5.0)]:
+        buffer.append(float(timestamp), value)
+
+    assert buffer.downsample(60) == [
+        Bucket(start=0.0, samples=2, min=1.0, max=3.0, mean=2.0),
+        Bucket(start=60.0, samples=1, min=2.0, max=2.0, mean=2.0),
+        Bucket(start=180.0, samples=1, min=5.0, max=5.0, mean=5.0),
+    ]
+    assert RingBuffer(capacity=1).downsample(60) == []
+    with pytest.raises(ValueError):
+        buffer.downsample(0)
+
+
+def test_least_recently_updated_series_is_dropped() -> None:
+    """Over the memory budget, the least recently updated series goes."""
+    store = TimeSeriesStore(capacity=2, max_bytes=2 * 2 * 16)
+    store.record((21, "sensors", 1, "temperature"), 1.0, 0.0)
+    store.record((21, "sensors", 2, "temperature"), 1.0, 0.0)
+    store.record((21, "sensors", 1, "temperature"), 2.0, 1.0)
+    store.record((21, "sensors", 3, "temperature"), 1.0, 1.0)
+
+    assert store.keys() == [
+        (21, "sensors", 1, "temperature"),
+        (21, "sensors", 3, "temperature"),
+    ]
+
+
+def test_attached_store_records_api_and_event_readings() -> None:
+    """Readings from polls and events are recorded."""
+    state = DeviceStateStore()
+    store = TimeSeriesStore()
+    store.attach(state)
+
+    state.ingest(21, "sensors", [sensor(20.0)])
+    state.ingest(21, "sensors", [sensor(21.0)], IngestSource.EVENT)
+
+    assert values(store) == [20.0, 21.0]
+
+
+def test_optimistic_states_are_not_recorded() -> None:
+    """Optimistic states and their rollback are not readings."""
+    state = DeviceStateStore()
+    store = TimeSeriesStore()
+    store.attach(state)
+    state.ingest(21, "sensors", [sensor(20.0)])
+
+    optimistic = state.optimistic(21, "sensors", 3, {"status": {"temperature": 25.0}})
+    with pytest.raises(RuntimeError), optimistic as expected:
+        assert expected is not None
+        assert expected.status.temperature == 25.0
+        raise RuntimeError("command failed")
+
+    assert state.devices(21, "sensors")[0].status.temperature == 20.0
+    assert values(store) == [20.0]
+
+
+def test_cached_topology_is_not_recorded() -> None:
+    """Topology loaded from disk is not a reading."""
+    store = TimeSeriesStore()
+    store.ingest(21, "sensors", [sensor(20.0)], IngestSource.CACHE)
+    assert store.series(KEY) is None
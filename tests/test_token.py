@@ -0,0 +1,49 @@
+"""Tests of the token refresh."""
+# pylint: disable=protected-access
+from __future__ import annotations
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from pyhaopenmotics import CloudClient
+
+from .conftest import TOKEN, TOKEN_URL_SUFFIX, json_response
+
+PATH = "/base/installations"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_near_expiry_refresh_once() -> None:
+    """Requests racing an expiring token share one token fetch."""
+    token_requests = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith(TOKEN_URL_SUFFIX):
+            token_requests.append(request)
+            # Keep the refresh in flight while the other requests arrive.
+            await asyncio.sleep(0.01)
+            return json_response(TOKEN)
+        return json_response({"data": []})
+
+    client = CloudClient(
+        client_id="abc",
+        client_secret="abc",
+        transport=httpx.MockTransport(handler),
+        coalesce_requests=False,
+    )
+    client.token_refresh_margin = 300.0
+    async with client:
+        await client.get_token()
+        assert len(token_requests) == 1
+
+        expires_at = time.time() + 120
+        client._session.token["expires_at"] = expires_at
+        client.token["expires_at"] = expires_at  # type: ignore[index]
+        results = await asyncio.gather(*(client.get(PATH) for _ in range(5)))
+
+    assert results == [{"data": []}] * 5
+    assert len(token_requests) == 2
+    assert client.token["expires_at"] > expires_at  # type: ignore[index]
@@ -0,0 +1,104 @@
+"""Tests of the token stores."""
+from __future__ import annotations
+
+import time
+from typing import Any
+
+import pytest
+
+from pyhaopenmotics import FileTokenStore, MemoryTokenStore, TokenStore
+
+from .conftest import TOKEN, json_response
+
+KEY = "https://cloud.openmotics.com/api/v1/authentication/oauth2/token#abc"
+
+
+def fresh_token() -> dict:
+    """Return a stored token that is valid for an hour."""
+    return {
+        "access_token": "stored",  # noqa: S105
+        "token_type": "bearer",  # noqa: S105
+        "expires_at": time.time() + 3600,
+    }
+
+
+def loaded(store: TokenStore, key: str = KEY) -> dict[str, Any]:
+    """Return a token that must be in the store."""
+    token = store.load(key)
+    assert token is not None
+    return token
+
+
+def test_memory_store_round_trip() -> None:
+    """The memory store keeps a copy of the saved token."""
+    store = MemoryTokenStore()
+    assert store.load(KEY) is None
+
+    token = fresh_token()
+    store.save(KEY, token)
+    token["access_token"] = "changed"  # noqa: S105
+    assert loaded(store)["access_token"] == "stored"
+    assert store.load("other") is None
+
+
+def test_file_store_round_trip(tmp_path) -> None:
+    """Tokens saved to a file are loaded by another store."""
+    path = tmp_path / "tokens" / "tokens.json"
+    FileTokenStore(path).save(KEY, fresh_token())
+    FileTokenStore(path).save("other", {"access_token": "other"})  # noqa: S105
+
+    store = FileTokenStore(path)
+    assert loaded(store)["access_token"] == "stored"
+    assert store.load("other") == {"access_token": "other"}  # noqa: S105
+    # The temporary file was moved into place.
+    assert sorted(p.name for p in path.parent.iterdir()) == [
+        "tokens.json",
+        "tokens.json.lock",
+    ]
+
+
+def test_file_store_missing_file(tmp_path) -> None:
+    """A missing file holds no tokens."""
+    assert FileTokenStore(tmp_path / "tokens.json").load(KEY) is None
+
+
+@pytest.mark.parametrize("content", ["{not json", "[1, 2]"])
+def test_file_store_ignores_corrupt_file(tmp_path, content: str) -> None:
+    """A corrupt file is treated as empty and overwritten."""
+    path = tmp_path / "tokens.json"
+    path.write_text(content)
+    store = FileTokenStore(path)
+    assert store.load(KEY) is None
+
+    store.save(KEY, fresh_token())
+    assert loaded(store)["access_token"] == "stored"
+
+
+@pytest.mark.asyncio
+async def test_client_reuses_fresh_stored_token(make_client) -> None:
+    """A fresh stored token is used instead of fetching one."""
+    store = MemoryTokenStore()
+    store.save(KEY, fresh_token())
+
+    client = make_client(lambda request: json_response({"data": []}), token_store=store)
+    client.token_store_key = KEY
+    async with client:
+        await client.get_token()
+        # A fetched token would be TOKEN.
+        assert client.token["access_token"] == "stored"
+
+
+@pytest.mark.asyncio
+async def test_client_saves_fetched_token(make_client) -> None:
+    """A fetched token replaces an expired stored token."""
+    store = MemoryTokenStore()
+    expired = fresh_token()
+    expired["expires_at"] = time.time() - 1
+    store.save(KEY, expired)
+
+    client = make_client(lambda request: json_response({"data": []}), token_store=store)
+    client.token_store_key = KEY
+    async with client:
+        await client.get_token()
+        assert client.token["access_token"] == TOKEN["access_token"]
+        assert loaded(store)["access_token"] == TOKEN["access_token"]
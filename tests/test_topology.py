@@ -0,0 +1,111 @@
+"""Tests of the on-disk topology cache."""
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from pyhaopenmotics import IngestSource
+from pyhaopenmotics.models.installation import Installation
+from pyhaopenmotics.models.output import Output
+from pyhaopenmotics.snapshot import InstallationSnapshot
+from pyhaopenmotics.topology import TopologyCache
+
+from .conftest import json_response
+from .samples import SAMPLES
+
+
+def output(idx: int, version: str | None = "1.0", **kwargs: Any) -> Output:
+    """Return a sample output with a version."""
+    data = {**SAMPLES[Output](idx), "_version": version, **kwargs}
+    return Output.parse_obj(data)
+
+
+@pytest.fixture
+def cache(tmp_path) -> TopologyCache:
+    """Return a cache in a temporary directory."""
+    return TopologyCache(tmp_path / "topology.db")
+
+
+def cached_outputs(cache: TopologyCache, installation_id: int = 21) -> list[Any]:
+    """Return the cached outputs of an installation."""
+    return list(cache.load()[installation_id].outputs)
+
+
+def test_round_trip_leaves_out_the_state(cache) -> None:
+    """Devices are loaded without status and last_state_change."""
+    installation = Installation.parse_obj(SAMPLES[Installation](21))
+    snapshot = InstallationSnapshot(
+        21, outputs=(output(1), output(2)), installation=installation, taken_at=5.0
+    )
+    assert cache.save_snapshot(snapshot) == 3
+
+    loaded = cache.load()[21]
+    assert loaded.installation == installation
+    assert loaded.taken_at == 5.0
+    assert [model.idx for model in loaded.outputs] == [1, 2]
+    first = loaded.outputs[0]
+    assert first.status is None
+    assert first.last_state_change is None
+    state = {"status", "last_state_change"}
+    assert first.dict(exclude=state) == output(1).dict(exclude=state)
+    assert cache.installation_ids() == [21]
+    assert cache.load([22]) == {}
+
+
+def test_unchanged_version_is_not_rewritten(cache) -> None:
+    """Only devices with a new version, or without one, are written."""
+    assert cache.save(21, "outputs", [output(1), output(2)]) == 2
+    assert cache.save(21, "outputs", [output(1, name="renamed"), output(2)]) == 0
+    assert cached_outputs(cache)[0].name == "output1"
+
+    assert cache.save(21, "outputs", [output(1, "2.0", name="renamed")]) == 1
+    assert cached_outputs(cache)[0].name == "renamed"
+    assert cache.save(21, "outputs", [output(3, None)]) == 1
+    assert cache.save(21, "outputs", [output(3, None)]) == 1
+
+
+def test_complete_save_removes_missing_devices(cache) -> None:
+    """A complete collection removes the cached devices missing from it."""
+    cache.save(21, "outputs", [output(1), output(2)])
+    cache.save(22, "outputs", [output(1)])
+
+    assert cache.save(21, "outputs", [output(2)]) == 0
+    assert len(cached_outputs(cache)) == 2
+    assert cache.save(21, "outputs", [output(2)], complete=True) == 1
+    assert [model.idx for model in cached_outputs(cache)] == [2]
+    assert len(cached_outputs(cache, 22)) == 1
+
+
+def test_schema_change_drops_the_cache(tmp_path, monkeypatch) -> None:
+    """A cache written with another schema version starts empty."""
+    path = tmp_path / "topology.db"
+    TopologyCache(path).save(21, "outputs", [output(1)])
+    assert TopologyCache(path).installation_ids() == [21]
+
+    monkeypatch.setattr("pyhaopenmotics.topology.SCHEMA_VERSION", 2)
+    cache = TopologyCache(path)
+    assert cache.load() == {}
+    cache.save(21, "outputs", [output(1)])
+    assert cache.installation_ids() == [21]
+
+
+@pytest.mark.asyncio
+async def test_warm_start_ingests_from_cache(cache, make_client) -> None:
+    """Cached devices are ingested as complete collections from the cache."""
+    cache.save_snapshot(InstallationSnapshot(21, outputs=(output(1),)))
+    client = make_client(lambda request: json_response({"data": []}))
+    batches = []
+    client.state.add_ingest_listener(
+        lambda installation_id, kind, models, source, complete: batches.append(
+            (kind, len(models), source, complete)
+        )
+    )
+
+    snapshots = await cache.warm_start(client, revalidate=False)
+
+    assert list(snapshots) == [21]
+    assert ("outputs", 1, IngestSource.CACHE, True) in batches
+    assert {source for _, _, source, _ in batches} == {IngestSource.CACHE}
+    assert client.state.devices(21, "outputs")[0].name == "output1"
+    assert cache.revalidation is None
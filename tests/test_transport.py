@@ -0,0 +1,56 @@
+"""Tests of the connection pool configuration."""
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from pyhaopenmotics import CloudClient, create_limits, create_shared_transport
+
+from .conftest import TOKEN, TOKEN_URL_SUFFIX, json_response
+
+
+class CountingTransport(httpx.MockTransport):
+    """Mock transport recording the requests and whether it was closed."""
+
+    def __init__(self) -> None:
+        """Init the CountingTransport object."""
+        super().__init__(self.dispatch)
+        self.hosts: list[str] = []
+        self.closed = False
+
+    def dispatch(self, request: httpx.Request) -> httpx.Response:
+        """Answer token requests with TOKEN and others with an empty list."""
+        if request.url.path.endswith(TOKEN_URL_SUFFIX):
+            return json_response(TOKEN)
+        self.hosts.append(request.url.host)
+        return json_response({"data": []})
+
+    async def aclose(self) -> None:
+        """Record that the transport was closed."""
+        self.closed = True
+
+
+def test_create_shared_transport_uses_limits() -> None:
+    """The pool of a shared transport has the given limits."""
+    limits = create_limits(max_connections=7, max_keepalive_connections=3)
+    transport = create_shared_transport(limits=limits)
+    # pylint: disable=protected-access
+    assert transport._pool._max_connections == 7
+    assert transport._pool._max_keepalive_connections == 3
+
+
+@pytest.mark.asyncio
+async def test_clients_share_one_transport() -> None:
+    """Clients handed the same transport send through it and leave it open."""
+    transport = CountingTransport()
+    clients = [
+        CloudClient(client_id=name, client_secret="abc", transport=transport)
+        for name in ("a", "b")
+    ]
+    for client in clients:
+        async with client:
+            await client.get_token()
+            await client.get("/base/installations")
+
+    assert len(transport.hosts) == 2
+    assert not transport.closed